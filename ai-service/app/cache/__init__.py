@@ -1,3 +1,4 @@
 from .memory_cache import MemoryCache
+from .revision_store import RevisionStore
 
-__all__ = ["MemoryCache"]
+__all__ = ["MemoryCache", "RevisionStore"]
@@ -0,0 +1,124 @@
+import sys
+import zlib
+from typing import Iterable, Optional, Tuple
+
+from ..models import (
+    NormalizeResponse, CompanyInfo, SalaryInfo, LocationInfo,
+    Requirements, Benefits, WorkType, ExperienceLevel
+)
+
+# Частые технологии из требований вакансий: попадают в словарь сжатия
+_COMMON_SKILLS = (
+    'Kafka', 'RabbitMQ', 'Redis', 'Kubernetes', 'CI/CD', 'Linux', 'Git', 'REST API', 'SQL',
+    'Java', 'Go', 'Node.js', 'Vue', 'Angular', 'React', 'TypeScript', 'JavaScript',
+    'Django', 'Flask', 'FastAPI', 'PostgreSQL', 'Docker', 'Python',
+)
+
+
+def _build_dictionary() -> bytes:
+    """Словарь zlib: ключи ответа, значения перечислений и частые навыки.
+
+    Небольшие тела ответов почти целиком состоят из этих строк, поэтому общий словарь
+    заменяет хранение их копий в каждой записи. Самые частые строки - в конце словаря.
+    """
+    skeleton = NormalizeResponse(
+        id='', title='', company=CompanyInfo(), salary=SalaryInfo(currency='RUB', period='month'),
+        location=LocationInfo(country='Россия'), requirements=Requirements(), benefits=Benefits(),
+        source_name='', original_url='https://', parsed_at='', quality_score=0
+    )
+    values = [item.value for item in (*WorkType, *ExperienceLevel)]
+    values += ['до вычета налогов', 'после вычета налогов', 'Москва', 'Санкт-Петербург']
+    parts = [' '.join(_COMMON_SKILLS), ' '.join(f'"{value}"' for value in values), skeleton.model_dump_json()]
+    return '\n'.join(parts).encode('utf-8')
+
+
+_DICTIONARY = _build_dictionary()
+
+
+class CompactBody:
+    """Сжатие тел ответов для хранения в памяти (zlib с общим словарем)"""
+
+    @staticmethod
+    def pack(body: bytes, min_bytes: int, level: int = 6) -> Tuple[bytes, bool]:
+        """(хранимые байты, сжаты ли они); маленькие тела не сжимаются"""
+        if len(body) < min_bytes:
+            return body, False
+        compressor = zlib.compressobj(level, zdict=_DICTIONARY)
+        packed = compressor.compress(body) + compressor.flush()
+        if len(packed) >= len(body):
+            return body, False
+        return packed, True
+
+    @staticmethod
+    def unpack(data: bytes, compressed: bool) -> bytes:
+        if not compressed:
+            return data
+        decompressor = zlib.decompressobj(zdict=_DICTIONARY)
+        return decompressor.decompress(data) + decompressor.flush()
+
+    @staticmethod
+    def intern_all(values: Optional[Iterable[str]]) -> Optional[Tuple[str, ...]]:
+        """Кортеж интернированных строк: одинаковые маски полей не дублируются в памяти"""
+        if values is None:
+            return None
+        return tuple(sys.intern(value) for value in values)
+
+
+def _value_bytes(value) -> int:
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(_value_bytes(item) for item in value)
+    if value is None or isinstance(value, bool):
+        return 0
+    return sys.getsizeof(value)
+
+
+def entry_bytes(key, entry) -> int:
+    """Приблизительный размер записи в памяти: ключ, слотовый объект и значения слотов.
+
+    Интернированные строки общие для многих записей, поэтому оценка сверху.
+    """
+    return sys.getsizeof(key) + sys.getsizeof(entry) + sum(
+        _value_bytes(getattr(entry, name)) for name in entry.__slots__
+    )
+
+
+class CacheEntry:
+    """Запись кэша ответов: тело (возможно сжатое), ETag, маска полей, срок по monotonic"""
+
+    __slots__ = ('body', 'compressed', 'etag', 'fields', 'expires_at')
+
+    def __init__(
+        self,
+        body: bytes,
+        compressed: bool,
+        etag: str,
+        fields: Optional[Tuple[str, ...]],
+        expires_at: float
+    ):
+        self.body = body
+        self.compressed = compressed
+        self.etag = etag
+        self.fields = fields
+        self.expires_at = expires_at
+
+
+class RevisionEntry:
+    """Ревизия вакансии: отпечатки разделов и сериализованный (возможно сжатый) результат"""
+
+    __slots__ = ('title', 'sections', 'body', 'compressed', 'fields', 'prompt_version')
+
+    def __init__(
+        self,
+        title: str,
+        sections: Tuple[Tuple[str, str], ...],
+        body: bytes,
+        compressed: bool,
+        fields: Optional[Tuple[str, ...]],
+        prompt_version: Optional[str]
+    ):
+        self.title = title
+        self.sections = sections
+        self.body = body
+        self.compressed = compressed
+        self.fields = fields
+        self.prompt_version = prompt_version
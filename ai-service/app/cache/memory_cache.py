@@ -1,66 +1,96 @@
 import hashlib
 import logging
+import sys
+import time
 from typing import Any, Optional, Dict
-from datetime import datetime, timedelta
+
+from .compact import CacheEntry, CompactBody, entry_bytes
 
 logger = logging.getLogger(__name__)
 
 
 class MemoryCache:
-    """Простое in-memory кэширование"""
+    """In-memory кэш сериализованных ответов: {'body', 'etag', 'fields'}.
+
+    Записи хранятся компактно: слотовый CacheEntry, тело сжимается zlib с общим
+    словарем (распаковывается при чтении), срок жизни - по monotonic часам.
+    """
     
-    def __init__(self, ttl_seconds: int = 3600):
-        self.cache: Dict[str, Dict[str, Any]] = {}
+    def __init__(self, ttl_seconds: int = 3600, compress_min_bytes: int = 256, compress_level: int = 6):
+        self.cache: Dict[bytes, CacheEntry] = {}
         self.ttl_seconds = ttl_seconds
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_level = compress_level
+        # Размер записей ведется при изменениях, чтобы memory_bytes() не обходил весь кэш
+        self.entries_bytes = 0
     
-    def _generate_key(self, title: str, description: str) -> str:
-        """Генерирует ключ для кэша"""
-        content = f"{title}|{description}"
-        return hashlib.md5(content.encode()).hexdigest()
+    def _generate_key(self, title: str, description: str, prompt_version: str = "") -> bytes:
+        """Генерирует ключ для кэша (версия промпта входит в ключ, чтобы результаты не смешивались)"""
+        content = f"{prompt_version}|{title}|{description}"
+        return hashlib.md5(content.encode()).digest()
     
-    def get(self, title: str, description: str) -> Optional[Any]:
+    def get(self, title: str, description: str, prompt_version: str = "") -> Optional[Dict[str, Any]]:
         """Получает значение из кэша"""
-        key = self._generate_key(title, description)
+        key = self._generate_key(title, description, prompt_version)
         
-        if key not in self.cache:
+        entry = self.cache.get(key)
+        if entry is None:
             return None
         
-        entry = self.cache[key]
-        if datetime.now() > entry['expires_at']:
-            del self.cache[key]
-            logger.debug(f"Cache entry expired for key: {key}")
+        if time.monotonic() > entry.expires_at:
+            self._delete(key)
+            logger.debug(f"Cache entry expired for key: {key.hex()}")
             return None
         
-        logger.debug(f"Cache hit for key: {key}")
-        return entry['value']
+        logger.debug(f"Cache hit for key: {key.hex()}")
+        return {
+            'body': CompactBody.unpack(entry.body, entry.compressed),
+            'etag': entry.etag,
+            'fields': list(entry.fields) if entry.fields is not None else None
+        }
     
-    def set(self, title: str, description: str, value: Any) -> None:
+    def set(self, title: str, description: str, value: Dict[str, Any], prompt_version: str = "") -> None:
         """Сохраняет значение в кэш"""
-        key = self._generate_key(title, description)
-        expires_at = datetime.now() + timedelta(seconds=self.ttl_seconds)
+        key = self._generate_key(title, description, prompt_version)
+        body, compressed = CompactBody.pack(value['body'], self.compress_min_bytes, self.compress_level)
         
-        self.cache[key] = {
-            'value': value,
-            'expires_at': expires_at
-        }
+        entry = CacheEntry(
+            body=body,
+            compressed=compressed,
+            etag=value['etag'],
+            fields=CompactBody.intern_all(value.get('fields')),
+            expires_at=time.monotonic() + self.ttl_seconds
+        )
+        if key in self.cache:
+            self._delete(key)
+        self.cache[key] = entry
+        self.entries_bytes += entry_bytes(key, entry)
         
-        logger.debug(f"Cached value for key: {key}")
+        logger.debug(f"Cached value for key: {key.hex()}")
     
     def clear(self) -> None:
         """Очищает кэш"""
         self.cache.clear()
+        self.entries_bytes = 0
         logger.info("Cache cleared")
     
     def cleanup_expired(self) -> None:
         """Удаляет истекшие записи"""
-        now = datetime.now()
+        now = time.monotonic()
         expired_keys = [
             key for key, entry in self.cache.items()
-            if now > entry['expires_at']
+            if now > entry.expires_at
         ]
         
         for key in expired_keys:
-            del self.cache[key]
+            self._delete(key)
         
         if expired_keys:
             logger.debug(f"Cleaned up {len(expired_keys)} expired cache entries")
+    
+    def _delete(self, key: bytes) -> None:
+        self.entries_bytes -= entry_bytes(key, self.cache.pop(key))
+    
+    def memory_bytes(self) -> int:
+        """Приблизительный объем памяти кэша: записи и таблица словаря"""
+        return self.entries_bytes + sys.getsizeof(self.cache)
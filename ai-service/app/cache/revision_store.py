@@ -0,0 +1,75 @@
+import logging
+import sys
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .compact import CompactBody, RevisionEntry, entry_bytes
+
+logger = logging.getLogger(__name__)
+
+
+class RevisionStore:
+    """Последняя обработанная версия каждой вакансии по original_url (LRU).
+
+    Результат хранится сериализованным и сжатым (CompactBody), а не Pydantic моделью.
+    """
+    
+    def __init__(self, max_entries: int = 10000, compress_min_bytes: int = 256, compress_level: int = 6):
+        self.revisions: "OrderedDict[str, RevisionEntry]" = OrderedDict()
+        self.max_entries = max_entries
+        self.compress_min_bytes = compress_min_bytes
+        self.compress_level = compress_level
+        # Размер записей ведется при изменениях, чтобы memory_bytes() не обходил хранилище
+        self.entries_bytes = 0
+    
+    def get(self, original_url: str) -> Optional[Dict[str, Any]]:
+        """Получает ревизию вакансии: title, sections, body (JSON результата), fields, prompt_version"""
+        revision = self.revisions.get(original_url)
+        if revision is None:
+            return None
+        self.revisions.move_to_end(original_url)
+        return {
+            'title': revision.title,
+            'sections': dict(revision.sections),
+            'body': CompactBody.unpack(revision.body, revision.compressed),
+            'fields': list(revision.fields) if revision.fields is not None else None,
+            'prompt_version': revision.prompt_version
+        }
+    
+    def set(
+        self,
+        original_url: str,
+        title: str,
+        sections: Dict[str, str],
+        body: bytes,
+        fields: Optional[List[str]] = None,
+        prompt_version: Optional[str] = None
+    ) -> None:
+        """Сохраняет отпечатки разделов исходного текста и сериализованный результат нормализации"""
+        packed, compressed = CompactBody.pack(body, self.compress_min_bytes, self.compress_level)
+        previous = self.revisions.get(original_url)
+        if previous is not None:
+            self.entries_bytes -= entry_bytes(original_url, previous)
+        revision = self.revisions[original_url] = RevisionEntry(
+            title=title,
+            sections=tuple((sys.intern(name), fingerprint) for name, fingerprint in sections.items()),
+            body=packed,
+            compressed=compressed,
+            fields=CompactBody.intern_all(fields),
+            prompt_version=sys.intern(prompt_version) if prompt_version else prompt_version
+        )
+        self.entries_bytes += entry_bytes(original_url, revision)
+        self.revisions.move_to_end(original_url)
+        while len(self.revisions) > self.max_entries:
+            evicted, evicted_revision = self.revisions.popitem(last=False)
+            self.entries_bytes -= entry_bytes(evicted, evicted_revision)
+            logger.debug(f"Evicted revision for: {evicted}")
+    
+    def clear(self) -> None:
+        """Очищает хранилище ревизий"""
+        self.revisions.clear()
+        self.entries_bytes = 0
+    
+    def memory_bytes(self) -> int:
+        """Приблизительный объем памяти хранилища: записи и таблица словаря"""
+        return self.entries_bytes + sys.getsizeof(self.revisions)
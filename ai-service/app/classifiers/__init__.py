@@ -0,0 +1,3 @@
+from .field_classifier import FieldClassifier
+
+__all__ = ["FieldClassifier"]
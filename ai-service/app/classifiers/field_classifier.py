@@ -0,0 +1,184 @@
+import json
+import re
+import zlib
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..models import ExperienceLevel, WorkType
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+
+class FieldClassifier:
+    """Логистическая регрессия по хэшированным n-граммам для workType и experienceLevel.
+
+    Обучается на прошлых ответах модели (см. train_classifier.py). Если вероятность
+    класса не ниже порога, поле заполняется классификатором и не запрашивается у модели.
+    """
+
+    FORMAT_VERSION = 1
+    LABELS = {
+        'work_type': [item.value for item in WorkType],
+        'experience_level': [item.value for item in ExperienceLevel],
+    }
+    # Ключи полей в структуре данных модели (см. JobNormalizer._normalize_ai_data)
+    AI_KEYS = {'work_type': 'workType', 'experience_level': 'experienceLevel'}
+
+    def __init__(
+        self,
+        n_features: int = 2 ** 16,
+        weights: Optional[Dict[str, np.ndarray]] = None,
+        biases: Optional[Dict[str, np.ndarray]] = None,
+        thresholds: Optional[Dict[str, float]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        self.n_features = n_features
+        self.weights = weights or {
+            field: np.zeros((len(labels), n_features), dtype=np.float32) for field, labels in self.LABELS.items()
+        }
+        self.biases = biases or {
+            field: np.zeros(len(labels), dtype=np.float32) for field, labels in self.LABELS.items()
+        }
+        self.thresholds = thresholds or {field: 0.9 for field in self.LABELS}
+        self.metadata = metadata or {}
+
+    @property
+    def version(self) -> str:
+        return self.metadata.get('model_version', 'untrained')
+
+    @staticmethod
+    def _features(title: str, description: str) -> List[str]:
+        """Слова и биграммы описания, слова заголовка отдельно, символьные 3-граммы заголовка"""
+        title_tokens = _TOKEN_PATTERN.findall((title or '').lower())
+        tokens = _TOKEN_PATTERN.findall((description or '').lower())
+        features = [f"t:{token}" for token in title_tokens]
+        features.extend(f"tc:{token[i:i + 3]}" for token in title_tokens for i in range(max(len(token) - 2, 1)))
+        features.extend(f"w:{token}" for token in tokens)
+        features.extend(f"b:{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        return features
+
+    def vectorize(self, title: str, description: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Разреженный вектор признаков: (индексы, значения) с L2 нормировкой"""
+        features = self._features(title, description)
+        if not features:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        hashes = np.fromiter((zlib.crc32(feature.encode()) for feature in features), dtype=np.int64, count=len(features))
+        signs = np.where(hashes >> 31, -1.0, 1.0)
+        indices, inverse = np.unique(hashes % self.n_features, return_inverse=True)
+        values = np.zeros(len(indices), dtype=np.float64)
+        np.add.at(values, inverse, signs)
+        values = np.sign(values) * np.log1p(np.abs(values))
+        norm = np.linalg.norm(values)
+        if norm > 0:
+            values /= norm
+        return indices, values.astype(np.float32)
+
+    def predict_proba(self, title: str, description: str) -> Dict[str, Dict[str, float]]:
+        """Вероятности классов по каждому полю"""
+        indices, values = self.vectorize(title, description)
+        result = {}
+        for field, labels in self.LABELS.items():
+            logits = self.weights[field][:, indices] @ values + self.biases[field]
+            probabilities = np.exp(logits - logits.max())
+            probabilities /= probabilities.sum()
+            result[field] = {label: float(p) for label, p in zip(labels, probabilities)}
+        return result
+
+    def predict(
+        self,
+        title: str,
+        description: str,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Tuple[str, float, bool]]:
+        """Лучший класс поля: (метка, вероятность, уверен ли классификатор)"""
+        wanted = set(self.LABELS if fields is None else fields)
+        predictions = {}
+        for field, probabilities in self.predict_proba(title, description).items():
+            if field not in wanted:
+                continue
+            label = max(probabilities, key=probabilities.get)
+            predictions[field] = (label, probabilities[label], probabilities[label] >= self.thresholds[field])
+        return predictions
+
+    def fit(
+        self,
+        samples: List[Tuple[str, str, Dict[str, str]]],
+        epochs: int = 300,
+        learning_rate: float = 0.05,
+        l2: float = 1e-4
+    ) -> None:
+        """Обучает модель полным градиентным спуском (Adam) на разреженных признаках.
+
+        samples: (title, description, {поле: метка}); поле без метки в обучении не участвует.
+        """
+        vectors = [self.vectorize(title, description) for title, description, _ in samples]
+        for field, labels in self.LABELS.items():
+            rows = [(i, labels.index(target[field])) for i, (_, _, target) in enumerate(samples) if target.get(field) in labels]
+            if not rows:
+                continue
+            row_ids = np.concatenate([np.full(len(vectors[i][0]), n) for n, (i, _) in enumerate(rows)])
+            cols = np.concatenate([vectors[i][0] for i, _ in rows])
+            vals = np.concatenate([vectors[i][1] for i, _ in rows]).astype(np.float64)
+            targets = np.zeros((len(rows), len(labels)))
+            targets[np.arange(len(rows)), [label for _, label in rows]] = 1.0
+
+            weights = np.zeros((len(labels), self.n_features))
+            bias = np.log(targets.mean(axis=0) + 1e-3)
+            moments = [np.zeros_like(weights), np.zeros_like(weights), np.zeros_like(bias), np.zeros_like(bias)]
+            for step in range(1, epochs + 1):
+                logits = np.stack([
+                    np.bincount(row_ids, weights=weights[c, cols] * vals, minlength=len(rows))
+                    for c in range(len(labels))
+                ], axis=1) + bias
+                logits -= logits.max(axis=1, keepdims=True)
+                probabilities = np.exp(logits)
+                probabilities /= probabilities.sum(axis=1, keepdims=True)
+                error = (probabilities - targets) / len(rows)
+                grad_weights = np.stack([
+                    np.bincount(cols, weights=error[row_ids, c] * vals, minlength=self.n_features)
+                    for c in range(len(labels))
+                ]) + l2 * weights
+                grad_bias = error.sum(axis=0)
+                for param, grad, m, v in ((weights, grad_weights, moments[0], moments[1]), (bias, grad_bias, moments[2], moments[3])):
+                    m *= 0.9
+                    m += 0.1 * grad
+                    v *= 0.999
+                    v += 0.001 * grad ** 2
+                    param -= learning_rate * (m / (1 - 0.9 ** step)) / (np.sqrt(v / (1 - 0.999 ** step)) + 1e-8)
+            self.weights[field] = weights.astype(np.float32)
+            self.biases[field] = bias.astype(np.float32)
+
+    def save(self, path: str) -> None:
+        """Сохраняет артефакт модели (.npz, без pickle)"""
+        arrays = {}
+        for field in self.LABELS:
+            arrays[f"{field}__weights"] = self.weights[field]
+            arrays[f"{field}__bias"] = self.biases[field]
+        metadata = {
+            **self.metadata,
+            'format_version': self.FORMAT_VERSION,
+            'n_features': self.n_features,
+            'labels': self.LABELS,
+            'thresholds': self.thresholds,
+            'saved_at': datetime.now().isoformat(),
+        }
+        np.savez_compressed(path, metadata=np.array(json.dumps(metadata, ensure_ascii=False)), **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'FieldClassifier':
+        """Загружает артефакт модели; метки должны совпадать с текущими перечислениями"""
+        with np.load(path, allow_pickle=False) as data:
+            metadata = json.loads(str(data['metadata']))
+            if metadata.get('format_version') != cls.FORMAT_VERSION:
+                raise ValueError(f"Неподдерживаемый формат классификатора: {metadata.get('format_version')}")
+            if metadata.get('labels') != cls.LABELS:
+                raise ValueError("Метки классификатора не совпадают с WorkType/ExperienceLevel")
+            return cls(
+                n_features=metadata['n_features'],
+                weights={field: data[f"{field}__weights"] for field in cls.LABELS},
+                biases={field: data[f"{field}__bias"] for field in cls.LABELS},
+                thresholds=metadata['thresholds'],
+                metadata=metadata
+            )
@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
-from typing import Optional
+from typing import List, Optional
 
 
 class Settings(BaseSettings):
@@ -10,6 +10,70 @@ class Settings(BaseSettings):
     app_port: int = Field(default=8001, env="APP_PORT")
     debug: bool = Field(default=False, env="DEBUG")
     log_level: str = Field(default="INFO", env="LOG_LEVEL")
+    log_format: str = Field(default="json", env="LOG_FORMAT")
+    log_payload_sample_rate: float = Field(default=0.0, env="LOG_PAYLOAD_SAMPLE_RATE")
+    prompt_version: str = Field(default="v1", env="PROMPT_VERSION")
+    prompt_selection_mode: str = Field(default="fixed", env="PROMPT_SELECTION_MODE")
+    prompt_canary_version: Optional[str] = Field(default=None, env="PROMPT_CANARY_VERSION")
+    prompt_canary_fraction: float = Field(default=0.1, env="PROMPT_CANARY_FRACTION")
+    prompt_quality_floor: float = Field(default=60.0, env="PROMPT_QUALITY_FLOOR")
+    prompt_max_fallback_rate: float = Field(default=0.05, env="PROMPT_MAX_FALLBACK_RATE")
+    prompt_bandit_epsilon: float = Field(default=0.1, env="PROMPT_BANDIT_EPSILON")
+    prompt_min_samples: int = Field(default=20, env="PROMPT_MIN_SAMPLES")
+    prompt_stats_window: int = Field(default=500, env="PROMPT_STATS_WINDOW")
+    prompt_cost_metric: str = Field(default="latency", env="PROMPT_COST_METRIC")
+    cache_ttl_seconds: int = Field(default=3600, env="CACHE_TTL_SECONDS")
+    # Тела ответов в кэше и ревизиях от этого размера сжимаются zlib (0 - сжимать все)
+    cache_compress_min_bytes: int = Field(default=256, env="CACHE_COMPRESS_MIN_BYTES")
+    cache_compress_level: int = Field(default=6, env="CACHE_COMPRESS_LEVEL")
+    chunk_threshold_tokens: int = Field(default=3000, env="CHUNK_THRESHOLD_TOKENS")
+    chunk_max_tokens: int = Field(default=1500, env="CHUNK_MAX_TOKENS")
+    chunk_concurrency: int = Field(default=4, env="CHUNK_CONCURRENCY")
+    # Параллельная генерация по группам полей (см. FIELD_GROUPS): ниже задержка одной вакансии
+    # ценой нескольких слотов Ollama (OLLAMA_NUM_PARALLEL) на запрос
+    field_group_fan_out: bool = Field(default=False, env="FIELD_GROUP_FAN_OUT")
+    field_group_concurrency: int = Field(default=5, env="FIELD_GROUP_CONCURRENCY")
+    revision_store_size: int = Field(default=10000, env="REVISION_STORE_SIZE")
+    field_classifier_path: Optional[str] = Field(default=None, env="FIELD_CLASSIFIER_PATH")
+    field_classifier_threshold: Optional[float] = Field(default=None, env="FIELD_CLASSIFIER_THRESHOLD")
+    classifier_samples_path: Optional[str] = Field(default=None, env="CLASSIFIER_SAMPLES_PATH")
+    # Предел тела запроса после распаковки gzip/zstd (413 сверх него)
+    max_request_body_bytes: int = Field(default=10 * 1024 * 1024, env="MAX_REQUEST_BODY_BYTES")
+    # Ответы от этого размера сжимаются, если клиент прислал Accept-Encoding: zstd/gzip
+    transport_compress_min_bytes: int = Field(default=1024, env="TRANSPORT_COMPRESS_MIN_BYTES")
+    source_extractors_enabled: bool = Field(default=True, env="SOURCE_EXTRACTORS_ENABLED")
+    normalize_timeout_seconds: float = Field(default=120.0, env="NORMALIZE_TIMEOUT_SECONDS")
+    disconnect_poll_interval: float = Field(default=0.5, env="DISCONNECT_POLL_INTERVAL")
+    finish_cancelled_into_cache: bool = Field(default=False, env="FINISH_CANCELLED_INTO_CACHE")
+    finish_into_cache_min_progress: float = Field(default=0.8, env="FINISH_INTO_CACHE_MIN_PROGRESS")
+    response_repair_enabled: bool = Field(default=True, env="RESPONSE_REPAIR_ENABLED")
+    response_max_continuations: int = Field(default=2, env="RESPONSE_MAX_CONTINUATIONS")
+    response_continuation_tokens: int = Field(default=1024, env="RESPONSE_CONTINUATION_TOKENS")
+    health_check_interval: float = Field(default=5.0, env="HEALTH_CHECK_INTERVAL")
+    # Токен админских эндпоинтов (заголовок X-Admin-Token); без него эндпоинты отключены
+    admin_token: Optional[str] = Field(default=None, env="ADMIN_TOKEN")
+    profiler_max_seconds: float = Field(default=60.0, env="PROFILER_MAX_SECONDS")
+    # Диагностика памяти: период сводки кэши/RSS (0 - выключена) и пределы сеанса tracemalloc
+    memory_summary_interval: float = Field(default=300.0, env="MEMORY_SUMMARY_INTERVAL")
+    tracemalloc_max_seconds: float = Field(default=900.0, env="TRACEMALLOC_MAX_SECONDS")
+    tracemalloc_max_frames: int = Field(default=25, env="TRACEMALLOC_MAX_FRAMES")
+    tracemalloc_max_snapshots: int = Field(default=4, env="TRACEMALLOC_MAX_SNAPSHOTS")
+    # Сторож event loop: период проверки и задержка, после которой снимается стек блокирующего кода
+    loop_watchdog_enabled: bool = Field(default=True, env="LOOP_WATCHDOG_ENABLED")
+    loop_watchdog_interval: float = Field(default=0.1, env="LOOP_WATCHDOG_INTERVAL")
+    loop_lag_threshold: float = Field(default=0.25, env="LOOP_LAG_THRESHOLD")
+    loop_watchdog_max_sites: int = Field(default=50, env="LOOP_WATCHDOG_MAX_SITES")
+    # Ступени num_ctx: контекст запроса выбирается из них, чтобы Ollama не перезагружала модель
+    # под каждый размер (пустой список - num_ctx по умолчанию модели)
+    ollama_num_ctx_buckets: List[int] = Field(default=[4096, 8192, 16384, 32768], env="OLLAMA_NUM_CTX_BUCKETS")
+    # Ожидаемая длина ответа в токенах для выбора ступени (num_predict - лишь верхняя граница)
+    ollama_output_tokens_estimate: int = Field(default=1536, env="OLLAMA_OUTPUT_TOKENS_ESTIMATE")
+    ollama_keep_alive: str = Field(default="30m", env="OLLAMA_KEEP_ALIVE")
+    ollama_warmup_enabled: bool = Field(default=True, env="OLLAMA_WARMUP_ENABLED")
+    # Длина типичного описания вакансии в токенах: по ней прогрев выбирает num_ctx рабочих запросов
+    ollama_warmup_description_tokens: int = Field(default=1000, env="OLLAMA_WARMUP_DESCRIPTION_TOKENS")
+    ollama_refresh_interval: float = Field(default=300.0, env="OLLAMA_REFRESH_INTERVAL")
+    ollama_traffic_window: float = Field(default=3600.0, env="OLLAMA_TRAFFIC_WINDOW")
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,195 @@
+import logging
+import threading
+from functools import cached_property
+from typing import Optional
+from .config.settings import Settings, settings as default_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceContainer:
+    """Контейнер сервисов приложения с ленивым созданием зависимостей"""
+
+    def __init__(self, settings: Optional[Settings] = None):
+        self.settings = settings or default_settings
+
+    @cached_property
+    def cache(self):
+        from .cache import MemoryCache
+        return MemoryCache(
+            ttl_seconds=self.settings.cache_ttl_seconds,
+            compress_min_bytes=self.settings.cache_compress_min_bytes,
+            compress_level=self.settings.cache_compress_level
+        )
+
+    @cached_property
+    def ollama_client(self):
+        from .services import OllamaClient
+        return OllamaClient(
+            model=self.settings.ollama_model,
+            base_url=self.settings.ollama_base_url,
+            num_ctx_buckets=self.settings.ollama_num_ctx_buckets,
+            output_tokens_estimate=self.settings.ollama_output_tokens_estimate
+        )
+
+    @cached_property
+    def prompt_template(self) -> str:
+        from .prompts import PromptManager
+        return PromptManager.get_prompt(self.settings.prompt_version)
+
+    @cached_property
+    def prompt_selector(self):
+        from .prompts import PromptManager
+        from .services import PromptSelector
+        return PromptSelector(
+            PromptManager.get_available_versions(),
+            default_version=self.settings.prompt_version,
+            mode=self.settings.prompt_selection_mode,
+            canary_version=self.settings.prompt_canary_version,
+            canary_fraction=self.settings.prompt_canary_fraction,
+            quality_floor=self.settings.prompt_quality_floor,
+            max_fallback_rate=self.settings.prompt_max_fallback_rate,
+            epsilon=self.settings.prompt_bandit_epsilon,
+            min_samples=self.settings.prompt_min_samples,
+            window=self.settings.prompt_stats_window,
+            cost_metric=self.settings.prompt_cost_metric
+        )
+
+    @cached_property
+    def field_classifier(self):
+        """Классификатор workType/experienceLevel; None, если артефакт не задан или не загрузился"""
+        path = self.settings.field_classifier_path
+        if not path:
+            return None
+        try:
+            from .classifiers import FieldClassifier
+            classifier = FieldClassifier.load(path)
+        except Exception as e:
+            logger.error(f"Failed to load field classifier from {path}: {e}")
+            return None
+        if self.settings.field_classifier_threshold is not None:
+            classifier.thresholds = {field: self.settings.field_classifier_threshold for field in classifier.thresholds}
+        logger.info(f"Loaded field classifier {classifier.version} from {path}, thresholds {classifier.thresholds}")
+        return classifier
+
+    @cached_property
+    def source_extractors(self):
+        """Плагины извлечения полей по разметке площадок; None, если отключены"""
+        if not self.settings.source_extractors_enabled:
+            return None
+        from .extractors import default_registry
+        return default_registry()
+
+    @cached_property
+    def job_normalizer(self):
+        from .services import JobNormalizer
+        return JobNormalizer(
+            self.ollama_client,
+            self.prompt_template,
+            payload_sample_rate=self.settings.log_payload_sample_rate,
+            prompt_version=self.settings.prompt_version,
+            chunk_threshold_tokens=self.settings.chunk_threshold_tokens,
+            chunk_max_tokens=self.settings.chunk_max_tokens,
+            chunk_concurrency=self.settings.chunk_concurrency,
+            fan_out=self.settings.field_group_fan_out,
+            fan_out_concurrency=self.settings.field_group_concurrency,
+            prompt_selector=self.prompt_selector,
+            field_classifier=self.field_classifier,
+            classifier_samples_path=self.settings.classifier_samples_path,
+            source_extractors=self.source_extractors,
+            repair_enabled=self.settings.response_repair_enabled,
+            max_continuations=self.settings.response_max_continuations,
+            continuation_tokens=self.settings.response_continuation_tokens
+        )
+
+    @cached_property
+    def revision_store(self):
+        from .cache import RevisionStore
+        return RevisionStore(
+            max_entries=self.settings.revision_store_size,
+            compress_min_bytes=self.settings.cache_compress_min_bytes,
+            compress_level=self.settings.cache_compress_level
+        )
+
+    @cached_property
+    def incremental_normalizer(self):
+        from .services import IncrementalNormalizer
+        return IncrementalNormalizer(self.job_normalizer, self.revision_store)
+
+    @cached_property
+    def normalization_pipeline(self):
+        from .services import NormalizationPipeline
+        return NormalizationPipeline(
+            self.cache,
+            self.job_normalizer,
+            self.incremental_normalizer,
+            self.prompt_selector,
+            timeout_seconds=self.settings.normalize_timeout_seconds,
+            poll_interval=self.settings.disconnect_poll_interval,
+            finish_into_cache=self.settings.finish_cancelled_into_cache,
+            finish_min_progress=self.settings.finish_into_cache_min_progress
+        )
+
+    @cached_property
+    def health_checker(self):
+        from .services import HealthChecker
+        return HealthChecker(self.ollama_client, interval_seconds=self.settings.health_check_interval)
+
+    @cached_property
+    def residency_manager(self):
+        from .services import ModelResidencyManager
+        return ModelResidencyManager(
+            self.ollama_client,
+            self.prompt_template,
+            refresh_interval=self.settings.ollama_refresh_interval,
+            traffic_window=self.settings.ollama_traffic_window,
+            warmup_enabled=self.settings.ollama_warmup_enabled,
+            warmup_description_tokens=self.settings.ollama_warmup_description_tokens
+        )
+
+    @cached_property
+    def loop_watchdog(self):
+        from .services import LoopLagWatchdog
+        return LoopLagWatchdog(
+            interval_seconds=self.settings.loop_watchdog_interval,
+            threshold_seconds=self.settings.loop_lag_threshold,
+            max_sites=self.settings.loop_watchdog_max_sites
+        )
+
+    @cached_property
+    def memory_tracker(self):
+        from .diagnostics import MemoryTracker
+        return MemoryTracker(
+            sources={
+                'response_cache': self.cache.memory_bytes,
+                'revision_store': self.revision_store.memory_bytes,
+            },
+            interval_seconds=self.settings.memory_summary_interval,
+            max_trace_seconds=self.settings.tracemalloc_max_seconds,
+            max_frames=self.settings.tracemalloc_max_frames,
+            max_snapshots=self.settings.tracemalloc_max_snapshots
+        )
+
+    @cached_property
+    def profiler_lock(self):
+        """Одновременно снимается только один профиль"""
+        return threading.Lock()
+
+    async def start(self) -> None:
+        """Запускает фоновые задачи сервисов"""
+        # Артефакт классификатора загружаем при старте, а не на первом запросе
+        self.field_classifier
+        if self.settings.loop_watchdog_enabled:
+            self.loop_watchdog.start()
+        self.health_checker.start()
+        self.residency_manager.start()
+        if self.settings.memory_summary_interval > 0:
+            self.memory_tracker.start()
+
+    async def stop(self) -> None:
+        """Останавливает фоновые задачи сервисов"""
+        for name in ('memory_tracker', 'residency_manager', 'health_checker', 'loop_watchdog'):
+            # Сервисы - cached_property: не созданный сервис при остановке не создаем
+            service = self.__dict__.get(name)
+            if service is not None:
+                await service.stop()
@@ -0,0 +1,59 @@
+import hmac
+from typing import Optional
+
+from fastapi import Header, HTTPException, Request
+from .container import ServiceContainer
+
+
+def get_container(request: Request) -> ServiceContainer:
+    """Контейнер сервисов текущего приложения"""
+    return request.app.state.container
+
+
+def get_cache(request: Request):
+    return get_container(request).cache
+
+
+def get_job_normalizer(request: Request):
+    return get_container(request).job_normalizer
+
+
+def get_incremental_normalizer(request: Request):
+    return get_container(request).incremental_normalizer
+
+
+def get_normalization_pipeline(request: Request):
+    return get_container(request).normalization_pipeline
+
+
+def get_prompt_selector(request: Request):
+    return get_container(request).prompt_selector
+
+
+def get_health_checker(request: Request):
+    return get_container(request).health_checker
+
+
+def get_residency_manager(request: Request):
+    return get_container(request).residency_manager
+
+
+def get_source_extractors(request: Request):
+    return get_container(request).source_extractors
+
+
+def get_loop_watchdog(request: Request):
+    return get_container(request).loop_watchdog
+
+
+def get_memory_tracker(request: Request):
+    return get_container(request).memory_tracker
+
+
+def require_admin(request: Request, x_admin_token: Optional[str] = Header(None)) -> None:
+    """Проверяет токен администратора; если ADMIN_TOKEN не задан, админские эндпоинты отключены"""
+    token = get_container(request).settings.admin_token
+    if not token:
+        raise HTTPException(status_code=404, detail="Админские эндпоинты отключены")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), token.encode()):
+        raise HTTPException(status_code=401, detail="Неверный токен администратора")
@@ -0,0 +1,5 @@
+from .sampling_profiler import SamplingProfiler
+from .memory_tracker import MemoryTracker, process_rss_bytes
+from .paths import short_path
+
+__all__ = ["SamplingProfiler", "MemoryTracker", "process_rss_bytes", "short_path"]
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import os
+import time
+import tracemalloc
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from .paths import short_path
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Аллокации самого tracemalloc и импорта модулей в снимки не попадают
+_SNAPSHOT_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>'),
+)
+
+
+def process_rss_bytes() -> Optional[int]:
+    """Текущий RSS процесса; вне Linux - пиковый RSS по getrusage"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - resource есть только на Unix
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class MemoryTracker:
+    """Диагностика роста памяти.
+
+    По запросу включает tracemalloc на ограниченное время (потом он выключается сам,
+    чтобы накладные расходы не остались в продакшене), хранит несколько именованных
+    снимков и сравнивает их по местам аллокаций. Фоновая сводка раз в interval
+    сравнивает размер кэшей (sources) с RSS процесса.
+    """
+
+    def __init__(
+        self,
+        sources: Dict[str, Callable[[], int]],
+        interval_seconds: float = 60.0,
+        max_trace_seconds: float = 900.0,
+        max_frames: int = 25,
+        max_snapshots: int = 4
+    ):
+        self.sources = sources
+        self.interval_seconds = interval_seconds
+        self.max_trace_seconds = max_trace_seconds
+        self.max_frames = max_frames
+        self.max_snapshots = max_snapshots
+        self.snapshots: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._trace_deadline: Optional[float] = None
+        self._stop_handle: Optional[asyncio.TimerHandle] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start_tracing(self, frames: int = 1, seconds: Optional[float] = None) -> Dict[str, Any]:
+        """Включает tracemalloc на seconds секунд (не дольше max_trace_seconds)"""
+        frames = max(1, min(frames, self.max_frames))
+        seconds = min(seconds or self.max_trace_seconds, self.max_trace_seconds)
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        # Снимки прошлого сеанса несравнимы с новыми аллокациями
+        self.snapshots.clear()
+        tracemalloc.start(frames)
+        if self._stop_handle is not None:
+            self._stop_handle.cancel()
+        self._stop_handle = asyncio.get_running_loop().call_later(seconds, self.stop_tracing)
+        self._trace_deadline = time.monotonic() + seconds
+        logger.warning(f"tracemalloc started: {frames} frames, auto stop in {seconds}s")
+        return self.status()
+
+    def stop_tracing(self) -> Dict[str, Any]:
+        """Выключает tracemalloc; снятые снимки остаются доступны для сравнения"""
+        if self._stop_handle is not None:
+            self._stop_handle.cancel()
+            self._stop_handle = None
+        self._trace_deadline = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            metrics.set_gauge('tracemalloc_traced_bytes', 0)
+            logger.warning("tracemalloc stopped")
+        return self.status()
+
+    def take_snapshot(self, name: str) -> Dict[str, Any]:
+        """Снимок аллокаций под именем name; старые снимки вытесняются сверх max_snapshots.
+
+        Снятие снимка занимает заметное время на больших кучах - вызывать вне event loop.
+        """
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running")
+        snapshot = tracemalloc.take_snapshot().filter_traces(_SNAPSHOT_FILTERS)
+        traced, peak = tracemalloc.get_traced_memory()
+        self.snapshots.pop(name, None)
+        self.snapshots[name] = {
+            'snapshot': snapshot,
+            'taken_at': time.time(),
+            'traced_bytes': traced,
+            'peak_bytes': peak,
+            'rss_bytes': process_rss_bytes(),
+            'sources': self._source_bytes(),
+        }
+        while len(self.snapshots) > self.max_snapshots:
+            evicted, _ = self.snapshots.popitem(last=False)
+            logger.info(f"tracemalloc snapshot evicted: {evicted}")
+        return self._snapshot_info(name)
+
+    def diff(self, base: str, target: str, limit: int = 20, group_by: str = 'lineno') -> Dict[str, Any]:
+        """Места аллокаций с наибольшим приростом памяти от снимка base к target"""
+        missing = [name for name in (base, target) if name not in self.snapshots]
+        if missing:
+            raise KeyError(', '.join(missing))
+        old, new = self.snapshots[base], self.snapshots[target]
+        stats = new['snapshot'].compare_to(old['snapshot'], group_by)
+        top = []
+        for stat in stats[:limit]:
+            # Кадры идут от самого старого к месту аллокации; при group_by=filename строк нет
+            frames = [
+                short_path(frame.filename) + (f":{frame.lineno}" if group_by != 'filename' else '')
+                for frame in stat.traceback
+            ]
+            top.append({
+                'site': frames[-1],
+                'size_diff_bytes': stat.size_diff,
+                'size_bytes': stat.size,
+                'count_diff': stat.count_diff,
+                'count': stat.count,
+                **({'traceback': frames} if group_by == 'traceback' else {}),
+            })
+        return {
+            'base': self._snapshot_info(base),
+            'target': self._snapshot_info(target),
+            'traced_diff_bytes': new['traced_bytes'] - old['traced_bytes'],
+            'rss_diff_bytes': (
+                new['rss_bytes'] - old['rss_bytes'] if new['rss_bytes'] is not None and old['rss_bytes'] is not None
+                else None
+            ),
+            'sources_diff_bytes': {
+                name: new['sources'][name] - old['sources'].get(name, 0) for name in new['sources']
+            },
+            'top': top,
+        }
+
+    def _snapshot_info(self, name: str) -> Dict[str, Any]:
+        entry = self.snapshots[name]
+        return {'name': name, **{key: value for key, value in entry.items() if key != 'snapshot'}}
+
+    def _source_bytes(self) -> Dict[str, int]:
+        sizes = {}
+        for name, measure in self.sources.items():
+            try:
+                sizes[name] = measure()
+            except Exception as e:
+                logger.warning(f"Memory source {name} failed: {e}")
+        return sizes
+
+    def status(self) -> Dict[str, Any]:
+        """Состояние tracemalloc и список снимков"""
+        tracing = tracemalloc.is_tracing()
+        traced, peak = tracemalloc.get_traced_memory() if tracing else (None, None)
+        remaining = None
+        if self._trace_deadline is not None:
+            remaining = round(max(self._trace_deadline - time.monotonic(), 0.0), 1)
+        return {
+            'tracing': tracing,
+            'frames': tracemalloc.get_traceback_limit() if tracing else None,
+            'traced_bytes': traced,
+            'peak_bytes': peak,
+            'stops_in_seconds': remaining,
+            'snapshots': [self._snapshot_info(name) for name in self.snapshots],
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Размер кэшей относительно RSS процесса"""
+        rss = process_rss_bytes()
+        sources = self._source_bytes()
+        total = sum(sources.values())
+        summary = {
+            'rss_bytes': rss,
+            'sources_bytes': sources,
+            'sources_total_bytes': total,
+            'sources_share_of_rss': round(total / rss, 4) if rss else None,
+        }
+        if tracemalloc.is_tracing():
+            summary['tracemalloc_traced_bytes'] = tracemalloc.get_traced_memory()[0]
+        return summary
+
+    def report(self) -> Dict[str, Any]:
+        """Сводка памяти: пишет gauge метрики и строку в лог"""
+        summary = self.summary()
+        if summary['rss_bytes'] is not None:
+            metrics.set_gauge('process_rss_bytes', summary['rss_bytes'])
+        for name, size in summary['sources_bytes'].items():
+            metrics.set_gauge('memory_source_bytes', size, source=name)
+        if 'tracemalloc_traced_bytes' in summary:
+            metrics.set_gauge('tracemalloc_traced_bytes', summary['tracemalloc_traced_bytes'])
+        sources = ', '.join(f"{name} {size / 2**20:.1f} MiB" for name, size in summary['sources_bytes'].items())
+        rss = f"{summary['rss_bytes'] / 2**20:.1f} MiB" if summary['rss_bytes'] is not None else 'n/a'
+        logger.info(f"Memory: RSS {rss}; {sources}; share of RSS {summary['sources_share_of_rss']}")
+        return summary
+
+    async def _run(self) -> None:
+        """Фоновая периодическая сводка памяти"""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                self.report()
+            except Exception as e:
+                logger.warning(f"Memory summary failed: {e}")
+
+    def start(self) -> None:
+        """Запускает периодическую сводку"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Memory summary started with interval {self.interval_seconds}s")
+
+    async def stop(self) -> None:
+        """Останавливает периодическую сводку и tracemalloc"""
+        self.stop_tracing()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,19 @@
+import os
+import sys
+from functools import lru_cache
+
+# Пакет app и корень ai-service
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ROOT_DIR = os.path.dirname(APP_DIR)
+
+
+@lru_cache(maxsize=4096)
+def short_path(filename: str) -> str:
+    """Путь относительно ai-service или ближайшего каталога sys.path (stdlib, site-packages),
+    чтобы имена кадров в профилях, снимках памяти и стеках были короче"""
+    if filename.startswith(ROOT_DIR + os.sep):
+        return os.path.relpath(filename, ROOT_DIR)
+    # Самый длинный подходящий каталог: site-packages лежит внутри каталога stdlib
+    roots = [path.rstrip(os.sep) for path in sys.path if path]
+    root = max((path for path in roots if filename.startswith(path + os.sep)), key=len, default=None)
+    return os.path.relpath(filename, root) if root else filename
@@ -0,0 +1,136 @@
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from .paths import short_path
+
+# Кадр профиля: (функция, файл, первая строка функции)
+Frame = Tuple[str, str, int]
+Stack = Tuple[Frame, ...]
+
+# Верхние кадры потоков, которые ждут, а не работают: ожидание блокировки или очереди
+# (QueueListener логирования, сторож event loop, пул to_thread), select простаивающего
+# event loop, чтение ответа Ollama синхронным клиентом
+IDLE_FRAMES = frozenset({
+    ('wait', 'threading.py'),
+    ('_wait_for_tstate_lock', 'threading.py'),
+    ('get', 'queue.py'),
+    ('dequeue', 'logging/handlers.py'),
+    ('select', 'selectors.py'),
+    ('_worker', 'concurrent/futures/thread.py'),
+    ('read', 'httpcore/_backends/sync.py'),
+})
+
+
+class SamplingProfiler:
+    """Сэмплирующий профилировщик CPU по всем потокам процесса.
+
+    Отдельный поток раз в interval снимает стеки всех потоков через
+    sys._current_frames(); накладные расходы не зависят от числа вызовов
+    в профилируемом коде, поэтому профиль можно снимать под реальной нагрузкой.
+    Стек каждого потока начинается с имени потока.
+
+    sys._current_frames() возвращает и простаивающие потоки, поэтому стеки, верхний кадр
+    которых - известное ожидание (IDLE_FRAMES), пропускаются: профиль приближается к
+    on-CPU. Ожидание в C коде, вызванном из другого места (например, time.sleep),
+    так не отличить. С include_idle=True профиль - по времени выполнения (wall clock).
+    """
+
+    def __init__(self, interval_seconds: float = 0.01, include_idle: bool = False):
+        self.interval_seconds = interval_seconds
+        self.include_idle = include_idle
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.idle_samples = 0
+        self.duration_seconds = 0.0
+
+    @staticmethod
+    def _stack(frame) -> Stack:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_name, short_path(code.co_filename), code.co_firstlineno))
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        """Снимает один срез стеков всех потоков, кроме exclude"""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == exclude:
+                continue
+            stack = self._stack(frame)
+            if not self.include_idle and stack and stack[-1][:2] in IDLE_FRAMES:
+                self.idle_samples += 1
+                continue
+            root = (names.get(thread_id, f"thread-{thread_id}"), '', 0)
+            self.samples[(root,) + stack] += 1
+        self.sample_count += 1
+
+    def run(self, seconds: float) -> 'SamplingProfiler':
+        """Сэмплирует текущий процесс seconds секунд (блокирует вызывающий поток)"""
+        me = threading.get_ident()
+        started = time.monotonic()
+        deadline = started + seconds
+        next_sample = started
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if now < next_sample:
+                time.sleep(min(next_sample, deadline) - now)
+                continue
+            self.sample(exclude=me)
+            next_sample += self.interval_seconds
+        self.duration_seconds = time.monotonic() - started
+        return self
+
+    @staticmethod
+    def _frame_name(frame: Frame) -> str:
+        name, filename, line = frame
+        return f"{name} ({filename}:{line})" if filename else name
+
+    def collapsed(self) -> str:
+        """Формат collapsed stacks (flamegraph.pl, speedscope, inferno): "a;b;c count" """
+        lines = [
+            ';'.join(self._frame_name(frame) for frame in stack) + f" {count}"
+            for stack, count in self.samples.most_common()
+        ]
+        return '\n'.join(lines) + '\n'
+
+    def speedscope(self, name: str = 'ai-service') -> Dict[str, Any]:
+        """Профиль в формате speedscope (sampled профиль на каждый поток, вес - секунды)"""
+        frames: List[Dict[str, Any]] = []
+        frame_index: Dict[Frame, int] = {}
+        by_thread: Dict[str, Tuple[List[List[int]], List[float]]] = {}
+        for stack, count in self.samples.items():
+            indices = []
+            for frame in stack[1:]:
+                if frame not in frame_index:
+                    frame_index[frame] = len(frames)
+                    frames.append({'name': frame[0], 'file': frame[1], 'line': frame[2]})
+                indices.append(frame_index[frame])
+            samples, weights = by_thread.setdefault(stack[0][0], ([], []))
+            samples.append(indices)
+            weights.append(count * self.interval_seconds)
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'name': name,
+            'exporter': 'ai-service SamplingProfiler',
+            'shared': {'frames': frames},
+            'profiles': [
+                {
+                    'type': 'sampled',
+                    'name': thread,
+                    'unit': 'seconds',
+                    'startValue': 0,
+                    'endValue': sum(weights),
+                    'samples': samples,
+                    'weights': weights,
+                }
+                for thread, (samples, weights) in sorted(by_thread.items())
+            ],
+        }
@@ -3,7 +3,8 @@ from .ai_exceptions import (
     OllamaConnectionError,
     ModelNotAvailableError,
     InvalidResponseError,
-    PromptProcessingError
+    PromptProcessingError,
+    GenerationCancelledError
 )
 
 __all__ = [
@@ -11,5 +12,6 @@ __all__ = [
     "OllamaConnectionError", 
     "ModelNotAvailableError",
     "InvalidResponseError",
-    "PromptProcessingError"
+    "PromptProcessingError",
+    "GenerationCancelledError"
 ]
@@ -21,3 +21,11 @@ class InvalidResponseError(AIServiceError):
 class PromptProcessingError(AIServiceError):
     """Ошибка обработки промпта"""
     pass
+
+
+class GenerationCancelledError(AIServiceError):
+    """Генерация отменена: клиент отключился или истек таймаут запроса"""
+
+    def __init__(self, reason: str):
+        super().__init__(f"Генерация отменена: {reason}")
+        self.reason = reason
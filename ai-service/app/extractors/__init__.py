@@ -0,0 +1,13 @@
+from .salary_extractor import SalaryExtractor
+from .source_extractors import (
+    SourceExtractor, SourceExtractorRegistry, HabrCareerExtractor, JobPostingExtractor, default_registry
+)
+
+__all__ = [
+    "SalaryExtractor",
+    "SourceExtractor",
+    "SourceExtractorRegistry",
+    "HabrCareerExtractor",
+    "JobPostingExtractor",
+    "default_registry",
+]
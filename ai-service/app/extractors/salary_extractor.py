@@ -0,0 +1,97 @@
+import re
+from typing import Any, Dict, Optional, Tuple
+
+_NUMBER = r'(\d[\d\s ]*(?:[.,]\d+)?)\s*(тыс\.?|[kк](?![a-zа-я]))?'
+_RANGE_PATTERN = re.compile(
+    rf'(?:от\s*)?{_NUMBER}\s*(?:-|–|—|до)\s*{_NUMBER}',
+    re.IGNORECASE
+)
+_FROM_PATTERN = re.compile(rf'от\s*{_NUMBER}', re.IGNORECASE)
+_TO_PATTERN = re.compile(rf'до\s*{_NUMBER}', re.IGNORECASE)
+_SINGLE_PATTERN = re.compile(_NUMBER, re.IGNORECASE)
+
+
+class SalaryExtractor:
+    """Детерминированное извлечение зарплаты из раздела "Зарплата" без обращения к модели"""
+
+    CURRENCIES = (
+        ('RUB', ('руб', '₽', 'rub', 'р.')),
+        ('USD', ('$', 'usd', 'долл')),
+        ('EUR', ('€', 'eur', 'евро')),
+    )
+
+    @classmethod
+    def _currency(cls, text: str) -> Optional[str]:
+        lowered = text.lower()
+        for code, markers in cls.CURRENCIES:
+            if any(marker in lowered for marker in markers):
+                return code
+        return None
+
+    @staticmethod
+    def _to_int(number: str, multiplier: Optional[str]) -> int:
+        value = float(re.sub(r'[\s ]', '', number).replace(',', '.'))
+        if multiplier:
+            value *= 1000
+        return int(value)
+
+    @classmethod
+    def extract(cls, text: str) -> Optional[Dict[str, Any]]:
+        """Возвращает зарплату в формате ответа модели или None, если в тексте нет суммы с валютой"""
+        if not text:
+            return None
+        currency = cls._currency(text)
+        if not currency:
+            return None
+
+        salary_min = salary_max = None
+        match = _RANGE_PATTERN.search(text)
+        if match:
+            salary_min = cls._to_int(match.group(1), match.group(2) or match.group(4))
+            salary_max = cls._to_int(match.group(3), match.group(4))
+        else:
+            from_match = _FROM_PATTERN.search(text)
+            to_match = _TO_PATTERN.search(text)
+            if from_match:
+                salary_min = cls._to_int(from_match.group(1), from_match.group(2))
+            if to_match:
+                salary_max = cls._to_int(to_match.group(1), to_match.group(2))
+            if not from_match and not to_match:
+                single = _SINGLE_PATTERN.search(text)
+                if single:
+                    salary_min = salary_max = cls._to_int(single.group(1), single.group(2))
+        if salary_min is None and salary_max is None:
+            return None
+
+        lowered = text.lower()
+        salary_type = None
+        if 'до вычета' in lowered or re.search(r'\bgross\b', lowered):
+            salary_type = 'до вычета налогов'
+        elif 'на руки' in lowered or 'после вычета' in lowered or re.search(r'\bnet\b', lowered):
+            salary_type = 'после вычета налогов'
+
+        return {
+            'min': salary_min,
+            'max': salary_max,
+            'currency': currency,
+            'period': 'year' if re.search(r'в\s+год|годов|/\s*год', lowered) else 'month',
+            'type': salary_type
+        }
+
+    @classmethod
+    def mentions(cls, text: str) -> str:
+        """Строки текста с числами или валютой - все, что может относиться к зарплате"""
+        return '\n'.join(
+            line for line in text.splitlines()
+            if re.search(r'\d', line) or cls._currency(line)
+        )
+
+    @classmethod
+    def extract_from_sections(cls, sections: Dict[str, str]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+        """Зарплата из раздела "Зарплата" (см. SectionSplitter.split): (удалось ли определить, значение).
+
+        Без раздела или без суммы в нем зарплата не считается известной: она может быть
+        упомянута в тексте без заголовка, и ее извлекает модель.
+        """
+        salary = cls.extract(sections.get('salary', ''))
+        return salary is not None, salary
@@ -0,0 +1,365 @@
+import html
+import json
+import logging
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from .salary_extractor import SalaryExtractor
+from ..metrics import metrics
+from ..prompts import AI_FIELDS
+from ..utils import SectionSplitter
+
+logger = logging.getLogger(__name__)
+
+_SECTION_PATTERN = re.compile(
+    r'<div[^>]*class="[^"]*\bcontent-section\b[^"]*"[^>]*>(.*?)(?=<div[^>]*class="[^"]*\bcontent-section\b|\Z)',
+    re.IGNORECASE | re.DOTALL
+)
+_SECTION_TITLE_PATTERN = re.compile(
+    r'<h2[^>]*class="[^"]*content-section__title[^"]*"[^>]*>(.*?)</h2>',
+    re.IGNORECASE | re.DOTALL
+)
+_BASIC_SALARY_PATTERN = re.compile(
+    r'<div[^>]*class="[^"]*\bbasic-salary\b[^"]*"[^>]*>(.*?)</div>',
+    re.IGNORECASE | re.DOTALL
+)
+_LD_JSON_PATTERN = re.compile(
+    r'<script[^>]*type="application/ld\+json"[^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_SPACES_PATTERN = re.compile(r'\s+')
+# Заголовок раздела в тексте без разметки: ключевое слово SectionSplitter, до двух слов и двоеточие
+# ("Требования:", "Условия работы:"); парсер склеивает текст страницы в одну строку, поэтому
+# заголовки ищутся внутри строки, а не только в ее начале
+_PLAIN_HEADING_PATTERN = re.compile(
+    r'(?<![\w-])(?:'
+    + '|'.join(
+        r'\s+'.join(map(re.escape, prefix.split()))
+        for prefixes in SectionSplitter.SECTION_KEYWORDS.values()
+        for prefix in sorted(prefixes, key=len, reverse=True)
+    )
+    + r')\w*(?:\s+[\w-]+){0,2}\s*:',
+    re.IGNORECASE
+)
+
+
+def html_text(fragment: str) -> str:
+    """Текст HTML фрагмента без тегов и лишних пробелов"""
+    return _SPACES_PATTERN.sub(' ', html.unescape(_TAG_PATTERN.sub(' ', fragment))).strip()
+
+
+def plain_sections(description: str) -> List[Tuple[str, str]]:
+    """Разделы текста без разметки: (заголовок в нижнем регистре, текст раздела).
+
+    Заголовком считается только слово с заглавной буквы, чтобы не резать
+    предложения вроде "основные задачи: ...".
+    """
+    headings = [match for match in _PLAIN_HEADING_PATTERN.finditer(description) if match.group(0)[0].isupper()]
+    sections = []
+    for heading, following in zip(headings, headings[1:] + [None]):
+        end = following.start() if following else len(description)
+        title = _SPACES_PATTERN.sub(' ', heading.group(0)).rstrip(' :').lower()
+        sections.append((title, description[heading.end():end].strip()))
+    return sections
+
+
+class SourceExtractor(ABC):
+    """Плагин детерминированного извлечения полей для площадки со стабильной разметкой.
+
+    extract() возвращает только поля, найденные в разметке, в формате ответа модели
+    (ключи company, salary, location, workType, experienceLevel и т.д., как после
+    JobNormalizer._normalize_ai_data). Поля, которых плагин не вернул, извлекает модель.
+
+    Парсер обычно присылает не HTML, а текст страницы; для него плагины используют
+    extract_text() - разделы с заголовками вида "Зарплата:" и уровень из названия.
+    """
+
+    # Имя плагина в статистике и метриках
+    name = 'base'
+    # Значения NormalizeRequest.source_name, для которых применяется плагин
+    sources: Tuple[str, ...] = ()
+
+    WORK_TYPES = (
+        ('internship', ('стажировка',)),
+        ('hybrid', ('гибрид', 'частично удален')),
+        ('remote', ('можно удаленно', 'удаленная работа', 'удаленно')),
+        ('part_time', ('неполный рабочий день', 'частичная занятость')),
+        ('full_time', ('полный рабочий день', 'полная занятость')),
+    )
+    EXPERIENCE_LEVELS = (
+        ('no_experience', ('intern', 'стажёр', 'стажер')),
+        ('lead', ('lead', 'ведущий')),
+        ('senior', ('senior', 'старший')),
+        ('middle', ('middle', 'средний')),
+        ('junior', ('junior', 'младший')),
+    )
+
+    @abstractmethod
+    def extract(self, title: str, description: str) -> Dict[str, Any]:
+        """Поля вакансии из разметки площадки"""
+
+    @staticmethod
+    def _match(text: str, table: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Optional[str]:
+        lowered = text.lower()
+        return next((value for value, markers in table if any(marker in lowered for marker in markers)), None)
+
+    def extract_text(self, title: str, description: str) -> Dict[str, Any]:
+        """Поля из текста без разметки; отсутствие раздела не означает отсутствие поля"""
+        data: Dict[str, Any] = {}
+        by_kind: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        for heading, text in plain_sections(description):
+            by_kind[SectionSplitter.classify(heading)].append((heading, text))
+
+        for _, text in by_kind['salary']:
+            salary = SalaryExtractor.extract(text)
+            if salary is not None:
+                data['salary'] = salary
+                break
+
+        work_type = self._match(
+            ' '.join(text for _, text in by_kind['conditions'] + by_kind['location']), self.WORK_TYPES
+        )
+        if work_type:
+            data['workType'] = work_type
+
+        for heading, text in by_kind['location']:
+            city = re.split(r'[,•]', text, maxsplit=1)[0].strip()
+            if heading.startswith('город') and city and self._match(city, self.WORK_TYPES) is None:
+                data['location'] = {
+                    'city': city,
+                    'country': 'Россия',
+                    'address': None,
+                    'remote': work_type in ('remote', 'hybrid')
+                }
+                break
+
+        level = self._match(title, self.EXPERIENCE_LEVELS)
+        if level:
+            data['experienceLevel'] = level
+        return data
+
+
+class HabrCareerExtractor(SourceExtractor):
+    """Страница вакансии Хабр Карьеры: блоки content-section с заголовком content-section__title"""
+
+    name = 'habr_career'
+    sources = ('Habr Career', 'career.habr.com')
+
+    @staticmethod
+    def sections(description: str) -> Dict[str, str]:
+        """Разделы страницы: заголовок в нижнем регистре -> HTML содержимое"""
+        sections = {}
+        for match in _SECTION_PATTERN.finditer(description):
+            title = _SECTION_TITLE_PATTERN.search(match.group(1))
+            if title:
+                sections[html_text(title.group(1)).lower()] = match.group(1)
+        return sections
+
+    @staticmethod
+    def _find(sections: Dict[str, str], prefix: str) -> Optional[str]:
+        return next((content for title, content in sections.items() if title.startswith(prefix)), None)
+
+    def extract(self, title: str, description: str) -> Dict[str, Any]:
+        sections = self.sections(description)
+        if not sections:
+            return self.extract_text(title, description)
+        data: Dict[str, Any] = {}
+
+        salary_section = self._find(sections, 'зарплата')
+        if salary_section is None:
+            # На странице нет блока "Зарплата" - зарплата не указана
+            data['salary'] = None
+        else:
+            basic = _BASIC_SALARY_PATTERN.search(salary_section)
+            salary = SalaryExtractor.extract(html_text(basic.group(1) if basic else salary_section))
+            if salary is not None:
+                data['salary'] = salary
+
+        location_section = self._find(sections, 'местоположение')
+        if location_section is not None:
+            text = html_text(_SECTION_TITLE_PATTERN.sub('', location_section))
+            work_type = self._match(text, self.WORK_TYPES)
+            if work_type:
+                data['workType'] = work_type
+            parts = [part.strip() for part in text.split('•') if part.strip()]
+            if parts and self._match(parts[0], self.WORK_TYPES) is None:
+                data['location'] = {
+                    'city': parts[0],
+                    'country': 'Россия',
+                    'address': None,
+                    'remote': work_type in ('remote', 'hybrid')
+                }
+
+        requirements_section = self._find(sections, 'требования')
+        if requirements_section is not None:
+            level = self._match(html_text(_SECTION_TITLE_PATTERN.sub('', requirements_section)), self.EXPERIENCE_LEVELS)
+            if level:
+                data['experienceLevel'] = level
+        return data
+
+
+class JobPostingExtractor(SourceExtractor):
+    """Разметка schema.org JobPosting (JSON-LD), которую отдают страницы вакансий hh.ru и SuperJob"""
+
+    name = 'job_posting_ld'
+    sources = ('HH.ru', 'hh.ru', 'SuperJob', 'superjob.ru')
+
+    EMPLOYMENT_TYPES = {
+        'FULL_TIME': 'full_time',
+        'PART_TIME': 'part_time',
+        'CONTRACTOR': 'contract',
+        'TEMPORARY': 'contract',
+        'INTERN': 'internship',
+    }
+    PERIODS = {'MONTH': 'month', 'YEAR': 'year'}
+    COUNTRIES = {'RU': 'Россия', 'BY': 'Беларусь', 'KZ': 'Казахстан'}
+
+    @staticmethod
+    def job_posting(description: str) -> Optional[Dict[str, Any]]:
+        for match in _LD_JSON_PATTERN.finditer(description):
+            try:
+                data = json.loads(html.unescape(match.group(1)))
+            except json.JSONDecodeError:
+                continue
+            for item in data if isinstance(data, list) else [data]:
+                if isinstance(item, dict) and item.get('@type') == 'JobPosting':
+                    return item
+        return None
+
+    def extract(self, title: str, description: str) -> Dict[str, Any]:
+        posting = self.job_posting(description)
+        if posting is None:
+            return self.extract_text(title, description)
+        data: Dict[str, Any] = {}
+
+        base_salary = posting.get('baseSalary')
+        if isinstance(base_salary, dict):
+            value = base_salary.get('value') or {}
+            salary_min = value.get('minValue', value.get('value'))
+            salary_max = value.get('maxValue', value.get('value'))
+            if salary_min is not None or salary_max is not None:
+                data['salary'] = {
+                    'min': int(salary_min) if salary_min is not None else None,
+                    'max': int(salary_max) if salary_max is not None else None,
+                    'currency': base_salary.get('currency'),
+                    'period': self.PERIODS.get(str(value.get('unitText', '')).upper(), 'month'),
+                    'type': None
+                }
+        else:
+            data['salary'] = None
+
+        employment = posting.get('employmentType')
+        employment = employment[0] if isinstance(employment, list) and employment else employment
+        if posting.get('jobLocationType') == 'TELECOMMUTE':
+            data['workType'] = 'remote'
+        elif employment in self.EMPLOYMENT_TYPES:
+            data['workType'] = self.EMPLOYMENT_TYPES[employment]
+
+        location = posting.get('jobLocation')
+        location = location[0] if isinstance(location, list) and location else location
+        address = location.get('address') if isinstance(location, dict) else None
+        if isinstance(address, dict) and address.get('addressLocality'):
+            country = address.get('addressCountry')
+            country = country.get('name') if isinstance(country, dict) else country
+            data['location'] = {
+                'city': address['addressLocality'],
+                'country': self.COUNTRIES.get(country, country or 'Россия'),
+                'address': address.get('streetAddress'),
+                'remote': posting.get('jobLocationType') == 'TELECOMMUTE'
+            }
+        return data
+
+
+class SourceExtractorRegistry:
+    """Плагины извлечения по NormalizeRequest.source_name и статистика их покрытия"""
+
+    def __init__(self):
+        self._plugins: Dict[str, SourceExtractor] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, Any]] = defaultdict(
+            lambda: {'requests': 0, 'seconds': 0.0, 'seconds_saved': 0.0, 'fields': defaultdict(int)}
+        )
+
+    @staticmethod
+    def _key(source_name: str) -> str:
+        return source_name.strip().lower()
+
+    def register(self, extractor: SourceExtractor) -> None:
+        """Регистрирует плагин для всех его источников (повторная регистрация заменяет плагин)"""
+        for source in extractor.sources:
+            self._plugins[self._key(source)] = extractor
+        logger.info(f"Registered source extractor {extractor.name} for: {', '.join(extractor.sources)}")
+
+    def get(self, source_name: Optional[str]) -> Optional[SourceExtractor]:
+        if not source_name:
+            return None
+        return self._plugins.get(self._key(source_name))
+
+    def extract(
+        self,
+        source_name: Optional[str],
+        title: str,
+        description: str,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """(имя плагина или None, найденные поля в формате ответа модели), только из fields"""
+        plugin = self.get(source_name)
+        if plugin is None:
+            return None, {}
+        started = time.perf_counter()
+        try:
+            data = plugin.extract(title, description)
+        except Exception as e:
+            logger.warning(f"Source extractor {plugin.name} failed for job {title}: {e}")
+            data = {}
+        elapsed = time.perf_counter() - started
+        data = {
+            key: value for key, value in data.items()
+            if key in AI_FIELDS and (fields is None or AI_FIELDS[key] in fields)
+        }
+
+        metrics.observe('source_extractor_latency_seconds', elapsed, plugin=plugin.name)
+        with self._lock:
+            stats = self._stats[plugin.name]
+            stats['requests'] += 1
+            stats['seconds'] += elapsed
+            for key in data:
+                stats['fields'][AI_FIELDS[key]] += 1
+        for key in data:
+            metrics.inc('source_extractor_fields_total', plugin=plugin.name, field=AI_FIELDS[key])
+        return plugin.name, data
+
+    def record_saved(self, plugin_name: str, seconds: float) -> None:
+        """Учитывает оценку времени модели, сэкономленного полями плагина"""
+        metrics.inc('source_extractor_seconds_saved_total', seconds, plugin=plugin_name)
+        with self._lock:
+            self._stats[plugin_name]['seconds_saved'] += seconds
+
+    def stats(self) -> Dict[str, Any]:
+        """Покрытие полей (доля запросов, где плагин заполнил поле) и сэкономленное время по плагинам"""
+        plugins = {}
+        with self._lock:
+            for plugin in {id(p): p for p in self._plugins.values()}.values():
+                stats = self._stats[plugin.name]
+                count = stats['requests']
+                plugins[plugin.name] = {
+                    'sources': list(plugin.sources),
+                    'requests': count,
+                    'coverage': {field: filled / count for field, filled in stats['fields'].items()} if count else {},
+                    'mean_extract_ms': stats['seconds'] / count * 1000 if count else None,
+                    'model_seconds_saved': round(stats['seconds_saved'], 3),
+                }
+        return {'plugins': plugins}
+
+
+def default_registry() -> SourceExtractorRegistry:
+    """Реестр со встроенными плагинами площадок"""
+    registry = SourceExtractorRegistry()
+    registry.register(HabrCareerExtractor())
+    registry.register(JobPostingExtractor())
+    return registry
@@ -1,36 +1,39 @@
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 import os
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Optional, List
 from .config.settings import settings
 
+# Стандартные атрибуты LogRecord, все остальные считаются переданными через extra
+_RECORD_ATTRS = set(logging.makeLogRecord({}).__dict__) | {'message', 'asctime'}
 
-def setup_logging(log_level: Optional[str] = None) -> None:
-    """Настраивает логирование для приложения"""
-    
-    level = log_level or settings.log_level
-    log_level_map = {
-        'DEBUG': logging.DEBUG,
-        'INFO': logging.INFO,
-        'WARNING': logging.WARNING,
-        'ERROR': logging.ERROR,
-        'CRITICAL': logging.CRITICAL
-    }
-    
-    # Настраиваем формат логов
-    log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    
-    # Создаем обработчики
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(logging.Formatter(log_format))
-    
-    # Настраиваем корневой логгер
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level_map.get(level.upper(), logging.INFO))
-    root_logger.handlers.clear()
-    root_logger.addHandler(console_handler)
-    
-    # Пытаемся создать файловый обработчик
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Форматирует запись лога в одну JSON строку"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def _create_file_handler(formatter: logging.Formatter) -> Optional[logging.Handler]:
+    """Создает файловый обработчик в logs/ или во временной директории"""
     try:
         # Создаем директорию для логов если её нет
         current_dir = os.path.dirname(__file__)  # ai-service/app
@@ -38,27 +41,82 @@ def setup_logging(log_level: Optional[str] = None) -> None:
         project_root = os.path.dirname(ai_service_dir)  # project root
         log_dir = os.path.join(project_root, 'logs')
         os.makedirs(log_dir, exist_ok=True)
-        
+
         log_file_path = os.path.join(log_dir, 'ai-service.log')
         file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
-        file_handler.setFormatter(logging.Formatter(log_format))
-        root_logger.addHandler(file_handler)
-        
-    except (PermissionError, OSError) as e:
+        file_handler.setFormatter(formatter)
+        return file_handler
+
+    except (PermissionError, OSError):
         # Если не можем создать файл в logs/, пробуем в temp директории
         try:
             import tempfile
             temp_dir = tempfile.gettempdir()
             log_file_path = os.path.join(temp_dir, 'ai-service.log')
             file_handler = logging.FileHandler(log_file_path, encoding='utf-8')
-            file_handler.setFormatter(logging.Formatter(log_format))
-            root_logger.addHandler(file_handler)
+            file_handler.setFormatter(formatter)
             print(f"Логи сохраняются в: {log_file_path}")
+            return file_handler
         except Exception:
             # Если и это не работает, используем только консоль
             print("Не удалось создать файловый обработчик логов, используется только консоль")
-    
+            return None
+
+
+def setup_logging(log_level: Optional[str] = None, log_format: Optional[str] = None) -> None:
+    """Настраивает логирование для приложения.
+
+    Запись в консоль и файл выполняется фоновым потоком QueueListener,
+    вызывающий код только кладет запись в очередь.
+    """
+    global _listener
+    shutdown_logging()
+
+    level = log_level or settings.log_level
+    log_level_map = {
+        'DEBUG': logging.DEBUG,
+        'INFO': logging.INFO,
+        'WARNING': logging.WARNING,
+        'ERROR': logging.ERROR,
+        'CRITICAL': logging.CRITICAL
+    }
+
+    # Настраиваем формат логов
+    if (log_format or settings.log_format).lower() == 'json':
+        formatter: logging.Formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # Создаем обработчики
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setFormatter(formatter)
+    handlers: List[logging.Handler] = [console_handler]
+
+    file_handler = _create_file_handler(formatter)
+    if file_handler:
+        handlers.append(file_handler)
+
+    # Корневой логгер пишет только в очередь, обработчики работают в фоновом потоке
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level_map.get(level.upper(), logging.INFO))
+    root_logger.handlers.clear()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
     # Настраиваем уровень для внешних библиотек
     logging.getLogger("ollama").setLevel(logging.WARNING)
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
+
+
+def shutdown_logging() -> None:
+    """Останавливает фоновый поток логирования, дописывая оставшиеся записи"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
@@ -1,84 +1,112 @@
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import APIRouter, FastAPI, HTTPException, Depends, Header, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from typing import Any, Dict, Literal, Optional
+import asyncio
 import logging
 
-from .config.settings import settings
-from .logging_config import setup_logging
-from .models import NormalizeRequest, NormalizeResponse, HealthResponse
-from .services import OllamaClient, JobNormalizer, HealthChecker
+from .config.settings import Settings, settings
+from .container import ServiceContainer
+from .dependencies import (
+    get_cache, get_job_normalizer, get_normalization_pipeline, get_prompt_selector,
+    get_container, get_health_checker, get_residency_manager, get_source_extractors, get_loop_watchdog,
+    get_memory_tracker, require_admin
+)
+from .models import NormalizeRequest, NormalizeResponse, HealthResponse, ReadyResponse, JobField
 from .prompts import PromptManager
-from .cache import MemoryCache
-from .exceptions import AIServiceError
+from .exceptions import AIServiceError, GenerationCancelledError
+from .utils import JSONEncoder
+from .transport import Transport, TransportRoute
+from .metrics import metrics
+from .diagnostics import SamplingProfiler
 
-# Настраиваем логирование
-setup_logging()
 logger = logging.getLogger(__name__)
 
-# Инициализируем кэш
-cache = MemoryCache(ttl_seconds=3600)
-
-# Инициализируем сервисы
-ollama_client = OllamaClient()
-prompt_template = PromptManager.get_prompt("v1")
-job_normalizer = JobNormalizer(ollama_client, prompt_template)
-health_checker = HealthChecker(ollama_client)
+# Тела запросов принимаются в JSON и MessagePack, в том числе сжатые gzip/zstd
+router = APIRouter(route_class=TransportRoute)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Управление жизненным циклом приложения"""
+    from .logging_config import setup_logging, shutdown_logging
+
+    container: ServiceContainer = app.state.container
+    setup_logging(container.settings.log_level, container.settings.log_format)
     logger.info("Starting AI Job Normalization Service")
-    logger.info(f"📚 Swagger UI: http://localhost:{settings.app_port}/docs")
-    logger.info(f"📖 ReDoc: http://localhost:{settings.app_port}/redoc")
-    logger.info(f"🔗 OpenAPI JSON: http://localhost:{settings.app_port}/openapi.json")
+    logger.info(f"📚 Swagger UI: http://localhost:{container.settings.app_port}/docs")
+    logger.info(f"📖 ReDoc: http://localhost:{container.settings.app_port}/redoc")
+    logger.info(f"🔗 OpenAPI JSON: http://localhost:{container.settings.app_port}/openapi.json")
+    await container.start()
     yield
+    await container.stop()
     logger.info("Shutting down AI Job Normalization Service")
+    shutdown_logging()
 
 
-app = FastAPI(
-    title="AI Job Normalization Service",
-    description="Сервис для нормализации вакансий с помощью Ollama",
-    version="1.0.0",
-    lifespan=lifespan,
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
-    openapi_tags=[
-        {
-            "name": "Health",
-            "description": "Проверка состояния сервиса"
-        },
-        {
-            "name": "Job Normalization", 
-            "description": "Нормализация вакансий с помощью AI"
-        },
-        {
-            "name": "Cache",
-            "description": "Управление кэшем"
-        },
-        {
-            "name": "Info",
-            "description": "Информация о сервисе"
-        }
-    ]
-)
+def create_app(app_settings: Optional[Settings] = None, container: Optional[ServiceContainer] = None) -> FastAPI:
+    """Создает приложение; сервисы создаются лениво при первом обращении"""
+    app = FastAPI(
+        title="AI Job Normalization Service",
+        description="Сервис для нормализации вакансий с помощью Ollama",
+        version="1.0.0",
+        lifespan=lifespan,
+        docs_url="/docs",
+        redoc_url="/redoc",
+        openapi_url="/openapi.json",
+        openapi_tags=[
+            {
+                "name": "Health",
+                "description": "Проверка состояния сервиса"
+            },
+            {
+                "name": "Job Normalization", 
+                "description": "Нормализация вакансий с помощью AI"
+            },
+            {
+                "name": "Cache",
+                "description": "Управление кэшем"
+            },
+            {
+                "name": "Info",
+                "description": "Информация о сервисе"
+            },
+            {
+                "name": "Metrics",
+                "description": "Метрики сервиса"
+            },
+            {
+                "name": "Debug",
+                "description": "Диагностика производительности"
+            },
+            {
+                "name": "Admin",
+                "description": "Админские эндпоинты (заголовок X-Admin-Token, включаются через ADMIN_TOKEN)"
+            }
+        ]
+    )
+    app.state.container = container or ServiceContainer(app_settings)
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    app.include_router(router)
+    return app
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
 
-@app.get(
+@router.get(
     "/health", 
     response_model=HealthResponse,
     tags=["Health"],
     summary="Проверка здоровья сервиса",
-    description="Проверяет доступность сервиса и Ollama модели",
+    description="Возвращает закэшированный фоновым опросом статус сервиса и Ollama модели",
     responses={
         200: {
             "description": "Статус сервиса",
@@ -87,37 +115,87 @@ app.add_middleware(
                     "example": {
                         "status": "healthy",
                         "ollama_available": True,
-                        "model_loaded": True
+                        "model_loaded": True,
+                        "snapshot_age_seconds": 1.2
                     }
                 }
             }
         }
     }
 )
-async def health_check():
+async def health_check(health_checker=Depends(get_health_checker)):
     """Проверка здоровья сервиса"""
-    try:
-        health_status = await health_checker.check_health()
-        return HealthResponse(
-            status="healthy" if health_status['ollama_available'] else "unhealthy",
-            ollama_available=health_status['ollama_available'],
-            model_loaded=health_status['model_loaded']
-        )
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return HealthResponse(
-            status="unhealthy",
-            ollama_available=False,
-            model_loaded=False
-        )
+    snapshot = health_checker.get_snapshot()
+    return HealthResponse(
+        status="healthy" if snapshot['ollama_available'] else "unhealthy",
+        ollama_available=snapshot['ollama_available'],
+        model_loaded=snapshot['model_loaded'],
+        snapshot_age_seconds=snapshot['snapshot_age_seconds']
+    )
+
+
+@router.get(
+    "/ready",
+    response_model=ReadyResponse,
+    tags=["Health"],
+    summary="Готовность сервиса",
+    description="Проверяет готовность принимать трафик по закэшированному снимку состояния",
+    responses={
+        200: {
+            "description": "Сервис готов",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "ready": True,
+                        "ollama_available": True,
+                        "model_loaded": True,
+                        "model_resident": True,
+                        "warmed_up": True,
+                        "queue_depth": 0,
+                        "snapshot_age_seconds": 1.2
+                    }
+                }
+            }
+        },
+        503: {"description": "Сервис не готов"}
+    }
+)
+async def readiness_check(
+    response: Response,
+    health_checker=Depends(get_health_checker),
+    residency_manager=Depends(get_residency_manager),
+    job_normalizer=Depends(get_job_normalizer)
+):
+    """Готовность сервиса"""
+    snapshot = health_checker.get_snapshot()
+    ready = (
+        snapshot['ollama_available']
+        and snapshot['model_loaded']
+        and residency_manager.warmed_up
+        and not health_checker.is_stale()
+    )
+    if not ready:
+        response.status_code = 503
+    return ReadyResponse(
+        ready=ready,
+        ollama_available=snapshot['ollama_available'],
+        model_loaded=snapshot['model_loaded'],
+        model_resident=snapshot['model_resident'],
+        warmed_up=residency_manager.warmed_up,
+        queue_depth=job_normalizer.in_flight,
+        snapshot_age_seconds=snapshot['snapshot_age_seconds']
+    )
 
 
-@app.post(
+@router.post(
     "/api/v1/normalize", 
     response_model=NormalizeResponse,
     tags=["Job Normalization"],
     summary="Нормализация вакансии",
-    description="Нормализует данные вакансии с помощью AI модели",
+    description=(
+        "Нормализует данные вакансии с помощью AI модели. Тело запроса и ответа - JSON или MessagePack "
+        "(Content-Type / Accept: application/msgpack), со сжатием gzip/zstd по Content-Encoding / Accept-Encoding"
+    ),
     responses={
         200: {
             "description": "Успешная нормализация",
@@ -139,6 +217,10 @@ async def health_check():
                 }
             }
         },
+        304: {"description": "Версия из If-None-Match актуальна, тело не передается"},
+        413: {"description": "Тело запроса после распаковки больше MAX_REQUEST_BODY_BYTES"},
+        415: {"description": "Неподдерживаемый формат или сжатие тела запроса"},
+        504: {"description": "Нормализация не уложилась в таймаут, генерация отменена"},
         500: {
             "description": "Ошибка сервера",
             "content": {
@@ -149,28 +231,60 @@ async def health_check():
         }
     }
 )
-async def normalize_job(request: NormalizeRequest):
+async def normalize_job(
+    request: NormalizeRequest,
+    http_request: Request,
+    if_none_match: Optional[str] = Header(None),
+    pipeline=Depends(get_normalization_pipeline),
+    residency_manager=Depends(get_residency_manager)
+):
     """Нормализация вакансии"""
+    residency_manager.note_activity()
     try:
-        # Проверяем кэш
-        cached_result = cache.get(request.title, request.description)
-        if cached_result:
-            logger.info(f"Returning cached result for job: {request.title}")
-            return cached_result
-        
-        # Нормализуем вакансию
-        result = await job_normalizer.normalize_job(
-            title=request.title,
-            description=request.description,
-            source_name=request.source_name,
-            original_url=request.original_url
-        )
-        
-        # Сохраняем в кэш
-        cache.set(request.title, request.description, result)
+        fields = pipeline.resolve_fields(request.fields)
+        encoded = await pipeline.normalize_guarded(request, fields, http_request.is_disconnected)
+        return _encoded_response(encoded, http_request, if_none_match)
         
-        return result
+    except GenerationCancelledError as e:
+        return _cancelled_response(e)
+    except AIServiceError as e:
+        logger.error(f"AI service error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception as e:
+        logger.error(f"Unexpected error: {e}")
+        raise HTTPException(status_code=500, detail="Внутренняя ошибка сервера")
+
+
+@router.post(
+    "/api/v1/normalize/full-description",
+    response_model=NormalizeResponse,
+    tags=["Job Normalization"],
+    summary="Полное описание вакансии",
+    description="Дополняет закэшированную вакансию полем full_description, генерируя только его",
+    responses={
+        304: {"description": "Версия из If-None-Match актуальна, тело не передается"},
+        413: {"description": "Тело запроса после распаковки больше MAX_REQUEST_BODY_BYTES"},
+        415: {"description": "Неподдерживаемый формат или сжатие тела запроса"},
+        504: {"description": "Нормализация не уложилась в таймаут, генерация отменена"},
+        500: {"description": "Ошибка сервера"}
+    }
+)
+async def normalize_full_description(
+    request: NormalizeRequest,
+    http_request: Request,
+    if_none_match: Optional[str] = Header(None),
+    pipeline=Depends(get_normalization_pipeline),
+    residency_manager=Depends(get_residency_manager)
+):
+    """Ленивая генерация полного описания"""
+    residency_manager.note_activity()
+    try:
+        fields = pipeline.resolve_fields([*(request.fields or []), JobField.FULL_DESCRIPTION])
+        encoded = await pipeline.normalize_guarded(request, fields, http_request.is_disconnected)
+        return _encoded_response(encoded, http_request, if_none_match)
         
+    except GenerationCancelledError as e:
+        return _cancelled_response(e)
     except AIServiceError as e:
         logger.error(f"AI service error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -178,7 +292,86 @@ async def normalize_job(request: NormalizeRequest):
         logger.error(f"Unexpected error: {e}")
         raise HTTPException(status_code=500, detail="Внутренняя ошибка сервера")
 
-@app.get(
+
+@router.post(
+    "/api/v1/normalize/stream",
+    tags=["Job Normalization"],
+    summary="Потоковая нормализация вакансии",
+    description=(
+        "Server-Sent Events: события partial с полями ответа по мере готовности "
+        "(детерминированные поля приходят первыми), финальное событие result "
+        "с полным NormalizeResponse и quality_score, при ошибке - событие error"
+    ),
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Поток событий",
+            "content": {
+                "text/event-stream": {
+                    "example": (
+                        "event: partial\ndata: {\"salary\":{\"min\":250000,\"max\":350000,\"currency\":\"RUB\"}}\n\n"
+                        "event: partial\ndata: {\"company\":{\"name\":\"Tech Company\"}}\n\n"
+                        "event: result\ndata: {\"id\":\"job_123456\",\"quality_score\":85}\n\n"
+                    )
+                }
+            }
+        }
+    }
+)
+async def normalize_job_stream(
+    request: NormalizeRequest,
+    http_request: Request,
+    pipeline=Depends(get_normalization_pipeline),
+    residency_manager=Depends(get_residency_manager)
+):
+    """Потоковая нормализация вакансии"""
+    residency_manager.note_activity()
+    try:
+        fields = pipeline.resolve_fields(request.fields)
+    except AIServiceError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events():
+        try:
+            async for event, data in pipeline.stream(request, fields, http_request.is_disconnected):
+                body = data if isinstance(data, bytes) else JSONEncoder.encode(data)
+                yield b"event: " + event.encode() + b"\ndata: " + body + b"\n\n"
+        except AIServiceError as e:
+            logger.error(f"AI service error: {e}")
+            yield b"event: error\ndata: " + JSONEncoder.encode({"detail": str(e)}) + b"\n\n"
+        except Exception as e:
+            logger.error(f"Unexpected error: {e}")
+            yield b"event: error\ndata: " + JSONEncoder.encode({"detail": "Внутренняя ошибка сервера"}) + b"\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _cancelled_response(error: GenerationCancelledError) -> Response:
+    """Ответ на отмененную генерацию: 504 по таймауту, 499 если клиент уже отключился"""
+    if error.reason == 'timeout':
+        raise HTTPException(status_code=504, detail=str(error))
+    return Response(status_code=499)
+
+
+def _encoded_response(encoded: Dict[str, Any], http_request: Request, if_none_match: Optional[str]) -> Response:
+    """Отдает сериализованный ответ в согласованном формате или 304, если у клиента уже есть эта версия"""
+    media_type, encoding = Transport.negotiate(
+        http_request.headers.get("accept"), http_request.headers.get("accept-encoding")
+    )
+    etag = Transport.variant_etag(encoded['etag'], media_type, encoding)
+    if JSONEncoder.etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers={"ETag": etag, "Vary": Transport.VARY})
+    body, headers = Transport.encode(
+        encoded['body'], media_type, encoding, get_container(http_request).settings.transport_compress_min_bytes
+    )
+    return Response(content=body, media_type=media_type, headers={**headers, "ETag": etag})
+
+
+@router.get(
     "/",
     tags=["Info"],
     summary="Информация о сервисе",
@@ -191,13 +384,21 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
-            "normalize": "/api/v1/normalize"
+            "ready": "/ready",
+            "normalize": "/api/v1/normalize",
+            "full_description": "/api/v1/normalize/full-description",
+            "stream": "/api/v1/normalize/stream",
+            "metrics": "/metrics"
         },
-        "prompt_versions": PromptManager.get_available_versions()
+        "prompt_versions": PromptManager.get_available_versions(),
+        "transport": {
+            "media_types": list(Transport.media_types()),
+            "encodings": list(Transport.encodings())
+        }
     }
 
 
-@app.get(
+@router.get(
     "/api/v1/cache/stats",
     tags=["Cache"],
     summary="Статистика кэша",
@@ -216,7 +417,7 @@ async def root():
         }
     }
 )
-async def cache_stats():
+async def cache_stats(cache=Depends(get_cache)):
     """Статистика кэша"""
     return {
         "cache_size": len(cache.cache),
@@ -224,7 +425,7 @@ async def cache_stats():
     }
 
 
-@app.post(
+@router.post(
     "/api/v1/cache/clear",
     tags=["Cache"],
     summary="Очистка кэша",
@@ -240,12 +441,337 @@ async def cache_stats():
         }
     }
 )
-async def clear_cache():
+async def clear_cache(cache=Depends(get_cache)):
     """Очистка кэша"""
     cache.clear()
     return {"message": "Cache cleared successfully"}
 
 
+@router.get(
+    "/api/v1/prompts/stats",
+    tags=["Metrics"],
+    summary="Статистика версий промпта",
+    description="Возвращает режим выбора промпта и статистику версий в скользящем окне",
+    responses={
+        200: {
+            "description": "Статистика версий промпта",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "mode": "bandit",
+                        "default_version": "v1",
+                        "preferred_version": "v2",
+                        "versions": {
+                            "v2": {
+                                "requests": 120,
+                                "mean_latency_seconds": 4.1,
+                                "mean_output_tokens": 310,
+                                "parse_fallback_rate": 0.01,
+                                "mean_quality_score": 78.5
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+async def prompt_stats(prompt_selector=Depends(get_prompt_selector)):
+    """Статистика версий промпта"""
+    return {**prompt_selector.stats(), "preferred_version": prompt_selector.preferred_version()}
+
+
+@router.get(
+    "/api/v1/extractors/stats",
+    tags=["Metrics"],
+    summary="Статистика плагинов источников",
+    description="Возвращает покрытие полей плагинами извлечения по площадкам и оценку сэкономленного времени модели",
+    responses={
+        200: {
+            "description": "Статистика плагинов",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "plugins": {
+                            "habr_career": {
+                                "sources": ["Habr Career", "career.habr.com"],
+                                "requests": 40,
+                                "coverage": {"salary": 1.0, "work_type": 0.9, "experience_level": 0.85},
+                                "mean_extract_ms": 0.4,
+                                "model_seconds_saved": 52.3
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+async def extractor_stats(source_extractors=Depends(get_source_extractors)):
+    """Статистика плагинов источников"""
+    if source_extractors is None:
+        return {"plugins": {}}
+    return source_extractors.stats()
+
+
+@router.get(
+    "/api/v1/debug/event-loop",
+    tags=["Debug"],
+    summary="Блокировки event loop",
+    description=(
+        "Задержка event loop и места синхронного кода, которые блокировали его дольше порога: "
+        "число и длительность зависаний, стек последнего случая"
+    ),
+    dependencies=[Depends(require_admin)],
+    responses={
+        200: {
+            "description": "Статистика сторожа event loop",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "running": True,
+                        "interval_seconds": 0.1,
+                        "threshold_seconds": 0.25,
+                        "lag_last_seconds": 0.0012,
+                        "lag_max_seconds": 1.84,
+                        "stalls": [
+                            {
+                                "site": "app/services/ollama_client.py:84 generate_response",
+                                "count": 3,
+                                "total_seconds": 4.2,
+                                "max_seconds": 1.84,
+                                "last_seen": 1760900000.0,
+                                "stack": ["app/main.py:230 normalize_job: encoded = await ..."]
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        401: {"description": "Неверный токен администратора"},
+        404: {"description": "ADMIN_TOKEN не задан"}
+    }
+)
+async def event_loop_stats(loop_watchdog=Depends(get_loop_watchdog)):
+    """Статистика сторожа event loop"""
+    return loop_watchdog.stats()
+
+
+@router.post(
+    "/api/v1/admin/profile",
+    tags=["Admin"],
+    summary="CPU профиль процесса",
+    description=(
+        "Снимает сэмплирующий профиль CPU всех потоков за seconds секунд и возвращает его "
+        "в формате collapsed stacks (flamegraph.pl, inferno) или speedscope. "
+        "Потоки, ожидающие блокировку, очередь, select или ответ Ollama, не учитываются "
+        "(include_idle=true - профиль по времени выполнения со всеми потоками). "
+        "Профиль снимается в отдельном потоке, сервис продолжает обрабатывать запросы"
+    ),
+    dependencies=[Depends(require_admin)],
+    responses={
+        200: {
+            "description": "Профиль",
+            "content": {
+                "text/plain": {
+                    "example": "MainThread;run (asyncio/runners.py:86);_parse_ai_data (app/services/job_normalizer.py:512) 42\n"
+                },
+                "application/json": {"example": {"$schema": "https://www.speedscope.app/file-format-schema.json"}}
+            }
+        },
+        401: {"description": "Неверный токен администратора"},
+        404: {"description": "ADMIN_TOKEN не задан"},
+        409: {"description": "Профиль уже снимается"}
+    }
+)
+async def profile_cpu(
+    seconds: float = Query(10.0, gt=0, description="Длительность профилирования"),
+    interval_ms: float = Query(10.0, ge=1, le=1000, description="Период сэмплирования"),
+    include_idle: bool = Query(False, description="Учитывать простаивающие потоки (wall clock профиль)"),
+    format: Literal['collapsed', 'speedscope'] = Query('collapsed', description="Формат профиля"),
+    container: ServiceContainer = Depends(get_container)
+):
+    """Сэмплирующий профиль CPU"""
+    max_seconds = container.settings.profiler_max_seconds
+    if seconds > max_seconds:
+        raise HTTPException(status_code=422, detail=f"seconds не больше {max_seconds}")
+    lock = container.profiler_lock
+    if not lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Профиль уже снимается")
+    try:
+        logger.info(f"CPU profiling started: {seconds}s, interval {interval_ms}ms")
+        profiler = await asyncio.to_thread(SamplingProfiler(interval_ms / 1000, include_idle).run, seconds)
+    finally:
+        lock.release()
+    logger.info(
+        f"CPU profiling finished: {profiler.sample_count} rounds, {profiler.idle_samples} idle thread samples skipped"
+    )
+    metrics.inc('profiles_total', format=format)
+    if format == 'speedscope':
+        return Response(
+            content=JSONEncoder.encode(profiler.speedscope()),
+            media_type="application/json",
+            headers={"Content-Disposition": 'attachment; filename="profile.speedscope.json"'}
+        )
+    return PlainTextResponse(profiler.collapsed())
+
+
+@router.get(
+    "/api/v1/admin/memory",
+    tags=["Admin"],
+    summary="Сводка памяти",
+    description="RSS процесса, объем кэшей и их доля в RSS, состояние tracemalloc и снятые снимки",
+    dependencies=[Depends(require_admin)],
+    responses={
+        200: {
+            "description": "Сводка памяти",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "rss_bytes": 412090368,
+                        "sources_bytes": {"response_cache": 96468992, "revision_store": 18874368},
+                        "sources_total_bytes": 115343360,
+                        "sources_share_of_rss": 0.2799,
+                        "tracemalloc": {
+                            "tracing": True,
+                            "frames": 1,
+                            "traced_bytes": 154120000,
+                            "peak_bytes": 160300000,
+                            "stops_in_seconds": 812.4,
+                            "snapshots": [{"name": "before", "taken_at": 1760900000.0, "traced_bytes": 150000000}]
+                        }
+                    }
+                }
+            }
+        }
+    }
+)
+async def memory_summary(memory_tracker=Depends(get_memory_tracker)):
+    """Сводка памяти"""
+    return {**memory_tracker.summary(), "tracemalloc": memory_tracker.status()}
+
+
+@router.post(
+    "/api/v1/admin/memory/tracemalloc/start",
+    tags=["Admin"],
+    summary="Включить tracemalloc",
+    description=(
+        "Включает трассировку аллокаций с frames кадрами стека на seconds секунд, после чего "
+        "она выключается сама. Прежние снимки удаляются. Трассировка замедляет аллокации "
+        "и расходует память, поэтому сеанс ограничен TRACEMALLOC_MAX_SECONDS"
+    ),
+    dependencies=[Depends(require_admin)]
+)
+async def tracemalloc_start(
+    frames: int = Query(1, ge=1, description="Кадров стека на аллокацию"),
+    seconds: Optional[float] = Query(None, gt=0, description="Длительность сеанса"),
+    memory_tracker=Depends(get_memory_tracker)
+):
+    """Включает tracemalloc"""
+    return memory_tracker.start_tracing(frames=frames, seconds=seconds)
+
+
+@router.post(
+    "/api/v1/admin/memory/tracemalloc/stop",
+    tags=["Admin"],
+    summary="Выключить tracemalloc",
+    description="Выключает трассировку аллокаций; снятые снимки остаются доступны для сравнения",
+    dependencies=[Depends(require_admin)]
+)
+async def tracemalloc_stop(memory_tracker=Depends(get_memory_tracker)):
+    """Выключает tracemalloc"""
+    return memory_tracker.stop_tracing()
+
+
+@router.post(
+    "/api/v1/admin/memory/snapshots/{name}",
+    tags=["Admin"],
+    summary="Снимок аллокаций",
+    description="Снимает именованный снимок tracemalloc вместе с RSS и объемом кэшей",
+    dependencies=[Depends(require_admin)],
+    responses={409: {"description": "tracemalloc не включен"}}
+)
+async def memory_snapshot(name: str, memory_tracker=Depends(get_memory_tracker)):
+    """Снимок аллокаций"""
+    try:
+        return await asyncio.to_thread(memory_tracker.take_snapshot, name)
+    except RuntimeError:
+        raise HTTPException(status_code=409, detail="tracemalloc не включен")
+
+
+@router.get(
+    "/api/v1/admin/memory/diff",
+    tags=["Admin"],
+    summary="Сравнение снимков аллокаций",
+    description="Места аллокаций с наибольшим приростом памяти между снимками base и target",
+    dependencies=[Depends(require_admin)],
+    responses={
+        200: {
+            "description": "Разница снимков",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "base": {"name": "before"},
+                        "target": {"name": "after"},
+                        "traced_diff_bytes": 20480000,
+                        "rss_diff_bytes": 25165824,
+                        "sources_diff_bytes": {"response_cache": 19922944, "revision_store": 0},
+                        "top": [
+                            {
+                                "site": "app/cache/compact.py:51",
+                                "size_diff_bytes": 19800000,
+                                "size_bytes": 96000000,
+                                "count_diff": 4100,
+                                "count": 20000
+                            }
+                        ]
+                    }
+                }
+            }
+        },
+        404: {"description": "Снимок не найден"}
+    }
+)
+async def memory_diff(
+    base: str,
+    target: str,
+    limit: int = Query(20, ge=1, le=200),
+    group_by: Literal['lineno', 'filename', 'traceback'] = Query('lineno'),
+    memory_tracker=Depends(get_memory_tracker)
+):
+    """Сравнение снимков аллокаций"""
+    try:
+        return await asyncio.to_thread(memory_tracker.diff, base, target, limit, group_by)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Снимок не найден: {e.args[0]}")
+
+
+@router.get(
+    "/api/v1/metrics",
+    tags=["Metrics"],
+    summary="Метрики сервиса",
+    description="Возвращает счетчики, gauge и сводки наблюдений в JSON"
+)
+async def metrics_json():
+    """Метрики в JSON"""
+    return metrics.snapshot()
+
+
+@router.get(
+    "/metrics",
+    tags=["Metrics"],
+    summary="Метрики Prometheus",
+    description="Возвращает метрики в текстовом формате Prometheus",
+    response_class=PlainTextResponse
+)
+async def metrics_prometheus():
+    """Метрики в формате Prometheus"""
+    return metrics.render_prometheus()
+
+
+app = create_app()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,3 @@
+from .registry import MetricsRegistry, metrics
+
+__all__ = ["MetricsRegistry", "metrics"]
@@ -0,0 +1,100 @@
+import threading
+from typing import Any, Dict, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class MetricsRegistry:
+    """Простой потокобезопасный реестр метрик: счетчики, gauge и суммарные наблюдения"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._summaries: Dict[str, Dict[LabelKey, Dict[str, float]]] = {}
+
+    @staticmethod
+    def _label_key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """Увеличивает счетчик"""
+        key = self._label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: Any) -> None:
+        """Устанавливает текущее значение gauge"""
+        key = self._label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """Добавляет наблюдение (count/sum/min/max)"""
+        key = self._label_key(labels)
+        with self._lock:
+            summary = self._summaries.setdefault(name, {}).get(key)
+            if summary is None:
+                self._summaries[name][key] = {'count': 1, 'sum': value, 'min': value, 'max': value}
+                return
+            summary['count'] += 1
+            summary['sum'] += value
+            summary['min'] = min(summary['min'], value)
+            summary['max'] = max(summary['max'], value)
+
+    def get(self, name: str, **labels: Any) -> float:
+        """Возвращает значение счетчика или gauge"""
+        key = self._label_key(labels)
+        with self._lock:
+            if name in self._counters:
+                return self._counters[name].get(key, 0)
+            return self._gauges.get(name, {}).get(key, 0)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Возвращает все метрики в виде словаря"""
+        def format_series(series: Dict[LabelKey, Any]) -> list:
+            return [{'labels': dict(key), 'value': value} for key, value in series.items()]
+
+        with self._lock:
+            return {
+                'counters': {name: format_series(series) for name, series in self._counters.items()},
+                'gauges': {name: format_series(series) for name, series in self._gauges.items()},
+                'summaries': {
+                    name: format_series({key: dict(value) for key, value in series.items()})
+                    for name, series in self._summaries.items()
+                }
+            }
+
+    def render_prometheus(self) -> str:
+        """Возвращает метрики в текстовом формате Prometheus"""
+        def format_labels(key: LabelKey, extra: str = '') -> str:
+            parts = [f'{label}="{value}"' for label, value in key]
+            if extra:
+                parts.append(extra)
+            return '{' + ','.join(parts) + '}' if parts else ''
+
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                lines.extend(f"{name}{format_labels(key)} {value}" for key, value in series.items())
+            for name, series in sorted(self._gauges.items()):
+                lines.append(f"# TYPE {name} gauge")
+                lines.extend(f"{name}{format_labels(key)} {value}" for key, value in series.items())
+            for name, series in sorted(self._summaries.items()):
+                lines.append(f"# TYPE {name} summary")
+                for key, summary in series.items():
+                    lines.append(f"{name}_count{format_labels(key)} {summary['count']}")
+                    lines.append(f"{name}_sum{format_labels(key)} {summary['sum']}")
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Сбрасывает все метрики"""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._summaries.clear()
+
+
+metrics = MetricsRegistry()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 from typing import Optional, List, Dict, Any
 from enum import Enum
 
@@ -19,6 +19,18 @@ class ExperienceLevel(str, Enum):
     SENIOR = "senior"
     LEAD = "lead"
 
+class JobField(str, Enum):
+    """Поле нормализованной вакансии, которое можно запросить отдельно"""
+    COMPANY = "company"
+    SHORT_DESCRIPTION = "short_description"
+    FULL_DESCRIPTION = "full_description"
+    SALARY = "salary"
+    LOCATION = "location"
+    REQUIREMENTS = "requirements"
+    BENEFITS = "benefits"
+    WORK_TYPE = "work_type"
+    EXPERIENCE_LEVEL = "experience_level"
+
 class CompanyInfo(BaseModel):
     """Информация о компании"""
     name: Optional[str] = None
@@ -63,6 +75,11 @@ class NormalizeRequest(BaseModel):
     description: str = Field(..., description="Описание вакансии", example="Разработка веб-приложений на Python и Django")
     source_name: Optional[str] = Field(None, description="Название источника", example="hh.ru")
     original_url: Optional[str] = Field(None, description="Оригинальная ссылка на вакансию", example="https://hh.ru/vacancy/123456")
+    fields: Optional[List[JobField]] = Field(
+        None,
+        description="Какие поля извлекать (по умолчанию все); незапрошенные поля в ответе пустые",
+        example=["company", "short_description", "salary", "work_type"]
+    )
 
 class NormalizeResponse(BaseModel):
     """Ответ с нормализованными данными вакансии"""
@@ -75,7 +92,12 @@ class NormalizeResponse(BaseModel):
     location: Optional[LocationInfo] = None
     requirements: Requirements
     benefits: Optional[Benefits] = None
-    work_type: WorkType
+    # Изменение контракта: в полном ответе work_type заполнен всегда, null возможен только
+    # в ответе с проекцией полей (NormalizeRequest.fields без work_type)
+    work_type: Optional[WorkType] = Field(
+        None,
+        description="Тип работы; null только если в fields не запрошен work_type"
+    )
     experience_level: Optional[ExperienceLevel] = None
     source: str = "website"
     source_name: Optional[str] = None
@@ -84,9 +106,26 @@ class NormalizeResponse(BaseModel):
     parsed_at: str
     quality_score: int
     keywords: List[str] = []
+    # Ответ модели разобран лишь частично: такой результат не кэшируется
+    _degraded: bool = PrivateAttr(default=False)
+
+    @property
+    def degraded(self) -> bool:
+        return self._degraded
 
 class HealthResponse(BaseModel):
     """Ответ о состоянии сервиса"""
     status: str = Field(..., description="Статус сервиса", example="healthy")
     ollama_available: bool = Field(..., description="Доступность Ollama", example=True)
     model_loaded: bool = Field(..., description="Загружена ли модель", example=True)
+    snapshot_age_seconds: Optional[float] = Field(None, description="Возраст снимка состояния в секундах", example=1.2)
+
+class ReadyResponse(BaseModel):
+    """Ответ о готовности сервиса принимать трафик"""
+    ready: bool = Field(..., description="Готов ли сервис", example=True)
+    ollama_available: bool = Field(..., description="Доступность Ollama", example=True)
+    model_loaded: bool = Field(..., description="Скачана ли модель в Ollama", example=True)
+    model_resident: bool = Field(..., description="Загружена ли модель в память", example=True)
+    warmed_up: bool = Field(..., description="Завершен ли прогрев модели", example=True)
+    queue_depth: int = Field(..., description="Количество запросов в обработке", example=0)
+    snapshot_age_seconds: Optional[float] = Field(None, description="Возраст снимка состояния в секундах", example=1.2)
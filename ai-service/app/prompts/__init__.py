@@ -1,7 +1,15 @@
 from .prompt_manager import PromptManager
-from .templates import JOB_NORMALIZATION_PROMPT_V1
+from .prompt_builder import PromptBuilder, JOB_FIELDS, FIELD_GROUPS, AI_FIELDS
+from .templates import JOB_NORMALIZATION_PROMPT_V1, JOB_NORMALIZATION_PROMPT_V2, JSON_CONTINUE_PROMPT, JSON_REPAIR_PROMPT
 
 __all__ = [
     "PromptManager",
-    "JOB_NORMALIZATION_PROMPT_V1"
+    "PromptBuilder",
+    "JOB_FIELDS",
+    "FIELD_GROUPS",
+    "AI_FIELDS",
+    "JOB_NORMALIZATION_PROMPT_V1",
+    "JOB_NORMALIZATION_PROMPT_V2",
+    "JSON_CONTINUE_PROMPT",
+    "JSON_REPAIR_PROMPT"
 ]
@@ -0,0 +1,113 @@
+import json
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Поля ответа, которые можно запросить у модели по отдельности (порядок - как в схеме)
+JOB_FIELDS = (
+    "company",
+    "short_description",
+    "full_description",
+    "salary",
+    "location",
+    "requirements",
+    "benefits",
+    "work_type",
+    "experience_level",
+)
+
+# Независимые группы полей для параллельной генерации: каждую группу модель извлекает
+# отдельным коротким промптом (workType - к условиям, experienceLevel - к требованиям)
+FIELD_GROUPS = {
+    "company": ("company",),
+    "salary_location": ("salary", "location", "work_type"),
+    "requirements": ("requirements", "experience_level"),
+    "benefits": ("benefits",),
+    "descriptions": ("short_description", "full_description"),
+}
+
+# Ключ ответа модели (включая встречающиеся синонимы) -> поле NormalizeResponse;
+# в этих же ключах возвращают поля плагины извлечения (SourceExtractor)
+AI_FIELDS = {
+    "company": "company",
+    "shortDescription": "short_description",
+    "fullDescription": "full_description",
+    "salary": "salary",
+    "location": "location",
+    "requirements": "requirements",
+    "benefits": "benefits",
+    "premiums": "benefits",
+    "preference": "benefits",
+    "preconditions": "benefits",
+    "workType": "work_type",
+    "typeOfWork": "work_type",
+    "type_of_job": "work_type",
+    "experienceLevel": "experience_level",
+    "experience_level": "experience_level",
+}
+
+
+class PromptBuilder:
+    """Сборка промпта из фрагментов только для запрошенных полей"""
+
+    @staticmethod
+    def normalize_fields(fields: Optional[Iterable[str]] = None) -> List[str]:
+        """Приводит набор полей к порядку схемы, None означает все поля"""
+        if fields is None:
+            return list(JOB_FIELDS)
+        requested = {str(getattr(field, 'value', field)) for field in fields}
+        unknown = requested - set(JOB_FIELDS)
+        if unknown:
+            raise ValueError(f"Неизвестные поля: {', '.join(sorted(unknown))}")
+        return [field for field in JOB_FIELDS if field in requested]
+
+    @classmethod
+    def group_fields(cls, fields: Optional[Iterable[str]] = None) -> List[Tuple[str, List[str]]]:
+        """Делит поля на группы FIELD_GROUPS: [(группа, поля)], группы без полей пропускаются"""
+        selected = set(cls.normalize_fields(fields))
+        groups = []
+        for name, group in FIELD_GROUPS.items():
+            members = [field for field in group if field in selected]
+            if members:
+                groups.append((name, members))
+        return groups
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        return text.replace('{', '{{').replace('}', '}}')
+
+    @classmethod
+    def render(cls, spec: Dict[str, Any], fields: Optional[Iterable[str]] = None) -> str:
+        """Собирает шаблон промпта по описанию версии (см. templates.PROMPT_SPECS)"""
+        selected = cls.normalize_fields(fields)
+        sections = [spec["header"].strip('\n')]
+
+        schema = [spec["schema"][field] for field in selected if field in spec["schema"]]
+        sections.append(spec["schema_open"] + spec["schema_separator"].join(schema) + spec["schema_close"])
+
+        codes = [code for field in selected for code in spec["codes"].get(field, ())]
+        if codes:
+            sections.append("КОДЫ:\n" + "\n".join(f"- {code}" for code in codes))
+
+        rules = []
+        for field in selected:
+            rule = spec["rules"].get(field)
+            if rule:
+                rules.extend([rule] if isinstance(rule, str) else rule)
+        if spec["rules_common"]:
+            rules.append(spec["rules_common"])
+        if rules:
+            numbered = [f"{number}. {rule}" for number, rule in enumerate(rules, start=1)]
+            sections.append(spec["rules_separator"].join([spec["rules_title"], *numbered]))
+
+        footer = [spec["footer"][field] for field in selected if field in spec["footer"]]
+        if spec["footer_common"]:
+            footer.append(spec["footer_common"])
+        if spec["footer_title"] is not None and footer:
+            sections.append("\n".join([spec["footer_title"], *footer]))
+
+        if spec["example"]:
+            example = dict(spec["example"][field] for field in selected if field in spec["example"])
+            if example:
+                example_json = json.dumps(example, ensure_ascii=False, separators=(',', ':'))
+                sections.append("ПРИМЕР:\n" + cls._escape(example_json))
+
+        return "\n" + "\n\n".join(sections) + "\n"
@@ -1,21 +1,31 @@
-from typing import Dict, Any
-from .templates import JOB_NORMALIZATION_PROMPT_V1
+from typing import Dict, Any, Iterable, Optional, Tuple
+from .prompt_builder import PromptBuilder
+from .templates import JOB_NORMALIZATION_PROMPT_V1, JOB_NORMALIZATION_PROMPT_V2, PROMPT_SPECS
 
 
 class PromptManager:
     """Менеджер промптов с версионированием"""
     
     PROMPTS = {
-        "v1": JOB_NORMALIZATION_PROMPT_V1
+        "v1": JOB_NORMALIZATION_PROMPT_V1,
+        "v2": JOB_NORMALIZATION_PROMPT_V2
     }
+
+    # Собранные промпты для подмножеств полей: (версия, поля) -> шаблон
+    _projections: Dict[Tuple[str, Tuple[str, ...]], str] = {}
     
     @classmethod
-    def get_prompt(cls, version: str = "v1") -> str:
-        """Получает промпт по версии"""
+    def get_prompt(cls, version: str = "v1", fields: Optional[Iterable[str]] = None) -> str:
+        """Получает промпт по версии, при заданных fields - только для этих полей"""
         if version not in cls.PROMPTS:
             raise ValueError(f"Версия промпта {version} не найдена")
-        
-        return cls.PROMPTS[version]
+        if fields is None:
+            return cls.PROMPTS[version]
+
+        key = (version, tuple(PromptBuilder.normalize_fields(fields)))
+        if key not in cls._projections:
+            cls._projections[key] = PromptBuilder.render(PROMPT_SPECS[version], key[1])
+        return cls._projections[key]
     
     @classmethod
     def get_available_versions(cls) -> list:
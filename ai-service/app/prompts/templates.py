@@ -1,3 +1,247 @@
+# Промпты собираются из фрагментов по полям ответа, чтобы можно было запрашивать у модели
+# только часть полей (см. PromptBuilder). Фрагменты - шаблоны str.format: фигурные скобки
+# JSON экранированы, {title} и {description} подставляются при создании промпта.
+
+from .prompt_builder import PromptBuilder
+
+# ===== v1: полная схема с длинными ключами =====
+
+V1_HEADER = """
+Ты эксперт по анализу IT-вакансий. Твоя задача - извлечь структурированные данные из текста вакансии.
+
+КРИТИЧЕСКИ ВАЖНО:
+- Отвечай ТОЛЬКО в формате JSON без дополнительных комментариев
+- Не добавляй объяснения или текст до/после JSON
+- JSON должен быть валидным и полным
+- Если информация не найдена, используй null для чисел и пустые массивы для списков
+- НЕ используй trailing commas (запятые перед закрывающими скобками)
+- ВСЕ строки должны быть в двойных кавычках, НЕ в одинарных
+- НЕ добавляй комментарии в JSON
+- ВСЕ поля должны быть строками или null, НЕ словарями
+- НЕ создавай вложенные структуры в полях shortDescription, fullDescription, workType, experienceLevel
+
+Исходный текст вакансии:
+Заголовок: {title}
+Описание: {description}
+
+Извлеки следующие данные и верни в JSON формате:
+
+ВАЖНО: shortDescription, fullDescription, workType, experienceLevel должны быть СТРОКАМИ, НЕ словарями!
+
+"""
+
+V1_SCHEMA = {
+    "company": """  "company": {{
+    "name": "название компании (если не найдено, то null)",
+    "description": "краткое описание компании (максимум 2-3 предложения, только суть деятельности)",
+    "website": "сайт компании (если есть)",
+    "size": "размер компании в формате 'X-Y сотрудников' или 'X сотрудников' (если есть)"
+  }}""",
+    "short_description": """  "shortDescription": "краткое описание вакансии (максимум 2-3 предложения, только ключевые обязанности) - СТРОКА, НЕ словарь!\"""",
+    "full_description": """  "fullDescription": "полное описание вакансии (грамотно построенное, без ошибок пунктуации, структурированное описание всех аспектов работы) - СТРОКА, НЕ словарь!\"""",
+    "salary": """  "salary": {{
+    "min": число_минимальная_зарплата_или_null_если_не_указана,
+    "max": число_максимальная_зарплата_или_null_если_не_указана,
+    "currency": "RUB|USD|EUR_или_null_если_не_указана",
+    "period": "month|year_или_null_если_не_указана",
+    "type": "до вычета налогов|после вычета налогов|null_если_не_указана"
+  }}""",
+    "location": """  "location": {{
+    "city": "город",
+    "country": "страна (по умолчанию 'Россия')",
+    "address": "адрес (если есть)",
+    "remote": true/false
+  }}""",
+    "requirements": """  "requirements": {{
+    "required": ["обязательное требование 1", "обязательное требование 2"],
+    "preferred": ["желательное требование 1", "желательное требование 2"],
+    "technical": ["javascript", "react", "typescript", "python", "java", "c#", "php", "ruby", "go", "rust", "c++", "swift", "kotlin", "scala"],
+    "languages": ["языки программирования из списка выше"],
+    "frameworks": ["react", "vue", "angular", "svelte", "ember", "express", "nestjs", "fastapi", "django", "flask", "rails", "spring", "laravel", "symfony", "asp.net"],
+    "tools": ["git", "docker", "kubernetes", "jenkins", "github actions", "aws", "azure", "gcp", "terraform", "ansible", "figma", "sketch", "photoshop", "illustrator"]
+  }}""",
+    "benefits": """  "benefits": {{
+    "social": ["медицинская страховка", "дмс", "отпуск", "больничный", "пенсионные взносы", "материнский капитал", "детский сад"],
+    "bonuses": ["премия", "бонус", "комиссия", "процент", "акции", "опционы", "13-я зарплата", "годовая премия"],
+    "conditions": ["гибкий график", "удаленная работа", "офис", "коворкинг", "командировки", "переработки", "сверхурочные"],
+    "development": ["обучение", "курсы", "конференции", "сертификация", "менторство", "карьерный рост", "повышение квалификации"]
+  }}""",
+    "work_type": """  "workType": "full_time|part_time|contract|internship|remote|hybrid - СТРОКА, НЕ словарь!\"""",
+    "experience_level": """  "experienceLevel": "no_experience|junior|middle|senior|lead - СТРОКА, НЕ словарь!\"""",
+}
+
+V1_RULES = {
+    "company": """КОМПАНИЯ:
+   - Ищи названия компаний в начале описания, после слов "компания", "мы", "наша команда"
+   - ОСОБОЕ ВНИМАНИЕ: Если в описании есть строка "Компания: [название]", используй это название
+   - Размер компании ищи по фразам "X сотрудников", "команда из X", "X-Y человек", "Размер: X"
+   - Сайт ищи по доменам .ru, .com, .org или после "Сайт:"
+   - Описание компании ищи после "Описание:" в начале текста""",
+    "short_description": """КРАТКОЕ ОПИСАНИЕ (shortDescription):
+   - 3-4 предложения с ключевыми обязанностями и технологиями
+   - Включи основные технологии и фреймворки
+   - Сохрани важные детали о задачах
+   - Пример: "Разработка дашбордов и систем мониторинга на React 18, Next.js 15, TypeScript. Создание переиспользуемых компонентов с Tailwind CSS, Radix UI. Оптимизация производительности и работа с TanStack Query, React Hook Form.\"""",
+    "full_description": """ПОЛНОЕ ОПИСАНИЕ (fullDescription):
+   - Подробное описание (8-12 предложений) с сохранением всех важных деталей
+   - Исправь ошибки пунктуации и грамматики, но сохрани всю информацию
+   - Структурируй по разделам: обязанности, технологии, требования, условия
+   - Включи: все технологии, фреймворки, инструменты, условия работы, процесс найма
+   - Сохрани специфические детали: размер команды, формат работы, бонусы, процесс интервью
+   - Пример: "Разработка современных пользовательских интерфейсов для AI-платформы с использованием React 18, Next.js 15, TypeScript. Создание дашбордов для администраторов, систем мониторинга и аналитических панелей для работы с большими потоками данных в реальном времени. Работа с современным стеком: Tailwind CSS, Radix UI, Framer Motion, Shadcn UI, TanStack Query, React Hook Form, Zod. Участие в архитектурных решениях, оптимизация производительности интерфейсов, работа в связке с UI/UX дизайнерами и backend-разработчиками. Удаленный или гибридный формат работы, 6-дневная рабочая неделя, современные инструменты разработки, минимум бюрократии.\"""",
+    "salary": """ЗАРПЛАТА:
+   - КРИТИЧЕСКИ ВАЖНО: Если зарплата НЕ УКАЗАНА в специальном HTML-блоке с заголовком "Зарплата", ставь null для ВСЕХ полей salary (min, max, currency, period, type)
+   - Ищи ТОЛЬКО в блоке: <div class="content-section"><h2 class="content-section__title">Зарплата</h2>...<div class="basic-salary">...</div></div>
+   - Ищи ТОЛЬКО явно указанные числа с валютой: "100000 руб", "80-120 тыс", "от 50000", "до 200000", "от 3500 до 5000 $", "3500-5000 $"
+   - НЕ ПРИДУМЫВАЙ и НЕ УГАДЫВАЙ зарплату!
+   - НЕ ИЩИ зарплату в общем тексте описания!
+   - НЕ ИСПОЛЬЗУЙ другие значения - только null!
+   - Если нет точных цифр с валютой в специальном блоке, ставь null для всех полей salary
+   - Конвертируй "тыс" в полные числа (80 тыс = 80000)
+   - Определяй период: "в месяц", "в год", "месячно", "годовая" (по умолчанию month)
+   - Валюта: руб/рублей=RUB, $/долларов=USD, €/евро=EUR
+   - ОСОБОЕ ВНИМАНИЕ: Если в HTML есть блок "Зарплата" с данными, извлекай эти значения""",
+    "location": """ЛОКАЦИЯ:
+   - Города: Москва, СПб, Санкт-Петербург, Екатеринбург, Новосибирск, Нижний Новгород, Казань, Челябинск, Омск, Самара, Ростов-на-Дону
+   - Удаленная работа: "удаленно", "remote", "из дома", "дистанционно"
+   - Гибрид: "гибрид", "частично удаленно", "2-3 дня в неделю\"""",
+    "requirements": """ТРЕБОВАНИЯ:
+   - Обязательные: "требуется", "необходимо", "обязательно", "должен"
+   - Желательные: "желательно", "будет плюсом", "приветствуется", "опционально"
+   - Технические навыки извлекай из всего текста
+   - Языки программирования - только из списка выше
+   - Фреймворки - только из списка выше
+   - Инструменты - только из списка выше""",
+    "benefits": """ПРЕИМУЩЕСТВА:
+   - Социальный пакет: "медстраховка", "дмс", "отпуск", "больничный"
+   - Бонусы: "премия", "бонус", "13-я зарплата", "акции"
+   - Условия: "гибкий график", "офис", "коворкинг"
+   - Развитие: "обучение", "курсы", "конференции", "менторство\"""",
+    "work_type": """ТИП РАБОТЫ:
+   - full_time: "полная занятость", "полный день", "40 часов"
+   - part_time: "частичная занятость", "неполный день", "20 часов"
+   - contract: "контракт", "проектная работа", "по договору"
+   - internship: "стажировка", "intern", "стажер"
+   - remote: "удаленно", "remote", "из дома"
+   - hybrid: "гибрид", "частично удаленно\"""",
+    "experience_level": """УРОВЕНЬ ОПЫТА:
+   - no_experience: "без опыта", "стажер", "junior", "начинающий"
+   - junior: "1-2 года", "до 3 лет", "начинающий", "junior"
+   - middle: "3-5 лет", "от 3 лет", "средний", "middle"
+   - senior: "5+ лет", "от 5 лет", "опытный", "senior"
+   - lead: "lead", "руководитель", "team lead", "ведущий\"""",
+}
+
+V1_FOOTER = {
+    "salary": """- Если зарплата НЕ УКАЗАНА в специальном HTML-блоке с заголовком "Зарплата", ставь null для ВСЕХ полей salary (min, max, currency, period, type)
+- НЕ ПРИДУМЫВАЙ и НЕ УГАДЫВАЙ зарплату!
+- НЕ ИЩИ зарплату в общем тексте описания!
+- НЕ ИСПОЛЬЗУЙ "по договоренности" или другие значения - только null!
+- Если нет точных цифр с валютой в специальном блоке зарплаты, ставь null для всех полей salary""",
+}
+
+V1_FOOTER_COMMON = "- Если информация не найдена, используй null для чисел и пустые массивы для списков"
+
+# ===== v2: компактная схема с короткими ключами (см. CompactSchema) =====
+
+V2_HEADER = """
+Ты эксперт по анализу IT-вакансий. Извлеки структурированные данные из текста вакансии.
+
+ФОРМАТ ОТВЕТА:
+- Только минифицированный JSON в одну строку, без пояснений и без ```
+- Используй ТОЛЬКО короткие ключи из схемы ниже
+- НЕ выводи поля со значением null и пустые массивы - просто пропускай их
+- Строки в двойных кавычках, без trailing commas и комментариев
+
+Исходный текст вакансии:
+Заголовок: {title}
+Описание: {description}
+
+"""
+
+V2_SCHEMA = {
+    "company": "c: компания {{n: название, d: описание 1-2 предложения, w: сайт, sz: \"X-Y сотрудников\"}}",
+    "short_description": "sd: краткое описание вакансии, 2-3 предложения с ключевыми обязанностями и технологиями",
+    "full_description": "fd: полное описание, 8-12 предложений: обязанности, технологии, требования, условия",
+    "salary": "s: зарплата {{mn: число, mx: число, cu: R|U|E, p: m|y, t: g|n}}",
+    "location": "l: локация {{ci: город, co: страна, a: адрес, r: 1 если удаленно иначе 0}}",
+    "requirements": "r: требования {{rq: [обязательные], pf: [желательные], te: [технические навыки], la: [языки], fw: [фреймворки], to: [инструменты]}}",
+    "benefits": "b: преимущества {{so: [соцпакет], bo: [бонусы], co: [условия], de: [развитие]}}",
+    "work_type": "wt: тип работы F|P|C|I|R|H",
+    "experience_level": "el: уровень опыта N|J|M|S|L",
+}
+
+V2_CODES = {
+    "salary": (
+        "cu: R=RUB (руб, рублей), U=USD ($, долларов), E=EUR (€, евро)",
+        "p: m=в месяц (по умолчанию), y=в год",
+        "t: g=до вычета налогов, n=после вычета налогов",
+    ),
+    "work_type": ("wt: F=полная занятость, P=частичная, C=контракт/проектная работа, I=стажировка, R=удаленно, H=гибрид",),
+    "experience_level": ("el: N=без опыта/стажер, J=1-2 года/junior, M=3-5 лет/middle, S=5+ лет/senior, L=lead/руководитель",),
+}
+
+V2_RULES = {
+    "company": "c.n: ищи \"Компания: [название]\", начало описания, \"мы\", \"наша команда\"",
+    "salary": """s: ТОЛЬКО из блока "Зарплата" (<h2 class="content-section__title">Зарплата</h2>...<div class="basic-salary">) с явными числами и валютой. "80 тыс" = 80000. Если блока нет или нет чисел - НЕ выводи s вообще. НЕ придумывай зарплату""",
+    "location": "l.ci: Москва, Санкт-Петербург, Екатеринбург, Новосибирск, Казань и т.д.; l.co по умолчанию \"Россия\"",
+    "requirements": (
+        "r.rq: \"требуется\", \"необходимо\", \"обязательно\"; r.pf: \"желательно\", \"будет плюсом\", \"приветствуется\"",
+        "r.la/fw/to в нижнем регистре: языки (python, java, go...), фреймворки (react, django, spring...), инструменты (git, docker, kubernetes...)",
+    ),
+}
+
+V2_RULES_COMMON = "Все строковые значения - строки, НЕ вложенные объекты"
+
+V2_EXAMPLE = {
+    "company": ("c", {"n": "Тинькофф", "sz": "5000+ сотрудников"}),
+    "short_description": ("sd", "Разработка сервисов на Python и FastAPI."),
+    "salary": ("s", {"mn": 250000, "mx": 350000, "cu": "R", "p": "m", "t": "g"}),
+    "location": ("l", {"ci": "Москва", "co": "Россия", "r": 0}),
+    "requirements": ("r", {"rq": ["Python от 3 лет"], "la": ["python"], "fw": ["fastapi"], "to": ["docker"]}),
+    "benefits": ("b", {"so": ["дмс"]}),
+    "work_type": ("wt", "H"),
+    "experience_level": ("el", "M"),
+}
+
+PROMPT_SPECS = {
+    "v1": {
+        "header": V1_HEADER,
+        "schema": V1_SCHEMA,
+        "schema_open": "{{\n",
+        "schema_separator": ",\n",
+        "schema_close": "\n}}",
+        "codes": {},
+        "rules_title": "ПРАВИЛА ИЗВЛЕЧЕНИЯ:",
+        "rules_separator": "\n\n",
+        "rules": V1_RULES,
+        "rules_common": None,
+        "footer_title": "КРИТИЧЕСКИ ВАЖНО: ",
+        "footer": V1_FOOTER,
+        "footer_common": V1_FOOTER_COMMON,
+        "example": None,
+    },
+    "v2": {
+        "header": V2_HEADER,
+        "schema": V2_SCHEMA,
+        "schema_open": "СХЕМА (ключ: значение):\n",
+        "schema_separator": "\n",
+        "schema_close": "",
+        "codes": V2_CODES,
+        "rules_title": "ПРАВИЛА:",
+        "rules_separator": "\n",
+        "rules": V2_RULES,
+        "rules_common": V2_RULES_COMMON,
+        "footer_title": None,
+        "footer": {},
+        "footer_common": None,
+        "example": V2_EXAMPLE,
+    },
+}
+
+# Полный промпт v1 хранится дословно: версия входит в ключи кэша, хранилища ревизий и записи
+# оценки, поэтому ее текст не меняется. Фрагменты V1_* используются только для промптов
+# с подмножеством полей.
 JOB_NORMALIZATION_PROMPT_V1 = """
 Ты эксперт по анализу IT-вакансий. Твоя задача - извлечь структурированные данные из текста вакансии.
 
@@ -140,3 +384,13 @@ JOB_NORMALIZATION_PROMPT_V1 = """
 - Если нет точных цифр с валютой в специальном блоке зарплаты, ставь null для всех полей salary
 - Если информация не найдена, используй null для чисел и пустые массивы для списков
 """
+JOB_NORMALIZATION_PROMPT_V2 = PromptBuilder.render(PROMPT_SPECS["v2"])
+
+# Продолжение оборванного ответа в контексте той же генерации
+JSON_CONTINUE_PROMPT = "Ответ оборвался. Продолжи JSON точно с места обрыва, не повторяя уже выведенный текст, без пояснений и без markdown."
+
+# Короткий промпт исправления синтаксиса: без описания вакансии и схемы
+JSON_REPAIR_PROMPT = """Исправь синтаксические ошибки в JSON ({error}). Не меняй ключи и значения, ничего не добавляй.
+Верни только исправленный JSON без пояснений и без markdown.
+
+{broken}"""
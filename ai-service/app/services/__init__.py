@@ -1,9 +1,19 @@
 from .ollama_client import OllamaClient
 from .job_normalizer import JobNormalizer
 from .health_checker import HealthChecker
+from .model_residency import ModelResidencyManager
+from .incremental_normalizer import IncrementalNormalizer
+from .prompt_selector import PromptSelector
+from .normalization_pipeline import NormalizationPipeline
+from .loop_watchdog import LoopLagWatchdog
 
 __all__ = [
     "OllamaClient",
     "JobNormalizer", 
-    "HealthChecker"
+    "HealthChecker",
+    "ModelResidencyManager",
+    "IncrementalNormalizer",
+    "PromptSelector",
+    "NormalizationPipeline",
+    "LoopLagWatchdog"
 ]
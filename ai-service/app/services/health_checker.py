@@ -1,5 +1,8 @@
+import asyncio
 import logging
-from typing import Dict
+import time
+from typing import Dict, Any, Optional
+from ..config.settings import settings
 from ..exceptions import OllamaConnectionError, ModelNotAvailableError
 
 logger = logging.getLogger(__name__)
@@ -7,31 +10,87 @@ logger = logging.getLogger(__name__)
 
 class HealthChecker:
     """Сервис проверки здоровья системы"""
-    
-    def __init__(self, ollama_client):
+
+    def __init__(self, ollama_client, interval_seconds: Optional[float] = None):
         self.ollama_client = ollama_client
-    
+        self.interval_seconds = interval_seconds or settings.health_check_interval
+        self._snapshot: Dict[str, bool] = {
+            'ollama_available': False,
+            'model_loaded': False,
+            'model_resident': False
+        }
+        self._checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
     async def check_health(self) -> Dict[str, bool]:
         """Проверяет доступность Ollama и модели"""
         try:
             # Проверяем доступность Ollama
-            ollama_available = self.ollama_client.check_connection()
+            ollama_available = await asyncio.to_thread(self.ollama_client.check_connection)
             logger.debug(f"Ollama available: {ollama_available}")
-            
-            # Проверяем наличие модели
+
+            # Проверяем наличие модели и загружена ли она в память
             model_loaded = False
+            model_resident = False
             if ollama_available:
-                model_loaded = self.ollama_client.check_model_availability()
+                model_loaded = await asyncio.to_thread(self.ollama_client.check_model_availability)
                 logger.debug(f"Model loaded: {model_loaded}")
-            
+                if model_loaded:
+                    model_resident = await asyncio.to_thread(self.ollama_client.check_model_residency)
+                    logger.debug(f"Model resident: {model_resident}")
+
             return {
                 'ollama_available': ollama_available,
-                'model_loaded': model_loaded
+                'model_loaded': model_loaded,
+                'model_resident': model_resident
             }
-            
+
         except Exception as e:
             logger.warning(f"Health check failed: {e}")
             return {
                 'ollama_available': False,
-                'model_loaded': False
+                'model_loaded': False,
+                'model_resident': False
             }
+
+    async def refresh(self) -> None:
+        """Обновляет закэшированный снимок состояния"""
+        self._snapshot = await self.check_health()
+        self._checked_at = time.monotonic()
+
+    def get_snapshot(self) -> Dict[str, Any]:
+        """Возвращает последний снимок состояния и его возраст в секундах"""
+        age = None
+        if self._checked_at is not None:
+            age = round(time.monotonic() - self._checked_at, 3)
+        return {**self._snapshot, 'snapshot_age_seconds': age}
+
+    def is_stale(self) -> bool:
+        """Снимок не обновлялся дольше трех интервалов опроса"""
+        snapshot_age = self.get_snapshot()['snapshot_age_seconds']
+        return snapshot_age is None or snapshot_age > self.interval_seconds * 3
+
+    async def _run(self) -> None:
+        """Фоновый цикл опроса Ollama"""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Background health probe failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        """Запускает фоновый опрос"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"Health prober started with interval {self.interval_seconds}s")
+
+    async def stop(self) -> None:
+        """Останавливает фоновый опрос"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,146 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from ..models import NormalizeResponse, SalaryInfo
+from ..prompts import JOB_FIELDS
+from ..extractors import SalaryExtractor
+from ..utils import SectionSplitter, JSONEncoder
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalNormalizer:
+    """Повторная нормализация отредактированной вакансии только по измененным разделам"""
+
+    # Поле ответа -> разделы описания, из которых оно извлекается
+    FIELD_SECTIONS = {
+        'company': ('intro', 'company'),
+        'short_description': ('intro', 'responsibilities', 'requirements'),
+        'full_description': ('intro', 'company', 'responsibilities', 'requirements', 'conditions', 'location', 'other'),
+        'salary': ('salary', 'intro', 'conditions'),
+        'location': ('intro', 'location', 'conditions'),
+        'requirements': ('intro', 'requirements', 'responsibilities'),
+        'benefits': ('conditions', 'other'),
+        'work_type': ('intro', 'conditions', 'location'),
+        'experience_level': ('intro', 'requirements'),
+    }
+
+    # Отпечаток строк разделов зарплаты, похожих на ее упоминание: правка остального текста
+    # этих разделов (обычно все описание - один раздел intro) не делает зарплату устаревшей
+    SALARY_TEXT = 'salary_text'
+
+    def __init__(self, job_normalizer, revision_store):
+        self.job_normalizer = job_normalizer
+        self.revision_store = revision_store
+
+    @classmethod
+    def changed_fields(cls, old_sections: Dict[str, str], new_sections: Dict[str, str]) -> List[str]:
+        """Поля, исходные разделы которых изменились"""
+        changed = set(SectionSplitter.changed_sections(old_sections, new_sections))
+        fields = [field for field in JOB_FIELDS if changed & set(cls.FIELD_SECTIONS[field])]
+        salary_text = old_sections.get(cls.SALARY_TEXT)
+        if 'salary' in fields and salary_text is not None and salary_text == new_sections.get(cls.SALARY_TEXT):
+            fields.remove('salary')
+        return fields
+
+    @classmethod
+    def fingerprint(cls, sections: Dict[str, str]) -> Dict[str, str]:
+        """Отпечатки разделов описания вместе с отпечатком упоминаний зарплаты"""
+        salary_text = '\n'.join(
+            SalaryExtractor.mentions(sections[name]) for name in cls.FIELD_SECTIONS['salary'] if name in sections
+        )
+        return SectionSplitter.fingerprint({**sections, cls.SALARY_TEXT: salary_text})
+
+    async def normalize(
+        self,
+        title: str,
+        description: str,
+        source_name: Optional[str] = None,
+        original_url: Optional[str] = None,
+        fields: Optional[List[str]] = None,
+        prompt_version: Optional[str] = None
+    ) -> Tuple[NormalizeResponse, Optional[List[str]]]:
+        """Нормализует вакансию, переиспользуя неизменившиеся поля прошлой версии.
+
+        Возвращает ответ и список заполненных в нем полей (None - все поля).
+        """
+        revision = self.revision_store.get(original_url) if original_url else None
+        if revision is None or revision['title'] != title or revision['prompt_version'] != prompt_version:
+            result = await self.job_normalizer.normalize_job(
+                title=title,
+                description=description,
+                source_name=source_name,
+                original_url=original_url,
+                fields=fields,
+                prompt_version=prompt_version
+            )
+            return result, fields
+
+        raw_sections = SectionSplitter.split(description)
+        changed = set(self.changed_fields(revision['sections'], self.fingerprint(raw_sections)))
+        cached_fields = set(revision['fields'] or JOB_FIELDS)
+        wanted = fields or list(JOB_FIELDS)
+        stale = [field for field in wanted if field in changed or field not in cached_fields]
+
+        deterministic: Dict[str, Any] = {}
+        if 'salary' in stale:
+            known, salary = self._extract_salary(raw_sections)
+            if known:
+                deterministic['salary'] = salary
+                stale.remove('salary')
+
+        logger.info(
+            f"Incremental normalization for {original_url}: changed={sorted(changed)}, "
+            f"regenerate={stale}, deterministic={list(deterministic)}"
+        )
+        metrics.inc('incremental_normalizations_total')
+        metrics.inc('incremental_fields_reused_total', len(wanted) - len(stale) - len(deterministic))
+        metrics.inc('incremental_fields_regenerated_total', len(stale))
+        metrics.inc('incremental_fields_deterministic_total', len(deterministic))
+
+        result = NormalizeResponse(**JSONEncoder.decode(revision['body'])).model_copy(update={
+            'source_name': source_name,
+            'original_url': original_url,
+            'parsed_at': datetime.now().isoformat()
+        })
+        if stale:
+            update = await self.job_normalizer.normalize_job(
+                title=title,
+                description=description,
+                source_name=source_name,
+                original_url=original_url,
+                fields=stale,
+                prompt_version=prompt_version
+            )
+            result = self.job_normalizer.merge_fields(result, update, stale)
+        if deterministic:
+            result = self.job_normalizer.update_fields(result, deterministic)
+
+        # Поля прошлой версии, которые устарели и не перегенерированы, в ответ не попадают
+        present = (cached_fields - changed) | set(wanted)
+        present_fields = self.job_normalizer.resolve_fields(present)
+        if present_fields is not None:
+            result = self.job_normalizer.project_fields(result, present_fields)
+        return result, present_fields
+
+    def remember(
+        self,
+        title: str,
+        description: str,
+        original_url: Optional[str],
+        result: NormalizeResponse,
+        fields: Optional[List[str]] = None,
+        prompt_version: Optional[str] = None
+    ) -> None:
+        """Сохраняет обработанную версию вакансии для следующих правок"""
+        if not original_url:
+            return
+        sections = self.fingerprint(SectionSplitter.split(description))
+        self.revision_store.set(original_url, title, sections, JSONEncoder.encode(result), fields, prompt_version)
+
+    @staticmethod
+    def _extract_salary(sections: Dict[str, str]) -> Tuple[bool, Optional[SalaryInfo]]:
+        """Зарплата без модели: (удалось ли определить, значение)"""
+        known, salary = SalaryExtractor.extract_from_sections(sections)
+        return known, SalaryInfo(**salary) if salary else None
@@ -1,12 +1,23 @@
+import asyncio
 import json
 import logging
+import random
+import threading
+import time
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Callable, Iterable, List, Tuple
 from ..models import (
     NormalizeResponse, CompanyInfo, SalaryInfo, LocationInfo, 
     Requirements, Benefits, WorkType, ExperienceLevel
 )
-from ..utils import ResponseParser, QualityCalculator, IDGenerator
+from ..config.settings import settings
+from ..prompts import PromptManager, PromptBuilder, JOB_FIELDS, AI_FIELDS, JSON_CONTINUE_PROMPT, JSON_REPAIR_PROMPT
+from ..utils import (
+    ResponseParser, QualityCalculator, IDGenerator, CompactSchema,
+    TokenEstimator, TextChunker, ChunkReducer, SectionSplitter, StreamingJSONParser
+)
+from ..extractors import SalaryExtractor
+from ..metrics import metrics
 from ..exceptions import PromptProcessingError, InvalidResponseError
 
 logger = logging.getLogger(__name__)
@@ -15,49 +26,99 @@ logger = logging.getLogger(__name__)
 class JobNormalizer:
     """Сервис нормализации вакансий"""
     
-    def __init__(self, ollama_client, prompt_template: str):
+    def __init__(
+        self,
+        ollama_client,
+        prompt_template: str,
+        payload_sample_rate: Optional[float] = None,
+        prompt_version: Optional[str] = None,
+        chunk_threshold_tokens: Optional[int] = None,
+        chunk_max_tokens: Optional[int] = None,
+        chunk_concurrency: Optional[int] = None,
+        prompt_selector=None,
+        field_classifier=None,
+        classifier_samples_path: Optional[str] = None,
+        source_extractors=None,
+        repair_enabled: Optional[bool] = None,
+        max_continuations: Optional[int] = None,
+        continuation_tokens: Optional[int] = None,
+        fan_out: Optional[bool] = None,
+        fan_out_concurrency: Optional[int] = None
+    ):
         self.ollama_client = ollama_client
         self.prompt_template = prompt_template
+        self.prompt_version = prompt_version or settings.prompt_version
+        self.chunk_threshold_tokens = chunk_threshold_tokens or settings.chunk_threshold_tokens
+        self.chunk_max_tokens = chunk_max_tokens or settings.chunk_max_tokens
+        self.chunk_concurrency = chunk_concurrency or settings.chunk_concurrency
+        self.prompt_selector = prompt_selector
+        self.field_classifier = field_classifier
+        self.classifier_samples_path = classifier_samples_path
+        self._samples_lock = threading.Lock()
+        self.source_extractors = source_extractors
+        # Оценка времени модели на одно поле (EWMA) для учета экономии от плагинов источников
+        self.seconds_per_field: Optional[float] = None
+        self.repair_enabled = settings.response_repair_enabled if repair_enabled is None else repair_enabled
+        self.max_continuations = (
+            settings.response_max_continuations if max_continuations is None else max_continuations
+        )
+        self.continuation_tokens = continuation_tokens or settings.response_continuation_tokens
+        self.fan_out = settings.field_group_fan_out if fan_out is None else fan_out
+        self.fan_out_concurrency = fan_out_concurrency or settings.field_group_concurrency
+        self.payload_sample_rate = (
+            settings.log_payload_sample_rate if payload_sample_rate is None else payload_sample_rate
+        )
+        self.in_flight = 0
     
     async def normalize_job(
         self, 
         title: str, 
         description: str,
         source_name: Optional[str] = None,
-        original_url: Optional[str] = None
+        original_url: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+        prompt_version: Optional[str] = None,
+        on_partial: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> NormalizeResponse:
-        """Нормализует вакансию с помощью AI"""
+        """Нормализует вакансию с помощью AI; fields ограничивает набор извлекаемых полей.
+
+        on_partial получает поля ответа по мере готовности: сначала детерминированные,
+        затем извлеченные моделью (ответ модели разбирается по мере генерации).
+        """
         
+        self.in_flight += 1
         try:
             logger.info(f"Starting normalization for job: {title}")
             
-            # Создаем промпт
-            prompt = self._create_prompt(title, description)
+            requested_fields = self.resolve_fields(fields)
+            version = prompt_version or self.prompt_version
             
-            # Вызываем AI
-            ai_response = self.ollama_client.generate_response(prompt)
+            # Поля из разметки площадки (плагин источника) и уверенно классифицированные поля
+            # не запрашиваем у модели
+            plugin_name, known = self._extract_from_source(source_name, title, description, requested_fields)
+            plugin_fields = len(known)
+            predicted = self._classify_fields(
+                title, description, self._model_fields(requested_fields, [AI_FIELDS[key] for key in known])
+            )
+            known.update({self.field_classifier.AI_KEYS[field]: label for field, label in predicted.items()})
+            emit = None
+            if on_partial is not None:
+                # В потоковом режиме зарплату из раздела "Зарплата" отдаем сразу, без модели
+                for key, value in self._deterministic_ai_data(description, requested_fields).items():
+                    known.setdefault(key, value)
+                emit = self._partial_emitter(title, description, source_name, original_url, requested_fields, on_partial)
+                for key, value in known.items():
+                    emit(key, value)
+            model_fields = self._model_fields(requested_fields, [AI_FIELDS[key] for key in known])
             
-            # Парсим ответ
-            try:
-                ai_data = ResponseParser.parse_ai_response(ai_response)
-                # Нормализуем структуру данных
-                ai_data = self._normalize_ai_data(ai_data)
-                logger.info(f"Normalized AI data: {json.dumps(ai_data, ensure_ascii=False, indent=2)}")
-            except Exception as parse_error:
-                logger.error(f"Failed to parse AI response: {parse_error}")
-                logger.debug(f"Raw AI response: {ai_response}")
-                # Создаем базовую структуру данных если парсинг не удался
-                ai_data = {
-                    "company": {"name": None, "description": None, "website": None, "size": None},
-                    "shortDescription": None,
-                    "fullDescription": None,
-                    "salary": {"min": None, "max": None, "currency": None, "period": None, "type": None},
-                    "location": {"city": None, "country": "Россия", "address": None, "remote": False},
-                    "requirements": {"required": [], "preferred": [], "technical": [], "languages": [], "frameworks": [], "tools": []},
-                    "benefits": {"social": [], "bonuses": [], "conditions": [], "development": []},
-                    "workType": "full_time",
-                    "experienceLevel": "middle"
-                }
+            # Извлекаем данные моделью (длинное описание - по фрагментам)
+            if model_fields == []:
+                ai_data, generation = self._empty_ai_data(), None
+            else:
+                ai_data, generation = await self._extract_ai_data(title, description, model_fields, version, emit)
+            ai_data.update(known)
+            if plugin_fields:
+                self._record_plugin_savings(plugin_name, plugin_fields, model_fields, generation)
             
             # Создаем нормализованный ответ
             try:
@@ -72,17 +133,539 @@ class JobNormalizer:
                 logger.error(f"Error creating normalized response: {create_error}")
                 logger.debug(f"AI data that caused error: {ai_data}")
                 raise create_error
+            if generation is not None and generation['degraded']:
+                result._degraded = True
+            
+            if generation is not None and not predicted and not result.degraded:
+                await self._record_training_sample(title, description, version, requested_fields, generation)
+            if requested_fields is not None:
+                result = self.project_fields(result, requested_fields)
+            elif (
+                self.prompt_selector is not None and model_fields is None
+                and generation['chunks'] == 1 and 'groups' not in generation
+            ):
+                # Статистику версий собираем только по сопоставимым полным нормализациям одним промптом:
+                # промпты, из которых убраны поля плагина, классификатора или детерминированной зарплаты,
+                # и параллельные группы полей не учитываются. Стоимость - только сама генерация, без
+                # починки ответа: она зависит от входа, а не от версии промпта.
+                # Частично разобранный ответ (запасной разбор) - такой же сбой разбора, как и неразобранный
+                self.prompt_selector.record(
+                    version,
+                    latency_seconds=generation['generation_seconds'],
+                    output_tokens=generation['output_tokens'],
+                    parse_failed=generation['parse_failed'] or generation['degraded'],
+                    quality_score=result.quality_score
+                )
             
             return result
             
         except Exception as e:
             logger.error(f"Error normalizing job {title}: {e}")
             raise PromptProcessingError(f"Ошибка нормализации вакансии: {str(e)}")
+        finally:
+            self.in_flight -= 1
+    
+    async def _extract_ai_data(
+        self,
+        title: str,
+        description: str,
+        fields: Optional[List[str]] = None,
+        version: Optional[str] = None,
+        on_key: Optional[Callable[[str, Any], None]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Извлекает нормализованные данные вакансии из ответа модели вместе со статистикой генерации.
+
+        on_key получает завершенные ключи верхнего уровня ответа по мере генерации
+        (только для описания из одного фрагмента и клиента с потоковой генерацией).
+        """
+        chunks = self._split_description(description)
+        groups = PromptBuilder.group_fields(fields) if self.fan_out and len(chunks) == 1 else []
+        if len(groups) > 1:
+            return await self._extract_field_groups(title, description, groups, version, on_key)
+        if len(chunks) == 1:
+            # Создаем промпт и вызываем AI
+            prompt = self._create_prompt(title, description, fields, version)
+            started = time.perf_counter()
+            if on_key is not None and hasattr(self.ollama_client, 'astream'):
+                generation = await self._stream_generate(prompt, on_key)
+            else:
+                generation = await self._generate(prompt)
+            generation_seconds = time.perf_counter() - started
+            ai_data, degraded, labels = await self._parse_generation(title, generation)
+            stats = {
+                'chunks': 1,
+                'latency_seconds': time.perf_counter() - started,
+                # Генерация без починки ответа (продолжения и исправления JSON)
+                'generation_seconds': generation_seconds,
+                'output_tokens': generation.get('eval_count') or 0,
+                'parse_failed': ai_data is None,
+                'degraded': degraded,
+                'labels': labels
+            }
+            # Создаем базовую структуру данных если парсинг не удался
+            return (ai_data if ai_data is not None else self._empty_ai_data()), stats
+        
+        logger.info(f"Long description for job {title}: extracting from {len(chunks)} chunks")
+        metrics.inc('chunked_normalizations_total')
+        metrics.observe('normalization_chunks', len(chunks))
+        semaphore = asyncio.Semaphore(self.chunk_concurrency)
+        
+        async def extract_chunk(chunk: str) -> Tuple[Optional[Dict[str, Any]], bool, Dict[str, str]]:
+            async with semaphore:
+                prompt = self._create_prompt(title, chunk, fields, version)
+                generation = await self._generate(prompt)
+                return await self._parse_generation(title, generation)
+        
+        started = time.perf_counter()
+        results = await asyncio.gather(*(extract_chunk(chunk) for chunk in chunks))
+        parsed = [part for part, _, _ in results if part is not None]
+        # Метку фрагментированной вакансии берем, только если все ответившие фрагменты согласны
+        answers: Dict[str, set] = {}
+        for _, _, labels in results:
+            for key, label in labels.items():
+                answers.setdefault(key, set()).add(label)
+        stats = {
+            'chunks': len(chunks),
+            'latency_seconds': time.perf_counter() - started,
+            'output_tokens': None,
+            'parse_failed': len(parsed) < len(results),
+            'degraded': any(degraded for _, degraded, _ in results),
+            'labels': {key: labels.pop() for key, labels in answers.items() if len(labels) == 1}
+        }
+        if not parsed:
+            return self._empty_ai_data(), stats
+        return ChunkReducer.reduce(parsed), stats
+    
+    async def _extract_field_groups(
+        self,
+        title: str,
+        description: str,
+        groups: List[Tuple[str, List[str]]],
+        version: Optional[str] = None,
+        on_key: Optional[Callable[[str, Any], None]] = None
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Извлекает группы полей параллельными короткими промптами и объединяет ответы.
+
+        Промпты групп начинаются с одного и того же префикса (инструкции и текст вакансии),
+        а ответ каждой группы короче полного, поэтому задержка вакансии определяется самой
+        долгой группой, а не суммой всех полей. on_key получает ключи группы по ее готовности.
+        """
+        semaphore = asyncio.Semaphore(self.fan_out_concurrency)
+        
+        async def extract_group(name: str, group_fields: List[str]) -> Tuple[Optional[Dict[str, Any]], bool, Dict[str, Any]]:
+            async with semaphore:
+                started = time.perf_counter()
+                generation = await self._generate(self._create_prompt(title, description, group_fields, version))
+                data, degraded, labels = await self._parse_generation(title, generation)
+                latency = time.perf_counter() - started
+            metrics.observe('field_group_latency_seconds', latency, group=name)
+            if data is None:
+                metrics.inc('field_group_failures_total', group=name)
+            else:
+                data = {key: value for key, value in data.items() if AI_FIELDS.get(key) in group_fields}
+                if on_key is not None:
+                    for key, value in data.items():
+                        on_key(key, value)
+            return data, degraded, {
+                'latency_seconds': latency,
+                'output_tokens': generation.get('eval_count') or 0,
+                'labels': {key: label for key, label in labels.items() if AI_FIELDS[key] in group_fields}
+            }
+        
+        started = time.perf_counter()
+        results = await asyncio.gather(*(extract_group(name, group_fields) for name, group_fields in groups))
+        ai_data = self._empty_ai_data()
+        for data, _, _ in results:
+            ai_data.update(data or {})
+        group_stats = {name: stats for (name, _), (_, _, stats) in zip(groups, results)}
+        stats = {
+            'chunks': 1,
+            'latency_seconds': time.perf_counter() - started,
+            'output_tokens': sum(group['output_tokens'] for group in group_stats.values()),
+            'parse_failed': any(data is None for data, _, _ in results),
+            'degraded': any(degraded for _, degraded, _ in results),
+            'labels': {key: label for group in group_stats.values() for key, label in group.pop('labels').items()},
+            'groups': group_stats
+        }
+        logger.info(
+            f"Field groups for job {title} in {stats['latency_seconds']:.2f}s: " + ', '.join(
+                f"{name} {group['latency_seconds']:.2f}s" for name, group in group_stats.items()
+            )
+        )
+        return ai_data, stats
+    
+    def _extract_from_source(
+        self,
+        source_name: Optional[str],
+        title: str,
+        description: str,
+        fields: Optional[List[str]]
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Поля, которые плагин площадки нашел в разметке описания: (имя плагина, данные)"""
+        if self.source_extractors is None:
+            return None, {}
+        return self.source_extractors.extract(source_name, title, description, fields)
+    
+    def _record_plugin_savings(
+        self,
+        plugin_name: str,
+        plugin_fields: int,
+        model_fields: Optional[List[str]],
+        generation: Optional[Dict[str, Any]]
+    ) -> None:
+        """Обновляет оценку времени модели на поле и учитывает время, сэкономленное плагином"""
+        if generation is not None and generation['chunks'] == 1 and not generation['parse_failed']:
+            per_field = generation['latency_seconds'] / len(model_fields or JOB_FIELDS)
+            self.seconds_per_field = (
+                per_field if self.seconds_per_field is None else 0.9 * self.seconds_per_field + 0.1 * per_field
+            )
+        if self.seconds_per_field is not None:
+            self.source_extractors.record_saved(plugin_name, plugin_fields * self.seconds_per_field)
+    
+    def _classify_fields(
+        self,
+        title: str,
+        description: str,
+        fields: Optional[List[str]]
+    ) -> Dict[str, str]:
+        """Поля, которые классификатор предсказал с уверенностью выше порога"""
+        if self.field_classifier is None:
+            return {}
+        wanted = [field for field in self.field_classifier.LABELS if fields is None or field in fields]
+        if not wanted:
+            return {}
+        started = time.perf_counter()
+        predictions = self.field_classifier.predict(title, description, wanted)
+        metrics.observe('classifier_latency_seconds', time.perf_counter() - started)
+        confident = {}
+        for field, (label, probability, is_confident) in predictions.items():
+            metrics.inc('classifier_predictions_total', field=field, outcome='confident' if is_confident else 'uncertain')
+            if is_confident:
+                confident[field] = label
+        return confident
+    
+    @staticmethod
+    def _model_fields(fields: Optional[List[str]], known_fields: List[str]) -> Optional[List[str]]:
+        """Поля для промпта модели без уже известных полей; [] - модель не нужна"""
+        if not known_fields:
+            return fields
+        return [field for field in (fields or JOB_FIELDS) if field not in known_fields]
     
-    def _create_prompt(self, title: str, description: str) -> str:
+    @staticmethod
+    def _deterministic_ai_data(description: str, fields: Optional[List[str]]) -> Dict[str, Any]:
+        """Поля, которые извлекаются из описания без модели, в формате ответа модели"""
+        if fields is not None and 'salary' not in fields:
+            return {}
+        known, salary = SalaryExtractor.extract_from_sections(SectionSplitter.split(description))
+        return {'salary': salary} if known else {}
+    
+    def _partial_emitter(
+        self,
+        title: str,
+        description: str,
+        source_name: Optional[str],
+        original_url: Optional[str],
+        fields: Optional[List[str]],
+        on_partial: Callable[[Dict[str, Any]], None]
+    ) -> Callable[[str, Any], None]:
+        """Переводит завершенные ключи ответа модели в поля NormalizeResponse и передает их в on_partial.
+
+        Каждое поле отдается один раз: известные до генерации значения не перекрываются ответом модели.
+        """
+        raw: Dict[str, Any] = {}
+        emitted = set()
+        
+        def emit(key: str, value: Any) -> None:
+            if key in CompactSchema.FIELDS:
+                expanded = CompactSchema.expand({key: value})
+                key = CompactSchema.FIELDS[key][0]
+            else:
+                expanded = {key: value}
+            field = AI_FIELDS.get(key)
+            if field is None or field in emitted or (fields is not None and field not in fields):
+                return
+            emitted.add(field)
+            raw.update(expanded)
+            try:
+                partial = self._create_normalized_response(
+                    title, description, self._normalize_ai_data(raw), source_name, original_url
+                )
+            except Exception as e:
+                logger.debug(f"Failed to build partial field {field} for job {title}: {e}")
+                return
+            on_partial(partial.model_dump(mode='json', include={field}))
+        
+        return emit
+    
+    async def _record_training_sample(
+        self,
+        title: str,
+        description: str,
+        version: str,
+        fields: Optional[List[str]],
+        generation: Dict[str, Any]
+    ) -> None:
+        """Дописывает ответ модели по workType/experienceLevel в выборку для обучения классификатора.
+
+        Метки берутся из ответа модели до нормализации: значения по умолчанию, которые
+        подставляет _normalize_ai_data, в выборку не попадают, иначе классификатор учился бы
+        на них и дальше уверенно отвечал бы ими вместо модели.
+        """
+        if not self.classifier_samples_path or generation['parse_failed']:
+            return
+        labels = {
+            key: label for key, label in generation['labels'].items()
+            if fields is None or AI_FIELDS[key] in fields
+        }
+        if not labels:
+            return
+        sample = {'title': title, 'description': description, 'prompt_version': version, **labels}
+        # Запись в файл - вне event loop
+        await asyncio.to_thread(self._append_sample, json.dumps(sample, ensure_ascii=False) + '\n')
+    
+    def _append_sample(self, line: str) -> None:
+        try:
+            with self._samples_lock, open(self.classifier_samples_path, 'a', encoding='utf-8') as f:
+                f.write(line)
+        except OSError as e:
+            logger.warning(f"Failed to record classifier sample: {e}")
+    
+    @staticmethod
+    def _model_labels(parsed: Dict[str, Any]) -> Dict[str, str]:
+        """workType/experienceLevel, которые модель явно указала допустимым значением"""
+        if CompactSchema.is_compact(parsed):
+            parsed = CompactSchema.expand(parsed)
+        labels = {}
+        for key, enum in (('workType', WorkType), ('experienceLevel', ExperienceLevel)):
+            value = parsed.get(key)
+            if isinstance(value, str) and value.strip().lower() in {item.value for item in enum}:
+                labels[key] = value.strip().lower()
+        return labels
+    
+    async def _generate(self, prompt: str) -> Dict[str, Any]:
+        """Вызов модели; отмена задачи отменяет и запрос к Ollama, если клиент асинхронный"""
+        if hasattr(self.ollama_client, 'agenerate'):
+            return await self.ollama_client.agenerate(prompt)
+        # Синхронный клиент вызываем в потоке, чтобы не блокировать event loop
+        return await asyncio.to_thread(self.ollama_client.generate, prompt)
+    
+    async def _stream_generate(self, prompt: str, on_key: Callable[[str, Any], None]) -> Dict[str, Any]:
+        """Потоковая генерация: завершенные ключи ответа передаются в on_key до окончания генерации"""
+        parser = StreamingJSONParser()
+        pieces = []
+        generation: Dict[str, Any] = {}
+        async for part in self.ollama_client.astream(prompt):
+            pieces.append(part['response'])
+            for key, value in parser.feed(part['response']):
+                on_key(key, value)
+            if part.get('done'):
+                generation = part
+        return {**generation, 'response': ''.join(pieces)}
+    
+    def _split_description(self, description: str) -> List[str]:
+        """Делит описание на фрагменты, если оно длиннее порога"""
+        if TokenEstimator.estimate(description) <= self.chunk_threshold_tokens:
+            return [description]
+        return TextChunker.split(description, self.chunk_max_tokens) or [description]
+    
+    async def _parse_generation(
+        self,
+        title: str,
+        generation: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], bool, Dict[str, str]]:
+        """Разбирает ответ модели; оборванный или сломанный JSON сначала чинит моделью.
+
+        Возвращает (данные или None, разобран ли ответ лишь частично,
+        явно указанные моделью метки workType/experienceLevel).
+        """
+        response = generation['response']
+        parsed = self._try_parse(response)
+        if parsed is None and self.repair_enabled and hasattr(self.ollama_client, 'agenerate'):
+            response = await self._repair_response(title, generation)
+            parsed = self._try_parse(response)
+        if parsed is not None:
+            return self._parse_ai_data(title, response, lambda _: parsed), False, self._model_labels(parsed)
+        
+        # Ответ так и не разобран: у оборванного JSON берем завершенные поля, иначе - частичные данные
+        metrics.inc('degraded_responses_total')
+        if ResponseParser.is_truncated(response):
+            return self._parse_ai_data(title, response, ResponseParser.parse_truncated), True, {}
+        return self._parse_ai_data(title, response), True, {}
+    
+    @staticmethod
+    def _try_parse(response: str) -> Optional[Dict[str, Any]]:
+        try:
+            return ResponseParser.parse_strict(response)
+        except InvalidResponseError:
+            return None
+    
+    async def _repair_response(self, title: str, generation: Dict[str, Any]) -> str:
+        """Продолжает оборванную генерацию в ее контексте или исправляет JSON коротким промптом"""
+        response = generation['response']
+        # Полный повтор потратил бы столько же токенов промпта и ответа, сколько исходная генерация
+        full_retry_tokens = (generation.get('prompt_eval_count') or 0) + (generation.get('eval_count') or 0)
+        spent = 0
+        truncated = generation.get('done_reason') == 'length' or ResponseParser.is_truncated(response)
+        
+        if truncated and generation.get('context'):
+            kind = 'continuation'
+            context = generation['context']
+            for _ in range(self.max_continuations):
+                continuation = await self.ollama_client.agenerate(
+                    JSON_CONTINUE_PROMPT,
+                    options=self._repair_options(generation, self.continuation_tokens),
+                    context=context
+                )
+                spent += (continuation.get('prompt_eval_count') or 0) + (continuation.get('eval_count') or 0)
+                response = ResponseParser.stitch(response, continuation['response'])
+                context = continuation.get('context')
+                if self._try_parse(response) is not None or continuation.get('done_reason') != 'length' or not context:
+                    break
+        else:
+            kind = 'repair_prompt'
+            broken = ResponseParser.clean_response(response)
+            try:
+                ResponseParser.parse_strict(broken)
+                error = 'неизвестная ошибка'
+            except InvalidResponseError as e:
+                error = str(e)
+            repair = await self.ollama_client.agenerate(
+                JSON_REPAIR_PROMPT.format(broken=broken, error=error),
+                options=self._repair_options(generation, TokenEstimator.estimate(broken) * 2 + 64)
+            )
+            spent += (repair.get('prompt_eval_count') or 0) + (repair.get('eval_count') or 0)
+            if self._try_parse(repair['response']) is not None:
+                response = repair['response']
+        
+        success = self._try_parse(response) is not None
+        logger.info(f"JSON repair for job {title}: {kind} {'succeeded' if success else 'failed'}, {spent} tokens")
+        metrics.inc('response_repairs_total', kind=kind, outcome='success' if success else 'failure')
+        metrics.inc('response_repair_tokens_total', spent, kind=kind)
+        if success:
+            metrics.inc('response_repair_tokens_saved_total', max(full_retry_tokens - spent, 0), kind=kind)
+        return response
+    
+    @staticmethod
+    def _repair_options(generation: Dict[str, Any], num_predict: int) -> Dict[str, Any]:
+        """Опции исправления: num_ctx исходной генерации, чтобы Ollama не перезагружала модель"""
+        options = {'num_predict': num_predict}
+        if generation.get('num_ctx'):
+            options['num_ctx'] = generation['num_ctx']
+        return options
+    
+    def _parse_ai_data(
+        self,
+        title: str,
+        ai_response: str,
+        parse: Callable[[str], Dict[str, Any]] = ResponseParser.parse_ai_response
+    ) -> Optional[Dict[str, Any]]:
+        """Парсит и нормализует ответ модели, None если ответ не разобрать"""
+        try:
+            ai_data = parse(ai_response)
+            # Нормализуем структуру данных
+            ai_data = self._normalize_ai_data(ai_data)
+            if self._should_log_payload():
+                # Сериализация payload выполняется фоновым потоком логирования, а normalize_job
+                # дополняет ai_data на месте - в лог уходит копия
+                logger.info("Normalized AI data", extra={'job_title': title, 'payload': dict(ai_data)})
+            return ai_data
+        except Exception as parse_error:
+            logger.error(
+                f"Failed to parse AI response: {parse_error}",
+                extra={'job_title': title, 'payload': ai_response}
+            )
+            return None
+    
+    @staticmethod
+    def _empty_ai_data() -> Dict[str, Any]:
+        """Базовая структура данных, когда ответ модели не разобран"""
+        return {
+            "company": {"name": None, "description": None, "website": None, "size": None},
+            "shortDescription": None,
+            "fullDescription": None,
+            "salary": {"min": None, "max": None, "currency": None, "period": None, "type": None},
+            "location": {"city": None, "country": "Россия", "address": None, "remote": False},
+            "requirements": {"required": [], "preferred": [], "technical": [], "languages": [], "frameworks": [], "tools": []},
+            "benefits": {"social": [], "bonuses": [], "conditions": [], "development": []},
+            "workType": "full_time",
+            "experienceLevel": "middle"
+        }
+    
+    def _should_log_payload(self) -> bool:
+        """Логировать ли полный payload модели для текущего запроса"""
+        return self.payload_sample_rate > 0 and random.random() < self.payload_sample_rate
+    
+    @staticmethod
+    def resolve_fields(fields: Optional[Iterable[str]]) -> Optional[List[str]]:
+        """Приводит маску полей к порядку схемы; None - все поля"""
+        if fields is None:
+            return None
+        try:
+            resolved = PromptBuilder.normalize_fields(fields)
+        except ValueError as e:
+            raise PromptProcessingError(str(e))
+        return None if len(resolved) == len(JOB_FIELDS) else resolved
+    
+    def merge_fields(
+        self,
+        base: NormalizeResponse,
+        update: NormalizeResponse,
+        fields: Iterable[str]
+    ) -> NormalizeResponse:
+        """Дополняет ранее полученный ответ полями из нового ответа"""
+        merged = self.update_fields(base, {field: getattr(update, field) for field in fields})
+        merged._degraded = base.degraded or update.degraded
+        return merged
+    
+    def update_fields(self, result: NormalizeResponse, values: Dict[str, Any]) -> NormalizeResponse:
+        """Заменяет значения полей ответа и пересчитывает оценку качества"""
+        return self._refresh_derived(result.model_copy(update=values))
+    
+    def project_fields(self, result: NormalizeResponse, fields: List[str]) -> NormalizeResponse:
+        """Очищает поля, которые не запрашивались (модель их не извлекала)"""
+        empty = {
+            'company': CompanyInfo(),
+            'short_description': None,
+            'full_description': None,
+            'salary': None,
+            'location': None,
+            'requirements': Requirements(),
+            'benefits': None,
+            'work_type': None,
+            'experience_level': None
+        }
+        projected = result.model_copy(
+            update={field: value for field, value in empty.items() if field not in fields}
+        )
+        return self._refresh_derived(projected)
+    
+    def _refresh_derived(self, result: NormalizeResponse) -> NormalizeResponse:
+        """Пересчитывает оценку качества после изменения набора полей (ID не меняется)"""
+        result.quality_score = QualityCalculator.calculate_quality_score({
+            'company': result.company,
+            'salary': result.salary,
+            'location': result.location,
+            'requirements': result.requirements,
+            'benefits': result.benefits,
+            'work_type': result.work_type,
+            'experience_level': result.experience_level
+        })
+        return result
+    
+    def _create_prompt(
+        self,
+        title: str,
+        description: str,
+        fields: Optional[List[str]] = None,
+        version: Optional[str] = None
+    ) -> str:
         """Создает промпт для AI"""
         try:
-            return self.prompt_template.format(
+            version = version or self.prompt_version
+            template = self.prompt_template
+            if fields is not None or version != self.prompt_version:
+                template = PromptManager.get_prompt(version, fields)
+            return template.format(
                 title=title,
                 description=description
             )
@@ -301,6 +884,10 @@ class JobNormalizer:
     
     def _normalize_ai_data(self, ai_data: Dict[str, Any]) -> Dict[str, Any]:
         """Нормализует структуру данных от AI к ожидаемому формату"""
+        # Ответ в компактной схеме (промпт v2) сначала разворачиваем в полную структуру
+        if CompactSchema.is_compact(ai_data):
+            ai_data = CompactSchema.expand(ai_data)
+        
         normalized = {}
         
         # Нормализуем company
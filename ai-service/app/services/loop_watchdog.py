@@ -0,0 +1,145 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, Optional
+
+from ..config.settings import settings
+from ..diagnostics.paths import APP_DIR, short_path
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagWatchdog:
+    """Сторож задержки event loop.
+
+    Корутина на loop раз в interval обновляет heartbeat и измеряет, насколько позже
+    запланированного она проснулась (lag). Вспомогательный поток следит за heartbeat:
+    если loop не отвечает дольше threshold, поток снимает стек потока loop, пока
+    блокирующий вызов еще выполняется, и относит длительность зависания к месту вызова.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: Optional[float] = None,
+        threshold_seconds: Optional[float] = None,
+        max_sites: Optional[int] = None
+    ):
+        self.interval_seconds = interval_seconds or settings.loop_watchdog_interval
+        self.threshold_seconds = threshold_seconds or settings.loop_lag_threshold
+        self.max_sites = max_sites or settings.loop_watchdog_max_sites
+        self._lock = threading.Lock()
+        self._sites: Dict[str, Dict[str, Any]] = {}
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    @staticmethod
+    def call_site(stack: traceback.StackSummary) -> str:
+        """Ближайший к вершине стека кадр кода app, иначе самый верхний кадр"""
+        frames = list(reversed(stack))
+        frame = next((f for f in frames if f.filename.startswith(APP_DIR + os.sep)), frames[0])
+        return f"{short_path(frame.filename)}:{frame.lineno} {frame.name}"
+
+    def _capture(self) -> Optional[traceback.StackSummary]:
+        frame = sys._current_frames().get(self._loop_thread_id)
+        if frame is None:
+            return None
+        return traceback.extract_stack(frame, limit=40)
+
+    def _record_stall(self, stack: traceback.StackSummary, seconds: float) -> None:
+        site = self.call_site(stack)
+        with self._lock:
+            if site not in self._sites and len(self._sites) >= self.max_sites:
+                site = 'other'
+            entry = self._sites.setdefault(site, {
+                'count': 0, 'total_seconds': 0.0, 'max_seconds': 0.0, 'last_seen': None, 'stack': []
+            })
+            entry['count'] += 1
+            entry['total_seconds'] += seconds
+            entry['max_seconds'] = max(entry['max_seconds'], seconds)
+            entry['last_seen'] = time.time()
+            entry['stack'] = [
+                f"{short_path(f.filename)}:{f.lineno} {f.name}: {f.line}" for f in stack
+            ]
+        metrics.inc('event_loop_stalls_total', site=site)
+        metrics.inc('event_loop_stall_seconds_total', seconds, site=site)
+        logger.warning(f"Event loop blocked for {seconds:.3f}s at {site}")
+
+    async def _probe(self) -> None:
+        """Корутина на loop: heartbeat и lag относительно запланированного пробуждения"""
+        while True:
+            expected = time.monotonic() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            now = time.monotonic()
+            self._heartbeat = now
+            self.last_lag = max(now - expected, 0.0)
+            self.max_lag = max(self.max_lag, self.last_lag)
+            metrics.observe('event_loop_lag_seconds', self.last_lag)
+            metrics.set_gauge('event_loop_lag_last_seconds', self.last_lag)
+
+    def _watch(self) -> None:
+        """Поток-сторож: снимает стек loop при зависании и учитывает его длительность"""
+        stalled_since: Optional[float] = None
+        stack: Optional[traceback.StackSummary] = None
+        while not self._stop_event.wait(self.interval_seconds / 2):
+            heartbeat = self._heartbeat
+            silent = time.monotonic() - heartbeat - self.interval_seconds
+            if stalled_since is None and silent > self.threshold_seconds:
+                # Стек снимается во время зависания - на нем виден блокирующий вызов
+                stack = self._capture()
+                stalled_since = heartbeat
+            elif stalled_since is not None and heartbeat != stalled_since:
+                if stack:
+                    self._record_stall(stack, heartbeat - stalled_since - self.interval_seconds)
+                stalled_since = stack = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Места блокировок, отсортированные по суммарному времени зависания"""
+        with self._lock:
+            sites = [{'site': site, **dict(entry)} for site, entry in self._sites.items()]
+        sites.sort(key=lambda entry: entry['total_seconds'], reverse=True)
+        return {
+            'running': self._task is not None,
+            'interval_seconds': self.interval_seconds,
+            'threshold_seconds': self.threshold_seconds,
+            'lag_last_seconds': round(self.last_lag, 6),
+            'lag_max_seconds': round(self.max_lag, 6),
+            'stalls': sites,
+        }
+
+    def start(self) -> None:
+        """Запускает корутину на текущем event loop и поток-сторож"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._task = asyncio.create_task(self._probe())
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._watch, name='loop-watchdog', daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Event loop watchdog started: interval {self.interval_seconds}s, threshold {self.threshold_seconds}s"
+        )
+
+    async def stop(self) -> None:
+        """Останавливает корутину и поток-сторож"""
+        if self._task is None:
+            return
+        self._stop_event.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await asyncio.to_thread(self._thread.join)
+        self._thread = None
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import time
+from typing import Optional
+from ..config.settings import settings
+from ..metrics import metrics
+from ..utils import TokenEstimator
+
+logger = logging.getLogger(__name__)
+
+WARMUP_RETRY_SECONDS = 10.0
+
+
+class ModelResidencyManager:
+    """Прогрев модели при старте и удержание ее в памяти Ollama"""
+
+    def __init__(
+        self,
+        ollama_client,
+        prompt_template: str,
+        refresh_interval: Optional[float] = None,
+        traffic_window: Optional[float] = None,
+        warmup_enabled: Optional[bool] = None,
+        warmup_description_tokens: Optional[int] = None
+    ):
+        self.ollama_client = ollama_client
+        self.prompt_template = prompt_template
+        self.refresh_interval = refresh_interval or settings.ollama_refresh_interval
+        self.traffic_window = settings.ollama_traffic_window if traffic_window is None else traffic_window
+        self.warmup_enabled = settings.ollama_warmup_enabled if warmup_enabled is None else warmup_enabled
+        self.warmup_description_tokens = (
+            settings.ollama_warmup_description_tokens if warmup_description_tokens is None else warmup_description_tokens
+        )
+        self.warmed_up = False
+        self.resident = False
+        self._last_activity = time.monotonic()
+        self._task: Optional[asyncio.Task] = None
+
+    def _static_prefix(self) -> str:
+        """Статическая часть промпта до подстановки данных вакансии"""
+        prefix = self.prompt_template.split('{title}')[0]
+        return prefix.replace('{{', '{').replace('}}', '}')
+
+    def typical_prompt_tokens(self) -> int:
+        """Размер обычного запроса: весь промпт с описанием типичной длины"""
+        prompt = self.prompt_template.format(title='', description='')
+        return TokenEstimator.estimate(prompt) + self.warmup_description_tokens
+
+    def note_activity(self) -> None:
+        """Отмечает входящий трафик, чтобы модель продолжала удерживаться"""
+        self._last_activity = time.monotonic()
+
+    def traffic_expected(self) -> bool:
+        """Ожидается ли трафик: был запрос в пределах окна (0 - всегда)"""
+        if not self.traffic_window:
+            return True
+        return time.monotonic() - self._last_activity < self.traffic_window
+
+    async def warm_up(self) -> bool:
+        """Загружает модель и прогревает статический префикс промпта короткой генерацией"""
+        start = time.perf_counter()
+        prefix = self._static_prefix()
+        options = {'num_predict': 1}
+        if self.ollama_client.num_ctx_buckets:
+            # Модель загружается с num_ctx обычного запроса, иначе первый запрос перезагрузит ее;
+            # прогревается только статический префикс, но ступень выбирается по полному промпту
+            options['num_ctx'], _ = self.ollama_client.select_num_ctx(
+                self.typical_prompt_tokens(), self.ollama_client.output_tokens_estimate
+            )
+        try:
+            result = await asyncio.to_thread(self.ollama_client.generate, prefix, options)
+        except Exception as e:
+            logger.warning(f"Model warm-up failed: {e}")
+            metrics.inc('model_warmup_failures_total', model=self.ollama_client.model)
+            return False
+
+        load_seconds = result.get('load_duration', 0) / 1e9
+        elapsed = time.perf_counter() - start
+        self.warmed_up = True
+        self._on_loaded(load_seconds, was_resident=False)
+        metrics.observe('model_warmup_seconds', elapsed, model=self.ollama_client.model)
+        logger.info(f"Model {self.ollama_client.model} warmed up in {elapsed:.2f}s (load {load_seconds:.2f}s)")
+        return True
+
+    def _on_loaded(self, load_seconds: float, was_resident: bool) -> None:
+        """Фиксирует событие загрузки модели"""
+        self.resident = True
+        if not was_resident:
+            metrics.inc('model_loads_total', model=self.ollama_client.model)
+            metrics.observe('model_load_seconds', load_seconds, model=self.ollama_client.model)
+            logger.info(f"Model load event: model={self.ollama_client.model} load_seconds={load_seconds:.2f}")
+        metrics.set_gauge('model_resident', 1, model=self.ollama_client.model)
+
+    async def refresh(self) -> None:
+        """Проверяет резидентность модели и продлевает keep_alive"""
+        resident = await asyncio.to_thread(self.ollama_client.check_model_residency)
+        if self.resident and not resident:
+            metrics.inc('model_unloads_total', model=self.ollama_client.model)
+            logger.warning(f"Model unload event: model={self.ollama_client.model}")
+        self.resident = resident
+        metrics.set_gauge('model_resident', int(resident), model=self.ollama_client.model)
+
+        if not self.traffic_expected():
+            logger.debug("No recent traffic, skipping keep_alive refresh")
+            return
+
+        if not self.warmed_up:
+            await self.warm_up()
+            return
+
+        load_seconds = await asyncio.to_thread(self.ollama_client.load_model)
+        self._on_loaded(load_seconds, was_resident=resident)
+        metrics.inc('model_keep_alive_refreshes_total', model=self.ollama_client.model)
+
+    async def _run(self) -> None:
+        """Фоновый цикл: прогрев, затем периодическое продление keep_alive"""
+        if not self.warmup_enabled:
+            self.warmed_up = True
+        while not self.warmed_up:
+            if not await self.warm_up():
+                await asyncio.sleep(WARMUP_RETRY_SECONDS)
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Model residency refresh failed: {e}")
+
+    def start(self) -> None:
+        """Запускает прогрев и удержание модели в фоне"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Останавливает фоновую задачу"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,253 @@
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from ..config.settings import settings
+from ..exceptions import GenerationCancelledError
+from ..metrics import metrics
+from ..models import NormalizeRequest, NormalizeResponse
+from ..prompts import JOB_FIELDS
+from ..utils import JSONEncoder
+
+logger = logging.getLogger(__name__)
+
+
+class NormalizationPipeline:
+    """Нормализация с кэшем: выбор версии промпта, кэш, дозаполнение полей и ревизии вакансий"""
+
+    def __init__(
+        self,
+        cache,
+        job_normalizer,
+        incremental_normalizer,
+        prompt_selector,
+        timeout_seconds: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+        finish_into_cache: Optional[bool] = None,
+        finish_min_progress: Optional[float] = None
+    ):
+        self.cache = cache
+        self.job_normalizer = job_normalizer
+        self.incremental_normalizer = incremental_normalizer
+        self.prompt_selector = prompt_selector
+        self.timeout_seconds = settings.normalize_timeout_seconds if timeout_seconds is None else timeout_seconds
+        self.poll_interval = poll_interval or settings.disconnect_poll_interval
+        self.finish_into_cache = settings.finish_cancelled_into_cache if finish_into_cache is None else finish_into_cache
+        self.finish_min_progress = (
+            settings.finish_into_cache_min_progress if finish_min_progress is None else finish_min_progress
+        )
+        # Сглаженная длительность нормализации без кэша - для оценки готовности прерванной генерации
+        self.expected_seconds: Optional[float] = None
+        self._background: Set[asyncio.Task] = set()
+
+    def resolve_fields(self, fields) -> Optional[List[str]]:
+        """Маска полей запроса в порядке схемы; None - все поля"""
+        return self.job_normalizer.resolve_fields(fields)
+
+    async def normalize(self, request: NormalizeRequest, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Возвращает сериализованный ответ: {'body', 'etag', 'fields'}"""
+        prompt_version = self.prompt_selector.choose(f"{request.title}|{request.description}")
+
+        # В кэше хранится уже сериализованный ответ и список извлеченных полей (None - все)
+        cached_result = self.cache.get(request.title, request.description, prompt_version)
+        missing = self._missing_fields(cached_result['fields'], fields) if cached_result else fields
+        if cached_result and not missing:
+            logger.info(f"Returning cached result for job: {request.title}")
+            return cached_result
+
+        started = time.monotonic()
+        if cached_result:
+            # Догенерируем только недостающие поля
+            logger.info(f"Completing cached result for job {request.title} with fields: {missing}")
+            result = await self.job_normalizer.normalize_job(
+                title=request.title,
+                description=request.description,
+                source_name=request.source_name,
+                original_url=request.original_url,
+                fields=missing,
+                prompt_version=prompt_version
+            )
+            base = NormalizeResponse(**JSONEncoder.decode(cached_result['body']))
+            result = self.job_normalizer.merge_fields(base, result, missing)
+            stored_fields = self.job_normalizer.resolve_fields([*cached_result['fields'], *missing])
+        else:
+            # Нормализуем вакансию; для отредактированной версии - только измененные поля
+            result, stored_fields = await self.incremental_normalizer.normalize(
+                title=request.title,
+                description=request.description,
+                source_name=request.source_name,
+                original_url=request.original_url,
+                fields=fields,
+                prompt_version=prompt_version
+            )
+        self._observe_duration(time.monotonic() - started)
+        encoded = self.encode_result(result, stored_fields)
+        self._store(request, result, encoded, stored_fields, prompt_version)
+        return encoded
+
+    async def normalize_guarded(
+        self,
+        request: NormalizeRequest,
+        fields: Optional[List[str]] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> Dict[str, Any]:
+        """normalize с таймаутом и отменой генерации при отключении клиента.
+
+        Если генерация почти завершена и включен finish_into_cache, она доводится
+        до конца в фоне и попадает в кэш; иначе запрос к модели отменяется.
+        """
+        task = asyncio.create_task(self.normalize(request, fields))
+        started = time.monotonic()
+        deadline = started + self.timeout_seconds if self.timeout_seconds > 0 else None
+        try:
+            while True:
+                wait = self.poll_interval if is_disconnected else None
+                if deadline is not None:
+                    remaining = max(deadline - time.monotonic(), 0)
+                    wait = remaining if wait is None else min(wait, remaining)
+                done, _ = await asyncio.wait({task}, timeout=wait)
+                if done:
+                    return task.result()
+                if deadline is not None and time.monotonic() >= deadline:
+                    reason = 'timeout'
+                    break
+                if is_disconnected and await is_disconnected():
+                    reason = 'disconnect'
+                    break
+        except asyncio.CancelledError:
+            # Сам обработчик запроса отменен (например, остановка сервера)
+            task.cancel()
+            raise
+        await self._abandon(task, request, reason, time.monotonic() - started)
+        raise GenerationCancelledError(reason)
+
+    async def stream(
+        self,
+        request: NormalizeRequest,
+        fields: Optional[List[str]] = None,
+        is_disconnected: Optional[Callable[[], Awaitable[bool]]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Потоковая нормализация: события ('partial', {поле: значение}) и ('result', тело ответа).
+
+        Полностью закэшированный ответ отдается сразу; если в кэше не хватает полей,
+        ответ дополняется как в normalize_guarded (с таймаутом и отменой при отключении
+        клиента) без промежуточных событий.
+        """
+        prompt_version = self.prompt_selector.choose(f"{request.title}|{request.description}")
+        cached_result = self.cache.get(request.title, request.description, prompt_version)
+        if cached_result:
+            if self._missing_fields(cached_result['fields'], fields):
+                cached_result = await self.normalize_guarded(request, fields, is_disconnected)
+            yield 'result', cached_result['body']
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        started = time.monotonic()
+
+        async def normalize_and_cache() -> Dict[str, Any]:
+            result = await self.job_normalizer.normalize_job(
+                title=request.title,
+                description=request.description,
+                source_name=request.source_name,
+                original_url=request.original_url,
+                fields=fields,
+                prompt_version=prompt_version,
+                on_partial=queue.put_nowait
+            )
+            self._observe_duration(time.monotonic() - started)
+            encoded = self.encode_result(result, fields)
+            self._store(request, result, encoded, fields, prompt_version)
+            return encoded
+
+        task = asyncio.create_task(normalize_and_cache())
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        deadline = started + self.timeout_seconds if self.timeout_seconds > 0 else None
+        first = True
+        try:
+            while True:
+                timeout = max(deadline - time.monotonic(), 0) if deadline is not None else None
+                try:
+                    partial = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    await self._abandon(task, request, 'timeout', time.monotonic() - started)
+                    raise GenerationCancelledError('timeout')
+                if partial is None:
+                    break
+                if first:
+                    metrics.observe('stream_first_field_seconds', time.monotonic() - started)
+                    first = False
+                yield 'partial', partial
+        except (asyncio.CancelledError, GeneratorExit):
+            # Клиент отключился: генерацию, которую никто не ждет, отменяем
+            if not task.done():
+                await self._abandon(task, request, 'disconnect', time.monotonic() - started)
+            raise
+
+        encoded = task.result()
+        metrics.observe('stream_result_seconds', time.monotonic() - started)
+        yield 'result', encoded['body']
+
+    def _store(
+        self,
+        request: NormalizeRequest,
+        result: NormalizeResponse,
+        encoded: Dict[str, Any],
+        fields: Optional[List[str]],
+        prompt_version: str
+    ) -> None:
+        """Сохраняет ответ в кэш и ревизии; частично разобранный ответ не сохраняется"""
+        if result.degraded:
+            logger.warning(f"Not caching degraded result for job {request.title}")
+            metrics.inc('degraded_results_not_cached_total')
+            return
+        self.incremental_normalizer.remember(
+            request.title, request.description, request.original_url, result, fields, prompt_version
+        )
+        # Сериализуем один раз и сохраняем в кэш готовые байты
+        self.cache.set(request.title, request.description, encoded, prompt_version)
+
+    async def _abandon(self, task: asyncio.Task, request: NormalizeRequest, reason: str, elapsed: float) -> None:
+        """Отменяет генерацию, результат которой никто не ждет, или доводит ее в кэш"""
+        progress = elapsed / self.expected_seconds if self.expected_seconds else 0.0
+        if self.finish_into_cache and progress >= self.finish_min_progress:
+            logger.info(
+                f"Client gave up on job {request.title} ({reason}) at {progress:.0%} of expected time, "
+                f"finishing into cache"
+            )
+            metrics.inc('normalize_cancellations_total', reason=reason, action='finished_into_cache')
+            self._background.add(task)
+            task.add_done_callback(self._background_done)
+            return
+
+        logger.warning(f"Cancelling generation for job {request.title} after {elapsed:.1f}s: {reason}")
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"Cancelled generation for job {request.title} failed: {e}")
+        metrics.inc('normalize_cancellations_total', reason=reason, action='cancelled')
+        # Время, которое модель потратила на ответ, выброшенный при отмене
+        metrics.inc('normalize_wasted_seconds_total', elapsed, reason=reason)
+
+    def _background_done(self, task: asyncio.Task) -> None:
+        self._background.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background normalization failed: {task.exception()}")
+
+    def _observe_duration(self, seconds: float) -> None:
+        self.expected_seconds = seconds if self.expected_seconds is None else 0.8 * self.expected_seconds + 0.2 * seconds
+
+    @staticmethod
+    def encode_result(result: NormalizeResponse, fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Сериализует ответ и вычисляет его ETag"""
+        body = JSONEncoder.encode(result)
+        return {'body': body, 'etag': JSONEncoder.make_etag(body), 'fields': fields}
+
+    @staticmethod
+    def _missing_fields(cached_fields: Optional[List[str]], fields: Optional[List[str]]) -> List[str]:
+        """Поля, которых нет в закэшированном ответе"""
+        if cached_fields is None:
+            return []
+        return [field for field in (fields or JOB_FIELDS) if field not in cached_fields]
@@ -1,7 +1,12 @@
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+import math
+import weakref
+from typing import Dict, Any, AsyncIterator, List, Optional, Tuple
 from ..config.settings import settings
 from ..exceptions import OllamaConnectionError, ModelNotAvailableError
+from ..metrics import metrics
+from ..utils import TokenEstimator
 
 logger = logging.getLogger(__name__)
 
@@ -9,10 +14,27 @@ logger = logging.getLogger(__name__)
 class OllamaClient:
     """Клиент для работы с Ollama"""
     
-    def __init__(self, model: str = None, base_url: str = None):
+    # Запас на погрешность TokenEstimator относительно токенизатора модели
+    NUM_CTX_MARGIN = 1.1
+    
+    def __init__(
+        self,
+        model: str = None,
+        base_url: str = None,
+        num_ctx_buckets: Optional[List[int]] = None,
+        output_tokens_estimate: Optional[int] = None
+    ):
         self.model = model or settings.ollama_model
         self.base_url = base_url or settings.ollama_base_url
+        self.num_ctx_buckets = sorted(
+            num_ctx_buckets if num_ctx_buckets is not None else settings.ollama_num_ctx_buckets
+        )
+        self.output_tokens_estimate = output_tokens_estimate or settings.ollama_output_tokens_estimate
+        # num_ctx последней генерации: с ним продлевается keep_alive, чтобы Ollama не перезагружала модель
+        self.last_num_ctx: Optional[int] = None
         self.client = None
+        # Асинхронный клиент (httpx) привязан к event loop, поэтому храним по одному на loop
+        self._async_clients = weakref.WeakKeyDictionary()
     
     def _get_client(self):
         """Ленивая инициализация клиента Ollama"""
@@ -26,31 +48,186 @@ class OllamaClient:
                 raise OllamaConnectionError(f"Не удалось подключиться к Ollama: {e}")
         return self.client
     
+    def _get_async_client(self):
+        """Асинхронный клиент Ollama для текущего event loop"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            try:
+                import ollama
+                client = ollama.AsyncClient(host=self.base_url)
+            except Exception as e:
+                logger.error(f"Failed to initialize async Ollama client: {e}")
+                raise OllamaConnectionError(f"Не удалось подключиться к Ollama: {e}")
+            self._async_clients[loop] = client
+        return client
+    
+    def select_num_ctx(self, prompt_tokens: int, output_tokens: int) -> Tuple[int, bool]:
+        """Наименьшая ступень num_ctx, вмещающая промпт и ответ: (num_ctx, поместился ли запрос)"""
+        needed = math.ceil((prompt_tokens + output_tokens) * self.NUM_CTX_MARGIN)
+        for bucket in self.num_ctx_buckets:
+            if needed <= bucket:
+                return bucket, True
+        return self.num_ctx_buckets[-1], False
+    
+    def _generate_options(
+        self,
+        options: Optional[Dict[str, Any]],
+        prompt: str = '',
+        context: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        default_options = {
+            'temperature': 0.1,
+            'top_p': 0.9,
+            'num_predict': 4096
+        }
+        if options:
+            default_options.update(options)
+        if self.num_ctx_buckets and prompt and 'num_ctx' not in default_options:
+            num_predict = default_options['num_predict']
+            output_tokens = num_predict if 0 < num_predict < self.output_tokens_estimate else self.output_tokens_estimate
+            prompt_tokens = TokenEstimator.estimate(prompt) + len(context or ())
+            num_ctx, fits = self.select_num_ctx(prompt_tokens, output_tokens)
+            default_options['num_ctx'] = num_ctx
+            metrics.inc('ollama_num_ctx_requests_total', num_ctx=str(num_ctx))
+            if not fits:
+                metrics.inc('ollama_num_ctx_truncated_total', model=self.model)
+                logger.warning(
+                    f"Prompt of ~{prompt_tokens} tokens with {output_tokens} output tokens exceeds "
+                    f"the largest num_ctx {num_ctx}: Ollama will truncate the prompt"
+                )
+        if default_options.get('num_ctx'):
+            self.last_num_ctx = default_options['num_ctx']
+        return default_options
+    
+    def _check_context(self, result: Dict[str, Any], options: Dict[str, Any]) -> None:
+        """Промпт и ответ заняли весь контекст: начало промпта или ответа было отброшено"""
+        num_ctx = options.get('num_ctx')
+        used = result['prompt_eval_count'] + result['eval_count']
+        if num_ctx and used >= num_ctx:
+            metrics.inc('ollama_context_overflow_total', num_ctx=str(num_ctx))
+            logger.warning(f"Generation used {used} tokens of num_ctx {num_ctx}: context was truncated")
+    
+    @staticmethod
+    def _generation_result(response: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            'response': response['response'],
+            'prompt_eval_count': response.get('prompt_eval_count') or 0,
+            'eval_count': response.get('eval_count') or 0,
+            'total_duration': response.get('total_duration') or 0,
+            'load_duration': response.get('load_duration') or 0,
+            'done_reason': response.get('done_reason'),
+            # Токены промпта и ответа: по ним генерацию можно продолжить (см. agenerate context)
+            'context': response.get('context')
+        }
+    
     def generate_response(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
         """Генерирует ответ от модели"""
+        return self.generate(prompt, options)['response']
+    
+    def generate(
+        self,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Генерирует ответ от модели вместе со статистикой токенов и времени"""
         try:
             client = self._get_client()
-            default_options = {
-                'temperature': 0.1,
-                'top_p': 0.9,
-                'num_predict': 4096
-            }
-            if options:
-                default_options.update(options)
-            
+            options = self._generate_options(options, prompt)
             response = client.generate(
                 model=self.model,
                 prompt=prompt,
-                options=default_options
+                options=options,
+                keep_alive=keep_alive or settings.ollama_keep_alive
             )
             
             logger.debug(f"Generated response for model {self.model}")
-            return response['response']
+            result = {**self._generation_result(response), 'num_ctx': options.get('num_ctx')}
+            self._check_context(result, options)
+            return result
             
         except Exception as e:
             logger.error(f"Error generating response: {e}")
             raise OllamaConnectionError(f"Ошибка генерации ответа: {e}")
     
+    async def agenerate(
+        self,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[str] = None,
+        context: Optional[List[int]] = None
+    ) -> Dict[str, Any]:
+        """Асинхронная генерация: отмена задачи закрывает HTTP запрос, и Ollama освобождает слот модели.
+
+        context из прошлого ответа продолжает тот же диалог без повторной отправки промпта.
+        """
+        try:
+            client = self._get_async_client()
+            options = self._generate_options(options, prompt, context)
+            response = await client.generate(
+                model=self.model,
+                prompt=prompt,
+                options=options,
+                keep_alive=keep_alive or settings.ollama_keep_alive,
+                context=context
+            )
+            
+            logger.debug(f"Generated response for model {self.model}")
+            result = {**self._generation_result(response), 'num_ctx': options.get('num_ctx')}
+            self._check_context(result, options)
+            return result
+            
+        except Exception as e:
+            logger.error(f"Error generating response: {e}")
+            raise OllamaConnectionError(f"Ошибка генерации ответа: {e}")
+    
+    async def astream(
+        self,
+        prompt: str,
+        options: Optional[Dict[str, Any]] = None,
+        keep_alive: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Потоковая генерация: фрагменты ответа по мере готовности, последний (done) - со статистикой"""
+        try:
+            client = self._get_async_client()
+            options = self._generate_options(options, prompt)
+            stream = await client.generate(
+                model=self.model,
+                prompt=prompt,
+                options=options,
+                keep_alive=keep_alive or settings.ollama_keep_alive,
+                stream=True
+            )
+            async for part in stream:
+                result = {
+                    **self._generation_result(part),
+                    'done': bool(part.get('done')),
+                    'num_ctx': options.get('num_ctx')
+                }
+                if result['done']:
+                    self._check_context(result, options)
+                yield result
+        except Exception as e:
+            logger.error(f"Error streaming response: {e}")
+            raise OllamaConnectionError(f"Ошибка генерации ответа: {e}")
+    
+    def load_model(self, keep_alive: Optional[str] = None) -> float:
+        """Загружает модель в память без генерации и продлевает keep_alive, возвращает время загрузки в секундах"""
+        try:
+            client = self._get_client()
+            # Параметры раннера должны совпадать с рабочими запросами, иначе Ollama перезагрузит модель
+            options = {'num_ctx': self.last_num_ctx} if self.last_num_ctx else None
+            response = client.generate(
+                model=self.model,
+                keep_alive=keep_alive or settings.ollama_keep_alive,
+                options=options
+            )
+            return (response.get('load_duration') or 0) / 1e9
+        except Exception as e:
+            logger.error(f"Error loading model {self.model}: {e}")
+            raise ModelNotAvailableError(f"Не удалось загрузить модель {self.model}: {e}")
+    
     def check_connection(self) -> bool:
         """Проверяет подключение к Ollama"""
         try:
@@ -83,3 +260,16 @@ class OllamaClient:
         except Exception as e:
             logger.error(f"Model availability check failed: {e}")
             return False
+    
+    def check_model_residency(self) -> bool:
+        """Проверяет, загружена ли модель в память Ollama"""
+        try:
+            client = self._get_client()
+            running = client.ps()
+            
+            if hasattr(running, 'models') and running.models:
+                return any(model.model == self.model for model in running.models)
+            return False
+        except Exception as e:
+            logger.error(f"Model residency check failed: {e}")
+            return False
@@ -0,0 +1,170 @@
+import hashlib
+import logging
+import random
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from ..config.settings import settings
+from ..metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class PromptSelector:
+    """Выбор версии промпта для запроса по живой статистике задержки и качества.
+
+    Режимы:
+      fixed  - всегда версия по умолчанию
+      canary - доля трафика canary_fraction идет на canary версию; если она не держит
+               порог качества, трафик возвращается на версию по умолчанию
+      bandit - epsilon-greedy: большая часть трафика идет на самую дешевую версию,
+               которая держит порог качества, остальное - на исследование
+    """
+
+    MODES = ('fixed', 'canary', 'bandit')
+    COST_METRICS = ('latency', 'output_tokens')
+
+    def __init__(
+        self,
+        versions: List[str],
+        default_version: Optional[str] = None,
+        mode: Optional[str] = None,
+        canary_version: Optional[str] = None,
+        canary_fraction: Optional[float] = None,
+        quality_floor: Optional[float] = None,
+        max_fallback_rate: Optional[float] = None,
+        epsilon: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        window: Optional[int] = None,
+        cost_metric: Optional[str] = None
+    ):
+        self.versions = list(versions)
+        self.default_version = default_version or settings.prompt_version
+        self.mode = mode or settings.prompt_selection_mode
+        self.canary_version = canary_version or settings.prompt_canary_version
+        self.canary_fraction = settings.prompt_canary_fraction if canary_fraction is None else canary_fraction
+        self.quality_floor = settings.prompt_quality_floor if quality_floor is None else quality_floor
+        self.max_fallback_rate = settings.prompt_max_fallback_rate if max_fallback_rate is None else max_fallback_rate
+        self.epsilon = settings.prompt_bandit_epsilon if epsilon is None else epsilon
+        self.min_samples = min_samples or settings.prompt_min_samples
+        self.cost_metric = cost_metric or settings.prompt_cost_metric
+        window = window or settings.prompt_stats_window
+
+        if self.mode not in self.MODES:
+            raise ValueError(f"Неизвестный режим выбора промпта: {self.mode}")
+        if self.cost_metric not in self.COST_METRICS:
+            raise ValueError(f"Неизвестная метрика стоимости промпта: {self.cost_metric}")
+        for version in (self.default_version, self.canary_version):
+            if version and version not in self.versions:
+                raise ValueError(f"Версия промпта {version} не найдена")
+
+        # Скользящее окно последних замеров: (latency, output_tokens, parse_failed, quality_score)
+        self._samples: Dict[str, Deque[Tuple[float, int, bool, int]]] = {
+            version: deque(maxlen=window) for version in self.versions
+        }
+        self._lock = threading.Lock()
+        self._canary_rolled_back = False
+
+    @staticmethod
+    def _uniform(key: Optional[str], salt: str) -> float:
+        """Число из [0, 1): детерминированное для ключа, иначе случайное"""
+        if key is None:
+            return random.random()
+        digest = hashlib.md5(f"{salt}|{key}".encode()).hexdigest()
+        return int(digest[:8], 16) / 2 ** 32
+
+    def choose(self, key: Optional[str] = None) -> str:
+        """Выбирает версию промпта для запроса.
+
+        С ключом (например, текстом вакансии) распределение по canary и исследованию
+        стабильно, поэтому повторные запросы той же вакансии попадают в кэш своей версии.
+        """
+        if self.mode == 'canary' and self.canary_version:
+            if self._canary_healthy() and self._uniform(key, 'canary') < self.canary_fraction:
+                return self.canary_version
+            return self.default_version
+        if self.mode == 'bandit':
+            # Пока у версии нет минимальной выборки, на нее идет до половины трафика
+            undersampled = [version for version in self.versions if self._count(version) < self.min_samples]
+            if undersampled and self._uniform(key, 'warmup') < max(self.epsilon, 0.5):
+                return undersampled[int(self._uniform(key, 'pick') * len(undersampled))]
+            if self._uniform(key, 'explore') < self.epsilon:
+                return self.versions[int(self._uniform(key, 'pick') * len(self.versions))]
+            return self.preferred_version()
+        return self.default_version
+
+    def preferred_version(self) -> str:
+        """Самая дешевая версия, которая держит порог качества"""
+        summary = self.stats()['versions']
+        eligible = [
+            version for version in self.versions
+            if summary[version]['requests'] >= self.min_samples and self._meets_floor(summary[version])
+        ]
+        if not eligible:
+            return self.default_version
+        key = 'mean_latency_seconds' if self.cost_metric == 'latency' else 'mean_output_tokens'
+        return min(eligible, key=lambda version: summary[version][key])
+
+    def record(
+        self,
+        version: str,
+        latency_seconds: float,
+        output_tokens: int,
+        parse_failed: bool,
+        quality_score: int
+    ) -> None:
+        """Добавляет замер полной нормализации версией промпта"""
+        if version not in self._samples:
+            return
+        with self._lock:
+            self._samples[version].append((latency_seconds, output_tokens, parse_failed, quality_score))
+        metrics.inc('prompt_requests_total', prompt_version=version)
+        metrics.observe('prompt_latency_seconds', latency_seconds, prompt_version=version)
+        metrics.observe('prompt_output_tokens', output_tokens, prompt_version=version)
+        metrics.observe('prompt_quality_score', quality_score, prompt_version=version)
+        if parse_failed:
+            metrics.inc('prompt_parse_fallbacks_total', prompt_version=version)
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика по версиям промпта в скользящем окне"""
+        with self._lock:
+            snapshot = {version: list(samples) for version, samples in self._samples.items()}
+        versions = {}
+        for version, samples in snapshot.items():
+            count = len(samples)
+            versions[version] = {
+                'requests': count,
+                'mean_latency_seconds': sum(s[0] for s in samples) / count if count else None,
+                'mean_output_tokens': sum(s[1] for s in samples) / count if count else None,
+                'parse_fallback_rate': sum(s[2] for s in samples) / count if count else None,
+                'mean_quality_score': sum(s[3] for s in samples) / count if count else None,
+            }
+        return {
+            'mode': self.mode,
+            'default_version': self.default_version,
+            'canary_version': self.canary_version,
+            'quality_floor': self.quality_floor,
+            'max_fallback_rate': self.max_fallback_rate,
+            'versions': versions,
+        }
+
+    def _count(self, version: str) -> int:
+        with self._lock:
+            return len(self._samples[version])
+
+    def _meets_floor(self, summary: Dict[str, Any]) -> bool:
+        return (
+            summary['mean_quality_score'] >= self.quality_floor
+            and summary['parse_fallback_rate'] <= self.max_fallback_rate
+        )
+
+    def _canary_healthy(self) -> bool:
+        """Canary версия остается в ротации, пока не набрала выборку ниже порога"""
+        summary = self.stats()['versions'][self.canary_version]
+        if summary['requests'] < self.min_samples:
+            return True
+        healthy = self._meets_floor(summary)
+        if not healthy and not self._canary_rolled_back:
+            logger.warning(f"Canary prompt {self.canary_version} is below quality floor, routing to {self.default_version}")
+        self._canary_rolled_back = not healthy
+        return healthy
@@ -0,0 +1,201 @@
+import gzip
+import io
+from typing import Callable, Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from .utils import JSONEncoder
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack опционален
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zstandard опционален
+    zstandard = None
+
+JSON_MEDIA_TYPE = 'application/json'
+MSGPACK_MEDIA_TYPE = 'application/msgpack'
+
+
+def _media_type(header: Optional[str]) -> str:
+    return (header or '').split(';', 1)[0].strip().lower()
+
+
+def _qualities(header: Optional[str]) -> Dict[str, float]:
+    """Значения заголовка Accept/Accept-Encoding и их вес q (по умолчанию 1)"""
+    values = {}
+    for item in (header or '').split(','):
+        value, *params = item.split(';')
+        quality = 1.0
+        for param in params:
+            key, _, number = param.partition('=')
+            if key.strip() == 'q':
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        if value.strip():
+            values[value.strip().lower()] = quality
+    return values
+
+
+def _best(candidates: Tuple[str, ...], qualities: Dict[str, float], default: float = 0.0) -> Tuple[Optional[str], float]:
+    """Кандидат с наибольшим q (при равенстве - раньше в candidates) и его q; q=0 - не принимается"""
+    best, best_quality = None, 0.0
+    for candidate in candidates:
+        quality = qualities.get(candidate, default)
+        if quality > best_quality:
+            best, best_quality = candidate, quality
+    return best, best_quality
+
+
+class BodyTooLargeError(ValueError):
+    """Тело запроса после распаковки больше допустимого"""
+
+
+class Transport:
+    """Согласование формата (JSON/MessagePack) и сжатия (gzip/zstd) тел запросов и ответов"""
+
+    GZIP_LEVEL = 6
+    ZSTD_LEVEL = 3
+    VARY = 'Accept, Accept-Encoding'
+
+    @staticmethod
+    def encodings() -> Tuple[str, ...]:
+        """Поддерживаемые Content-Encoding в порядке предпочтения"""
+        return ('zstd', 'gzip') if zstandard is not None else ('gzip',)
+
+    @staticmethod
+    def media_types() -> Tuple[str, ...]:
+        return (JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE) if msgpack is not None else (JSON_MEDIA_TYPE,)
+
+    @classmethod
+    def decompress(cls, body: bytes, encoding: Optional[str], max_bytes: Optional[int] = None) -> bytes:
+        """Распаковывает тело потоково и не дальше max_bytes (защита от zip-бомб)"""
+        encoding = (encoding or 'identity').strip().lower()
+        if encoding == 'identity':
+            data = body
+        elif encoding == 'gzip':
+            data = gzip.GzipFile(fileobj=io.BytesIO(body)).read(-1 if max_bytes is None else max_bytes + 1)
+        elif encoding == 'zstd' and zstandard is not None:
+            # Размер распакованных данных может отсутствовать в кадре, поэтому потоковая распаковка
+            reader = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(body), read_across_frames=True)
+            data = reader.read(-1 if max_bytes is None else max_bytes + 1)
+        else:
+            raise ValueError(f"Unsupported Content-Encoding: {encoding}")
+        if max_bytes is not None and len(data) > max_bytes:
+            raise BodyTooLargeError(f"Request body exceeds {max_bytes} bytes")
+        return data
+
+    @classmethod
+    def compress(cls, body: bytes, encoding: str) -> bytes:
+        if encoding == 'zstd':
+            return zstandard.ZstdCompressor(level=cls.ZSTD_LEVEL).compress(body)
+        return gzip.compress(body, compresslevel=cls.GZIP_LEVEL, mtime=0)
+
+    @classmethod
+    def negotiate(cls, accept: Optional[str], accept_encoding: Optional[str]) -> Tuple[str, Optional[str]]:
+        """(media type ответа, Content-Encoding или None) по наибольшему q; JSON без сжатия по умолчанию.
+
+        MessagePack выбирается только явно (*/* означает JSON); при равном q предпочтение
+        у MessagePack и zstd как у более компактных.
+        """
+        # Порядок предпочтения при равном q: более компактные представления раньше
+        media_type, _ = _best(tuple(reversed(cls.media_types())), _qualities(accept))
+        qualities = _qualities(accept_encoding)
+        encoding, quality = _best(cls.encodings(), qualities, default=qualities.get('*', 0.0))
+        if encoding is not None and qualities.get('identity', 0.0) > quality:
+            encoding = None
+        return media_type or JSON_MEDIA_TYPE, encoding
+
+    @staticmethod
+    def variant_etag(etag: str, media_type: str, encoding: Optional[str]) -> str:
+        """ETag представления: у MessagePack и сжатых вариантов суффикс к ETag JSON тела"""
+        suffix = ('-mp' if media_type == MSGPACK_MEDIA_TYPE else '') + (f'-{encoding}' if encoding else '')
+        return f'{etag[:-1]}{suffix}"' if suffix else etag
+
+    @classmethod
+    def encode(
+        cls,
+        json_body: bytes,
+        media_type: str,
+        encoding: Optional[str],
+        compress_min_bytes: int
+    ) -> Tuple[bytes, Dict[str, str]]:
+        """Переводит сериализованный JSON ответ в согласованное представление: (тело, заголовки)"""
+        body = json_body
+        if media_type == MSGPACK_MEDIA_TYPE:
+            body = msgpack.packb(JSONEncoder.decode(json_body))
+        headers = {'Vary': cls.VARY}
+        if encoding and len(body) >= compress_min_bytes:
+            body = cls.compress(body, encoding)
+            headers['Content-Encoding'] = encoding
+        return body, headers
+
+
+class TransportRequest(Request):
+    """Запрос с телом в gzip/zstd и/или MessagePack.
+
+    Тело распаковывается по Content-Encoding; MessagePack разбирается в json(),
+    а в заголовках для FastAPI подставляется application/json, чтобы тело
+    валидировалось той же Pydantic моделью. JSON разбирается через orjson.
+    """
+
+    def __init__(self, scope, receive=None, max_body_bytes: Optional[int] = None):
+        self.max_body_bytes = max_body_bytes
+        headers = scope.get('headers', [])
+        content_type = next((value for name, value in headers if name == b'content-type'), b'').decode('latin-1')
+        self.is_msgpack = _media_type(content_type) == MSGPACK_MEDIA_TYPE
+        if self.is_msgpack:
+            scope = {
+                **scope,
+                'headers': [
+                    (name, b'application/json' if name == b'content-type' else value) for name, value in headers
+                ]
+            }
+        super().__init__(scope, receive)
+
+    async def body(self) -> bytes:
+        if not hasattr(self, '_decoded_body'):
+            try:
+                self._decoded_body = Transport.decompress(
+                    await super().body(), self.headers.get('content-encoding'), self.max_body_bytes
+                )
+            except BodyTooLargeError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+        return self._decoded_body
+
+    async def json(self):
+        if not hasattr(self, '_json'):
+            body = await self.body()
+            self._json = msgpack.unpackb(body) if self.is_msgpack else JSONEncoder.decode(body)
+        return self._json
+
+
+class TransportRoute(APIRoute):
+    """Маршрут, принимающий тела в MessagePack и со сжатием gzip/zstd (см. TransportRequest)"""
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            content_type = _media_type(request.headers.get('content-type'))
+            encoding = (request.headers.get('content-encoding') or 'identity').strip().lower()
+            if content_type == MSGPACK_MEDIA_TYPE and msgpack is None:
+                return Response(status_code=415, content=b'{"detail":"MessagePack is not supported"}',
+                                media_type=JSON_MEDIA_TYPE)
+            if encoding != 'identity' and encoding not in Transport.encodings():
+                return Response(status_code=415, content=b'{"detail":"Unsupported Content-Encoding"}',
+                                media_type=JSON_MEDIA_TYPE, headers={'Accept-Encoding': ', '.join(Transport.encodings())})
+            max_body_bytes = request.app.state.container.settings.max_request_body_bytes
+            content_length = request.headers.get('content-length')
+            if content_length and content_length.isdigit() and int(content_length) > max_body_bytes:
+                return Response(status_code=413, content=b'{"detail":"Request body is too large"}',
+                                media_type=JSON_MEDIA_TYPE)
+            return await original_route_handler(TransportRequest(request.scope, request.receive, max_body_bytes))
+
+        return route_handler
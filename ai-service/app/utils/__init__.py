@@ -1,9 +1,23 @@
 from .response_parser import ResponseParser
 from .quality_calculator import QualityCalculator
 from .id_generator import IDGenerator
+from .json_encoder import JSONEncoder
+from .compact_schema import CompactSchema
+from .token_estimator import TokenEstimator
+from .section_splitter import SectionSplitter
+from .text_chunker import TextChunker
+from .chunk_reducer import ChunkReducer
+from .streaming_json_parser import StreamingJSONParser
 
 __all__ = [
     "ResponseParser",
     "QualityCalculator", 
-    "IDGenerator"
+    "IDGenerator",
+    "JSONEncoder",
+    "CompactSchema",
+    "TokenEstimator",
+    "SectionSplitter",
+    "TextChunker",
+    "ChunkReducer",
+    "StreamingJSONParser"
 ]
@@ -0,0 +1,100 @@
+import re
+from typing import Any, Dict, List, Optional
+
+_DEDUPE_PATTERN = re.compile(r'[\s.,;:!]+')
+
+
+class ChunkReducer:
+    """Детерминированное объединение данных, извлеченных из фрагментов одной вакансии.
+
+    Работает с нормализованной структурой (см. JobNormalizer._normalize_ai_data).
+    """
+
+    LIST_GROUPS = ('requirements', 'benefits')
+    VOTED_GROUPS = ('company', 'location')
+    # Значения, которые нормализация подставляет, когда модель ничего не нашла: в голосовании
+    # они не участвуют (иначе фрагменты без сведений перевешивают фрагмент, где значение найдено)
+    # и применяются один раз, если ни один фрагмент не дал другого значения
+    DEFAULTS = {
+        'workType': 'full_time',
+        'experienceLevel': 'middle',
+        'location': {'country': 'Россия'},
+    }
+
+    @staticmethod
+    def _key(value: Any) -> Any:
+        if isinstance(value, str):
+            return _DEDUPE_PATTERN.sub(' ', value.lower()).strip()
+        return value
+
+    @classmethod
+    def vote(cls, values: List[Any], default: Any = None) -> Any:
+        """Самое частое непустое значение, отличное от default; при равенстве - встретившееся первым"""
+        counts: Dict[Any, int] = {}
+        first: Dict[Any, Any] = {}
+        default_key = cls._key(default)
+        for value in values:
+            if value is None or value == '':
+                continue
+            key = cls._key(value)
+            if default is not None and key == default_key:
+                continue
+            counts[key] = counts.get(key, 0) + 1
+            first.setdefault(key, value)
+        if not counts:
+            return default
+        best = max(counts, key=lambda key: counts[key])
+        return first[best]
+
+    @classmethod
+    def union(cls, lists: List[List[str]]) -> List[str]:
+        """Объединение списков с сохранением порядка и удалением дублей"""
+        seen = set()
+        result = []
+        for items in lists:
+            for item in items or []:
+                key = cls._key(item)
+                if key and key not in seen:
+                    seen.add(key)
+                    result.append(item)
+        return result
+
+    @staticmethod
+    def _filled(group: Optional[Dict[str, Any]]) -> int:
+        return sum(1 for value in (group or {}).values() if value not in (None, '', [], False))
+
+    @classmethod
+    def reduce(cls, parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Сводит данные фрагментов в одну структуру"""
+        if len(parts) == 1:
+            return parts[0]
+        reduced: Dict[str, Any] = {}
+
+        for group in cls.VOTED_GROUPS:
+            keys = [key for part in parts for key in (part.get(group) or {})]
+            defaults = cls.DEFAULTS.get(group, {})
+            reduced[group] = {
+                key: cls.vote([(part.get(group) or {}).get(key) for part in parts], defaults.get(key))
+                for key in dict.fromkeys(keys)
+            }
+        if 'remote' in reduced['location']:
+            reduced['location']['remote'] = any((part.get('location') or {}).get('remote') for part in parts)
+
+        # Зарплату берем целиком из самого полного фрагмента, чтобы не смешивать вилки
+        salaries = [part.get('salary') for part in parts]
+        reduced['salary'] = max(salaries, key=cls._filled)
+
+        for group in cls.LIST_GROUPS:
+            keys = [key for part in parts for key in (part.get(group) or {})]
+            reduced[group] = {
+                key: cls.union([(part.get(group) or {}).get(key, []) for part in parts])
+                for key in dict.fromkeys(keys)
+            }
+
+        reduced['shortDescription'] = next((part['shortDescription'] for part in parts if part.get('shortDescription')), None)
+        full = cls.union([[part['fullDescription']] for part in parts if part.get('fullDescription')])
+        reduced['fullDescription'] = ' '.join(full) if full else None
+
+        for key in ('workType', 'experienceLevel'):
+            reduced[key] = cls.vote([part.get(key) for part in parts], cls.DEFAULTS[key])
+        return reduced
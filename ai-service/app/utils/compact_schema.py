@@ -0,0 +1,110 @@
+from typing import Any, Dict, Optional
+
+
+class CompactSchema:
+    """Компактная схема ответа модели с короткими ключами и кодами перечислений.
+
+    Модель пропускает null и пустые списки, decoder разворачивает ответ
+    в привычную структуру (company, shortDescription, ...), которую
+    дальше обрабатывает JobNormalizer._normalize_ai_data.
+    """
+
+    # Короткий ключ -> (полный ключ, вложенные поля)
+    FIELDS = {
+        'c': ('company', {'n': 'name', 'd': 'description', 'w': 'website', 'sz': 'size'}),
+        'sd': ('shortDescription', None),
+        'fd': ('fullDescription', None),
+        's': ('salary', {'mn': 'min', 'mx': 'max', 'cu': 'currency', 'p': 'period', 't': 'type'}),
+        'l': ('location', {'ci': 'city', 'co': 'country', 'a': 'address', 'r': 'remote'}),
+        'r': ('requirements', {
+            'rq': 'required', 'pf': 'preferred', 'te': 'technical',
+            'la': 'languages', 'fw': 'frameworks', 'to': 'tools'
+        }),
+        'b': ('benefits', {'so': 'social', 'bo': 'bonuses', 'co': 'conditions', 'de': 'development'}),
+        'wt': ('workType', None),
+        'el': ('experienceLevel', None),
+    }
+
+    # Коды перечислений: полный ключ поля -> {код: значение}
+    ENUM_CODES = {
+        'workType': {
+            'F': 'full_time', 'P': 'part_time', 'C': 'contract',
+            'I': 'internship', 'R': 'remote', 'H': 'hybrid'
+        },
+        'experienceLevel': {'N': 'no_experience', 'J': 'junior', 'M': 'middle', 'S': 'senior', 'L': 'lead'},
+        'currency': {'R': 'RUB', 'U': 'USD', 'E': 'EUR'},
+        'period': {'m': 'month', 'y': 'year'},
+        'type': {'g': 'до вычета налогов', 'n': 'после вычета налогов'},
+    }
+
+    VERBOSE_KEYS = {full_key for full_key, _ in FIELDS.values()}
+
+    @classmethod
+    def is_compact(cls, data: Any) -> bool:
+        """Похож ли ответ на компактную схему"""
+        if not isinstance(data, dict) or not data:
+            return False
+        if cls.VERBOSE_KEYS & data.keys():
+            return False
+        return bool(cls.FIELDS.keys() & data.keys())
+
+    @classmethod
+    def _decode_enum(cls, full_key: str, value: Any) -> Any:
+        codes = cls.ENUM_CODES.get(full_key)
+        if codes and isinstance(value, str):
+            return codes.get(value, value)
+        return value
+
+    @classmethod
+    def expand(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Разворачивает компактный ответ в полную структуру"""
+        expanded: Dict[str, Any] = {}
+        for short_key, value in data.items():
+            if short_key not in cls.FIELDS:
+                continue
+            full_key, nested = cls.FIELDS[short_key]
+            if nested is None or not isinstance(value, dict):
+                expanded[full_key] = cls._decode_enum(full_key, value)
+                continue
+            expanded[full_key] = {
+                nested[key]: cls._decode_enum(nested[key], item)
+                for key, item in value.items()
+                if key in nested
+            }
+
+        location = expanded.get('location')
+        if isinstance(location, dict) and 'remote' in location:
+            location['remote'] = bool(location['remote'])
+        return expanded
+
+    @classmethod
+    def compress(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Кодирует полную структуру в компактную (для бенчмарков и записанных ответов)"""
+        reverse_enums = {key: {v: k for k, v in codes.items()} for key, codes in cls.ENUM_CODES.items()}
+
+        def encode(full_key: str, value: Any) -> Optional[Any]:
+            if value is None or value == [] or value == '':
+                return None
+            if full_key in reverse_enums and isinstance(value, str):
+                return reverse_enums[full_key].get(value, value)
+            if isinstance(value, bool):
+                return int(value)
+            return value
+
+        compact: Dict[str, Any] = {}
+        for short_key, (full_key, nested) in cls.FIELDS.items():
+            value = data.get(full_key)
+            if nested is None or not isinstance(value, dict):
+                encoded = encode(full_key, value)
+                if encoded is not None:
+                    compact[short_key] = encoded
+                continue
+            reverse_nested = {full: short for short, full in nested.items()}
+            group = {
+                reverse_nested[key]: encode(key, item)
+                for key, item in value.items()
+                if key in reverse_nested and encode(key, item) is not None
+            }
+            if group:
+                compact[short_key] = group
+        return compact
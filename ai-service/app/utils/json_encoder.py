@@ -0,0 +1,43 @@
+import hashlib
+import json
+from typing import Any, Optional
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson опционален
+    orjson = None
+
+
+class JSONEncoder:
+    """Быстрая сериализация ответов в JSON байты"""
+
+    @staticmethod
+    def encode(value: Any) -> bytes:
+        """Сериализует Pydantic модель или обычные данные в UTF-8 JSON"""
+        if isinstance(value, BaseModel):
+            # Сериализатор pydantic-core работает без промежуточного словаря
+            return value.model_dump_json().encode('utf-8')
+        if orjson is not None:
+            return orjson.dumps(value)
+        return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    @staticmethod
+    def decode(body: bytes) -> Any:
+        """Разбирает JSON байты"""
+        if orjson is not None:
+            return orjson.loads(body)
+        return json.loads(body)
+
+    @staticmethod
+    def make_etag(body: bytes) -> str:
+        """Строгий ETag по хэшу содержимого"""
+        return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+    @staticmethod
+    def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+        """Проверяет заголовок If-None-Match против ETag"""
+        if not if_none_match:
+            return False
+        candidates = [candidate.strip() for candidate in if_none_match.split(',')]
+        return '*' in candidates or any(candidate.removeprefix('W/') == etag for candidate in candidates)
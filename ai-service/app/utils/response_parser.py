@@ -1,8 +1,20 @@
 import json
 import re
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from ..exceptions import InvalidResponseError
 
+_CLOSING = {'{': '}', '[': ']'}
+_LITERALS = {'True': 'true', 'False': 'false', 'None': 'null'}
+_COMMENT = r'//[^\n]*|/\*[\s\S]*?\*/'
+# Строки, комментарии, висячие запятые и литералы Python - за один проход regex
+_FIX_PATTERN = re.compile(
+    r'"(?:[^"\\]|\\.)*"'
+    r"|'(?:[^'\\]|\\.)*'"
+    rf'|{_COMMENT}'
+    rf'|,(?=(?:\s|{_COMMENT})*[}}\]])'
+    r'|\b(?:True|False|None)\b'
+)
+
 
 class ResponseParser:
     """Парсер ответов от AI"""
@@ -11,28 +23,109 @@ class ResponseParser:
     def parse_ai_response(response: str) -> Dict[str, Any]:
         """Парсит ответ от AI в JSON"""
         try:
-            cleaned = ResponseParser._clean_response(response)
+            return ResponseParser.parse_strict(response)
+        except InvalidResponseError as e:
+            if not isinstance(e.__cause__, json.JSONDecodeError):
+                raise
+            # Если не удалось исправить, пробуем извлечь частичные данные
+            try:
+                return ResponseParser._extract_partial_data(response)
+            except Exception:
+                raise e
+    
+    @staticmethod
+    def parse_strict(response: str) -> Dict[str, Any]:
+        """Парсит ответ без извлечения частичных данных: InvalidResponseError, если JSON не разобрать"""
+        try:
+            cleaned = ResponseParser.clean_response(response)
             
             # Пробуем найти JSON разными способами
             json_str = ResponseParser._extract_json(cleaned)
             
             if not json_str:
                 raise InvalidResponseError("JSON не найден в ответе")
-            
+
+            # Валидный JSON разбираем как есть
+            try:
+                return json.loads(json_str)
+            except json.JSONDecodeError:
+                pass
+
             # Пытаемся исправить JSON перед парсингом
-            fixed_json = ResponseParser._fix_json(json_str)
-            
-            return json.loads(fixed_json)
+            return json.loads(ResponseParser._fix_json(json_str))
             
         except json.JSONDecodeError as e:
-            # Если не удалось исправить, пробуем извлечь частичные данные
-            try:
-                return ResponseParser._extract_partial_data(response)
-            except Exception:
-                raise InvalidResponseError(f"Ошибка парсинга JSON: {str(e)}")
+            raise InvalidResponseError(f"Ошибка парсинга JSON: {str(e)}") from e
+        except InvalidResponseError:
+            raise
         except Exception as e:
             raise InvalidResponseError(f"Неожиданная ошибка парсинга: {str(e)}")
     
+    @staticmethod
+    def is_truncated(response: str) -> bool:
+        """Оборван ли JSON объект ответа (генерация остановилась внутри объекта)"""
+        start = response.find('{')
+        if start < 0:
+            return False
+        stack, in_string, _ = ResponseParser._scan(response[start:])
+        return bool(stack) or in_string
+    
+    @staticmethod
+    def parse_truncated(response: str) -> Dict[str, Any]:
+        """Разбирает оборванный JSON: отбрасывает незавершенное значение и закрывает скобки"""
+        start = response.find('{')
+        if start < 0:
+            raise InvalidResponseError("JSON не найден в ответе")
+        text = ResponseParser._fix_json(response[start:])
+        _, _, (cut, stack) = ResponseParser._scan(text)
+        closed = text[:cut].rstrip().rstrip(',') + ''.join(_CLOSING[bracket] for bracket in reversed(stack))
+        try:
+            return json.loads(closed)
+        except json.JSONDecodeError as e:
+            raise InvalidResponseError(f"Ошибка парсинга JSON: {str(e)}") from e
+    
+    @staticmethod
+    def stitch(head: str, tail: str, min_overlap: int = 8) -> str:
+        """Склеивает оборванный ответ с продолжением: убирает обрамление и повтор конца ответа"""
+        tail = re.sub(r'^\s*```(?:json)?\s*', '', tail)
+        tail = re.sub(r'\s*```\s*$', '', tail)
+        for size in range(min(len(head), len(tail), 200), min_overlap - 1, -1):
+            if head.endswith(tail[:size]):
+                return head + tail[size:]
+        return head + tail
+    
+    @staticmethod
+    def _scan(text: str) -> Tuple[List[str], bool, Tuple[int, List[str]]]:
+        """Проход по JSON с учетом строк: (открытые скобки, оборван ли внутри строки,
+        последняя позиция после завершенного значения и открытые в ней скобки)"""
+        stack: List[str] = []
+        in_string = False
+        escape = False
+        safe = (0, [])
+        for pos, char in enumerate(text):
+            if in_string:
+                if escape:
+                    escape = False
+                elif char == '\\':
+                    escape = True
+                elif char == '"':
+                    in_string = False
+            elif char == '"':
+                in_string = True
+            elif char in _CLOSING:
+                stack.append(char)
+                if len(stack) == 1:
+                    safe = (pos + 1, list(stack))
+            elif char in '}]':
+                if stack:
+                    stack.pop()
+                safe = (pos + 1, list(stack))
+                if not stack:
+                    break
+            elif char == ',':
+                safe = (pos, list(stack))
+        return stack, in_string, safe
+    
     @staticmethod
     def _extract_json(text: str) -> str:
         """Извлекает JSON из текста разными способами"""
@@ -61,8 +154,8 @@ class ResponseParser:
         return ""
     
     @staticmethod
-    def _clean_response(response: str) -> str:
-        """Очищает ответ от лишних символов"""
+    def clean_response(response: str) -> str:
+        """Очищает ответ от обрамления ```json и лишних пробелов"""
         cleaned = response
         cleaned = re.sub(r'```json\s*', '', cleaned)
         cleaned = re.sub(r'```\s*', '', cleaned)
@@ -73,30 +166,26 @@ class ResponseParser:
     
     @staticmethod
     def _fix_json(json_str: str) -> str:
-        """Пытается исправить распространенные ошибки в JSON"""
-        fixed = json_str
-        
-        # Убираем trailing commas
-        fixed = re.sub(r',\s*}', '}', fixed)
-        fixed = re.sub(r',\s*]', ']', fixed)
-        
-        # Исправляем одинарные кавычки на двойные
-        fixed = re.sub(r"'([^']*)':", r'"\1":', fixed)
-        fixed = re.sub(r":\s*'([^']*)'", r': "\1"', fixed)
-        
-        # Исправляем незакрытые строки
-        fixed = re.sub(r'"([^"]*)\n', r'"\1"', fixed)
-        
-        # Убираем комментарии
-        fixed = re.sub(r'//.*?\n', '\n', fixed)
-        fixed = re.sub(r'/\*.*?\*/', '', fixed, flags=re.DOTALL)
-        
-        # Исправляем boolean значения
-        fixed = re.sub(r'\btrue\b', 'true', fixed)
-        fixed = re.sub(r'\bfalse\b', 'false', fixed)
-        fixed = re.sub(r'\bnull\b', 'null', fixed)
-        
-        return fixed
+        """Пытается исправить распространенные ошибки в JSON.
+
+        Проход учитывает строки, поэтому исправления не затрагивают их содержимое:
+        комментарии и висячие запятые удаляются, строки в одинарных кавычках
+        переводятся в двойные, переводы строк внутри строк экранируются,
+        True/False/None заменяются на true/false/null.
+        """
+        return _FIX_PATTERN.sub(ResponseParser._fix_token, json_str)
+    
+    @staticmethod
+    def _fix_token(match: re.Match) -> str:
+        token = match.group(0)
+        if token[0] == '"':
+            return token.replace('\n', '\\n')
+        if token[0] == "'":
+            inner = re.sub(r'(?<!\\)"', '\\"', token[1:-1].replace("\\'", "'"))
+            return '"' + inner.replace('\n', '\\n') + '"'
+        if token[0] in '/,':
+            return ''
+        return _LITERALS[token]
     
     @staticmethod
     def _extract_partial_data(response: str) -> Dict[str, Any]:
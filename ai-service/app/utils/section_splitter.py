@@ -0,0 +1,115 @@
+import hashlib
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+_BLOCK_TAG_PATTERN = re.compile(r'<\s*(br\s*/?|/p|/li|/h[1-6]|/div|/ul|/ol|/tr)\s*>', re.IGNORECASE)
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_SPACES_PATTERN = re.compile(r'\s+')
+
+
+class SectionSplitter:
+    """Разбивка описания вакансии на смысловые разделы по заголовкам"""
+
+    # Вид раздела -> начала заголовков (в нижнем регистре)
+    SECTION_KEYWORDS = {
+        'salary': ('зарплата', 'заработная плата', 'оплата труда', 'доход', 'вознаграждение'),
+        'company': ('о компании', 'компания', 'о нас', 'кто мы', 'о проекте'),
+        'responsibilities': (
+            'обязанности', 'задачи', 'чем предстоит заниматься', 'что нужно делать',
+            'чем заниматься', 'что делать', 'функционал'
+        ),
+        'requirements': (
+            'требования', 'мы ожидаем', 'ожидаем', 'что мы ждем', 'что мы ждём', 'будет плюсом',
+            'навыки', 'стек', 'технологии', 'наш стек', 'ключевые навыки'
+        ),
+        'conditions': (
+            'условия', 'мы предлагаем', 'что мы предлагаем', 'предлагаем', 'преимущества',
+            'бонусы', 'льготы', 'плюшки'
+        ),
+        'location': ('адрес', 'локация', 'город', 'место работы', 'формат работы', 'офис'),
+    }
+
+    # Раздел до первого заголовка и разделы с нераспознанными заголовками
+    INTRO = 'intro'
+    OTHER = 'other'
+
+    MAX_HEADING_LENGTH = 60
+    MAX_HEADING_WORDS = 5
+
+    @staticmethod
+    def to_lines(description: str) -> List[str]:
+        """Переводит HTML/текст описания в непустые строки"""
+        text = _BLOCK_TAG_PATTERN.sub('\n', description)
+        text = _TAG_PATTERN.sub(' ', text)
+        lines = []
+        for line in text.splitlines():
+            line = _SPACES_PATTERN.sub(' ', line).strip()
+            if line:
+                lines.append(line)
+        return lines
+
+    @classmethod
+    def classify(cls, heading: str) -> Optional[str]:
+        """Определяет вид раздела по заголовку"""
+        heading = heading.lower().strip(' :-—•*#')
+        for kind, prefixes in cls.SECTION_KEYWORDS.items():
+            if heading.startswith(prefixes):
+                return kind
+        return None
+
+    @classmethod
+    def _parse_heading(cls, line: str) -> Optional[Tuple[str, str]]:
+        """Возвращает (вид раздела, текст после заголовка), если строка - заголовок"""
+        head, sep, rest = line.partition(':')
+        if sep and len(head) <= cls.MAX_HEADING_LENGTH and len(head.split()) <= cls.MAX_HEADING_WORDS:
+            kind = cls.classify(head)
+            if kind:
+                return kind, rest.strip()
+            if not rest.strip():
+                return cls.OTHER, ''
+        if len(line) <= cls.MAX_HEADING_LENGTH and len(line.split()) <= cls.MAX_HEADING_WORDS:
+            kind = cls.classify(line)
+            if kind and line.lower().strip(' :-—•*#') in cls.SECTION_KEYWORDS[kind]:
+                return kind, ''
+        return None
+
+    @classmethod
+    def iter_sections(cls, description: str) -> Iterator[Tuple[str, Optional[str], List[str]]]:
+        """Разделы в порядке следования: (вид раздела, строка заголовка, строки текста)"""
+        kind, heading, lines = cls.INTRO, None, []
+        for line in cls.to_lines(description):
+            parsed = cls._parse_heading(line)
+            if parsed is None:
+                lines.append(line)
+                continue
+            if heading is not None or lines:
+                yield kind, heading, lines
+            kind, rest = parsed
+            heading, lines = line, []
+        if heading is not None or lines:
+            yield kind, heading, lines
+
+    @classmethod
+    def split(cls, description: str) -> Dict[str, str]:
+        """Разбивает описание на разделы: вид раздела -> текст (одноименные разделы склеиваются)"""
+        sections: Dict[str, List[str]] = {}
+        for kind, heading, lines in cls.iter_sections(description):
+            section = sections.setdefault(kind, [])
+            _, inline = cls._parse_heading(heading) if heading else (kind, '')
+            if inline:
+                section.append(inline)
+            section.extend(lines)
+        return {name: '\n'.join(lines) for name, lines in sections.items()}
+
+    @staticmethod
+    def fingerprint(sections: Dict[str, str]) -> Dict[str, str]:
+        """Хэши разделов для сравнения версий (без учета регистра и пробелов)"""
+        return {
+            name: hashlib.sha1(_SPACES_PATTERN.sub(' ', text).strip().lower().encode()).hexdigest()
+            for name, text in sections.items()
+        }
+
+    @staticmethod
+    def changed_sections(old: Dict[str, str], new: Dict[str, str]) -> List[str]:
+        """Разделы, которые добавлены, удалены или изменены (по отпечаткам)"""
+        return sorted(name for name in old.keys() | new.keys() if old.get(name) != new.get(name))
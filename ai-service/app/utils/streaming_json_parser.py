@@ -0,0 +1,108 @@
+import json
+from typing import Any, List, Optional, Tuple
+
+
+class StreamingJSONParser:
+    """Инкрементальный разбор JSON объекта, который модель генерирует по кусочкам.
+
+    feed() принимает очередной фрагмент текста и возвращает ключи верхнего уровня,
+    значения которых уже полностью сгенерированы. Текст до первой "{" (например,
+    обрамление ```json) пропускается. Значение, которое не разбирается как JSON,
+    не возвращается - его восстановит полный разбор ответа.
+    """
+
+    def __init__(self):
+        self._buffer = ''
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # key, key_string, colon, value, in_value, comma, done
+        self._expect = 'start'
+        self._key: Optional[str] = None
+        self._key_start = 0
+        self._value_start = 0
+        self._value_is_string = False
+
+    @property
+    def done(self) -> bool:
+        return self._expect == 'done'
+
+    def _complete(self, end: int, completed: List[Tuple[str, Any]]) -> None:
+        text = self._buffer[self._value_start:end].strip()
+        try:
+            completed.append((self._key, json.loads(text)))
+        except (json.JSONDecodeError, TypeError):
+            pass
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """Добавляет фрагмент и возвращает завершенные пары (ключ, значение)"""
+        self._buffer += text
+        completed: List[Tuple[str, Any]] = []
+        buffer = self._buffer
+        while self._pos < len(buffer) and self._expect != 'done':
+            pos = self._pos
+            char = buffer[pos]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == 'key_string':
+                        try:
+                            self._key = json.loads(buffer[self._key_start:pos + 1])
+                        except json.JSONDecodeError:
+                            self._key = None
+                        self._expect = 'colon'
+                    elif self._depth == 1 and self._expect == 'in_value' and self._value_is_string:
+                        self._complete(pos + 1, completed)
+                        self._expect = 'comma'
+                continue
+
+            if self._expect == 'start':
+                if char == '{':
+                    self._depth = 1
+                    self._expect = 'key'
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == 'key':
+                    self._key_start = pos
+                    self._expect = 'key_string'
+                elif self._depth == 1 and self._expect == 'value':
+                    self._value_start = pos
+                    self._value_is_string = True
+                    self._expect = 'in_value'
+            elif char in '{[':
+                if self._depth == 1 and self._expect == 'value':
+                    self._value_start = pos
+                    self._value_is_string = False
+                    self._expect = 'in_value'
+                self._depth += 1
+            elif char in '}]':
+                self._depth -= 1
+                if self._depth == 1 and self._expect == 'in_value':
+                    self._complete(pos + 1, completed)
+                    self._expect = 'comma'
+                elif self._depth == 0:
+                    if self._expect == 'in_value':
+                        self._complete(pos, completed)
+                    self._expect = 'done'
+            elif self._depth == 1:
+                if char == ':' and self._expect == 'colon':
+                    self._expect = 'value'
+                elif char == ',':
+                    if self._expect == 'in_value':
+                        self._complete(pos, completed)
+                    self._expect = 'key'
+                elif self._expect == 'value' and not char.isspace():
+                    # Число, true/false/null
+                    self._value_start = pos
+                    self._value_is_string = False
+                    self._expect = 'in_value'
+        return [(key, value) for key, value in completed if key is not None]
@@ -0,0 +1,94 @@
+import re
+from typing import Iterable, List
+from .section_splitter import SectionSplitter
+from .token_estimator import TokenEstimator
+
+_SENTENCE_PATTERN = re.compile(r'(?<=[.!?…;])\s+')
+
+
+class TextChunker:
+    """Разбивка длинного описания на фрагменты по границам разделов"""
+
+    @classmethod
+    def split(cls, description: str, max_tokens: int) -> List[str]:
+        """Собирает разделы во фрагменты не длиннее max_tokens.
+
+        Длинный раздел режется по строкам, длинная строка - по предложениям,
+        длинное предложение - по словам.
+        """
+        chunks: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+
+        def flush() -> None:
+            nonlocal current, current_tokens
+            if current:
+                chunks.append('\n'.join(current))
+            current, current_tokens = [], 0
+
+        def fits(tokens: int) -> bool:
+            # Перевод строки между частями фрагмента - тоже токен
+            return current_tokens + tokens + (1 if current else 0) <= max_tokens
+
+        def add(parts: List[str], tokens: int) -> None:
+            nonlocal current_tokens
+            current_tokens += tokens + (1 if current else 0)
+            current.extend(parts)
+
+        for _, heading, lines in SectionSplitter.iter_sections(description):
+            section = ([heading] if heading else []) + lines
+            section_tokens = TokenEstimator.estimate('\n'.join(section))
+            if current and not fits(section_tokens):
+                flush()
+            if section_tokens <= max_tokens:
+                add(section, section_tokens)
+                continue
+
+            # Раздел не помещается целиком: режем по строкам, повторяя заголовок в каждом фрагменте
+            heading_tokens = TokenEstimator.estimate(heading) + 1 if heading else 0
+            for line in lines:
+                for piece in cls._split_line(line, max(max_tokens - heading_tokens, 1)):
+                    piece_tokens = TokenEstimator.estimate(piece)
+                    if current and not fits(piece_tokens):
+                        flush()
+                    if not current and heading:
+                        add([heading], heading_tokens - 1)
+                    add([piece], piece_tokens)
+        flush()
+        return chunks
+
+    @classmethod
+    def _split_line(cls, line: str, max_tokens: int) -> List[str]:
+        """Режет строку длиннее max_tokens по предложениям, а слишком длинные предложения - по словам"""
+        if TokenEstimator.estimate(line) <= max_tokens:
+            return [line]
+        pieces: List[str] = []
+        for sentence in _SENTENCE_PATTERN.split(line.strip()):
+            if TokenEstimator.estimate(sentence) <= max_tokens:
+                pieces.append(sentence)
+                continue
+            for word in sentence.split():
+                if TokenEstimator.estimate(word) <= max_tokens:
+                    pieces.append(word)
+                else:
+                    # Слово без пробелов (ссылка, base64): 2 символа - не меньше токена
+                    size = max_tokens * 2
+                    pieces.extend(word[start:start + size] for start in range(0, len(word), size))
+        return cls._pack(pieces, max_tokens)
+
+    @staticmethod
+    def _pack(pieces: Iterable[str], max_tokens: int) -> List[str]:
+        """Склеивает части через пробел в строки не длиннее max_tokens"""
+        packed: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+        for piece in pieces:
+            piece_tokens = TokenEstimator.estimate(piece)
+            if current and current_tokens + piece_tokens > max_tokens:
+                packed.append(' '.join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += piece_tokens
+        if current:
+            packed.append(' '.join(current))
+        return packed
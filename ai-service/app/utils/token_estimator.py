@@ -0,0 +1,28 @@
+import math
+import re
+
+# Слова, одиночные знаки пунктуации и переносы строк с отступом (токенизатор склеивает их в один токен)
+_TOKEN_PATTERN = re.compile(r'\w+|[^\w\s]|[ \t]*\n\s*')
+
+
+class TokenEstimator:
+    """Грубая оценка числа токенов без загрузки токенизатора модели"""
+
+    # Средняя длина токена в символах: латиница кодируется плотнее кириллицы
+    ASCII_CHARS_PER_TOKEN = 4.0
+    NON_ASCII_CHARS_PER_TOKEN = 2.5
+
+    @classmethod
+    def estimate(cls, text: str) -> int:
+        """Оценивает число токенов в тексте"""
+        if not text:
+            return 0
+        tokens = 0
+        for piece in _TOKEN_PATTERN.findall(text):
+            if piece.isspace() or (not piece[0].isalnum() and piece[0] != '_'):
+                tokens += 1
+            elif piece.isascii():
+                tokens += math.ceil(len(piece) / cls.ASCII_CHARS_PER_TOKEN)
+            else:
+                tokens += math.ceil(len(piece) / cls.NON_ASCII_CHARS_PER_TOKEN)
+        return tokens
@@ -0,0 +1,151 @@
+"""
+Бенчмарк памяти на одну запись кэша ответов и хранилища ревизий.
+
+Сравниваются две схемы хранения на одинаковых вакансиях из корпуса:
+  legacy  - прежняя схема: словарь с datetime сроком вокруг {'body', 'etag', 'fields'},
+            hex ключ; ревизия - словарь с Pydantic NormalizeResponse
+  compact - MemoryCache/RevisionStore: слотовые записи, monotonic срок, сжатое тело
+
+Память считается через tracemalloc по приросту после заполнения N записей,
+время - медиана get/set на запись.
+
+Запуск из директории ai-service:
+    python -m benchmarks.cache_benchmark
+    python -m benchmarks.cache_benchmark --entries 20000
+"""
+import argparse
+import hashlib
+import sys
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from app.cache import MemoryCache, RevisionStore
+from app.models import NormalizeResponse
+from app.services.job_normalizer import JobNormalizer
+from app.utils import ResponseParser, JSONEncoder, SectionSplitter
+
+from .common import load_corpus, time_call
+
+GIB = 1024 ** 3
+
+
+def build_responses() -> List[NormalizeResponse]:
+    """Нормализованные ответы из корпуса ответов модели"""
+    normalizer = JobNormalizer(ollama_client=None, prompt_template='', payload_sample_rate=0)
+    responses = []
+    for doc in load_corpus():
+        ai_data = normalizer._normalize_ai_data(ResponseParser.parse_ai_response(doc['response']))
+        responses.append(normalizer._create_normalized_response(
+            title=doc['title'],
+            description=doc['description'],
+            ai_data=ai_data,
+            source_name='benchmark',
+            original_url='https://example.com/vacancy/0'
+        ))
+    return responses
+
+
+def measure_bytes(fill: Callable[[], Any]) -> int:
+    """Прирост памяти (байт), который остается после fill()"""
+    tracemalloc.start()
+    try:
+        start, _ = tracemalloc.get_traced_memory()
+        kept = fill()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return current - start
+
+
+def fill_legacy_cache(encoded: List[Dict[str, Any]], entries: int) -> Dict[str, Dict[str, Any]]:
+    cache = {}
+    for i in range(entries):
+        key = hashlib.md5(f"v1|job-{i}|".encode()).hexdigest()
+        # Тело копируется, как при сериализации каждого ответа
+        value = dict(encoded[i % len(encoded)], body=bytes(bytearray(encoded[i % len(encoded)]['body'])))
+        cache[key] = {'value': value, 'expires_at': datetime.now() + timedelta(seconds=3600)}
+    return cache
+
+
+def fill_compact_cache(encoded: List[Dict[str, Any]], entries: int) -> MemoryCache:
+    cache = MemoryCache()
+    for i in range(entries):
+        value = dict(encoded[i % len(encoded)], body=bytes(bytearray(encoded[i % len(encoded)]['body'])))
+        cache.set(f"job-{i}", '', value, 'v1')
+    return cache
+
+
+def fill_legacy_revisions(responses: List[NormalizeResponse], sections: Dict[str, str], entries: int) -> Dict[str, Any]:
+    revisions = {}
+    for i in range(entries):
+        revisions[f"https://example.com/vacancy/{i}"] = {
+            'title': f"job-{i}",
+            'sections': dict(sections),
+            'result': responses[i % len(responses)].model_copy(deep=True),
+            'fields': None,
+            'prompt_version': 'v1'
+        }
+    return revisions
+
+
+def fill_compact_revisions(responses: List[NormalizeResponse], sections: Dict[str, str], entries: int) -> RevisionStore:
+    store = RevisionStore(max_entries=entries)
+    for i in range(entries):
+        store.set(
+            f"https://example.com/vacancy/{i}", f"job-{i}", dict(sections),
+            JSONEncoder.encode(responses[i % len(responses)]), None, 'v1'
+        )
+    return store
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк памяти записей кэша и ревизий')
+    parser.add_argument('--entries', type=int, default=5000, help='Записей в каждом замере')
+    parser.add_argument('--iterations', type=int, default=2000, help='Вызовов get/set на замер времени')
+    args = parser.parse_args()
+
+    responses = build_responses()
+    encoded = [
+        {'body': body, 'etag': JSONEncoder.make_etag(body), 'fields': None}
+        for body in (JSONEncoder.encode(response) for response in responses)
+    ]
+    sections = SectionSplitter.fingerprint(SectionSplitter.split(load_corpus()[0]['description']))
+    mean_body = sum(len(value['body']) for value in encoded) / len(encoded)
+    print(f"{len(responses)} ответов корпуса, среднее тело {mean_body:.0f} байт, {args.entries} записей на замер\n")
+
+    rows = {
+        'cache legacy': measure_bytes(lambda: fill_legacy_cache(encoded, args.entries)),
+        'cache compact': measure_bytes(lambda: fill_compact_cache(encoded, args.entries)),
+        'revision legacy': measure_bytes(lambda: fill_legacy_revisions(responses, sections, args.entries)),
+        'revision compact': measure_bytes(lambda: fill_compact_revisions(responses, sections, args.entries)),
+    }
+    print(f"{'store':<20}{'bytes / entry':>15}{'entries / GiB':>16}")
+    for name, total in rows.items():
+        per_entry = total / args.entries
+        print(f"{name:<20}{per_entry:>15.0f}{GIB / per_entry:>16,.0f}")
+
+    cache = fill_compact_cache(encoded, len(encoded))
+    store = fill_compact_revisions(responses, sections, len(responses))
+    value = encoded[0]
+    timings = {
+        'cache set': time_call(lambda: cache.set('job-0', '', value, 'v1'), args.iterations),
+        'cache get': time_call(lambda: cache.get('job-0', '', 'v1'), args.iterations),
+        'revision get+decode': time_call(
+            lambda: NormalizeResponse(**JSONEncoder.decode(store.get('https://example.com/vacancy/0')['body'])),
+            args.iterations
+        ),
+    }
+    print()
+    for name, microseconds in timings.items():
+        print(f"{name:<20}{microseconds:>12.1f} µs")
+
+    cache_gain = rows['cache legacy'] / rows['cache compact']
+    revision_gain = rows['revision legacy'] / rows['revision compact']
+    print(f"\nЗаписей на тот же объем памяти: кэш x{cache_gain:.1f}, ревизии x{revision_gain:.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
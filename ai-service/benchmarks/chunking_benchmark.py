@@ -0,0 +1,107 @@
+"""
+Бенчмарк задержки нормализации длинных описаний: один промпт против фрагментов.
+
+Модель имитируется клиентом, время ответа которого растет с длиной промпта
+(prefill: линейная часть и квадратичная часть внимания, которая сравнивается
+с линейной на --attention-tokens токенах) и фиксированным числом выходных
+токенов (decode). Каждый фрагмент повторяет весь промпт, поэтому выигрыш
+появляется только на длинных описаниях. Сервер Ollama
+обрабатывает фрагменты параллельно только при OLLAMA_NUM_PARALLEL > 1,
+поэтому --server-parallel задает число одновременно обслуживаемых запросов.
+
+Запуск из директории ai-service:
+    python -m benchmarks.chunking_benchmark
+    python -m benchmarks.chunking_benchmark --prompt-version v2 --server-parallel 2
+"""
+import argparse
+import asyncio
+import json
+import sys
+import threading
+import time
+
+from app.prompts import PromptManager
+from app.services.job_normalizer import JobNormalizer
+from app.utils import TokenEstimator
+
+
+class SimulatedClient:
+    """Клиент с задержкой, пропорциональной числу токенов промпта"""
+
+    def __init__(
+        self,
+        prefill_ms: float,
+        attention_tokens: int,
+        decode_ms: float,
+        output_tokens: int,
+        server_parallel: int
+    ):
+        self.prefill_ms = prefill_ms
+        self.attention_tokens = attention_tokens
+        self.decode_ms = decode_ms
+        self.output_tokens = output_tokens
+        self.slots = threading.Semaphore(server_parallel)
+
+    def generate(self, prompt: str, options=None) -> dict:
+        with self.slots:
+            tokens = TokenEstimator.estimate(prompt)
+            prefill = tokens * self.prefill_ms * (1 + tokens / self.attention_tokens)
+            time.sleep((prefill + self.output_tokens * self.decode_ms) / 1000)
+        response = json.dumps({'company': {'name': 'Company'}, 'requirements': {'required': ['Python']}})
+        return {'response': response, 'eval_count': self.output_tokens}
+
+    def generate_response(self, prompt: str, options=None) -> str:
+        return self.generate(prompt, options)['response']
+
+
+def make_description(sections: int, lines_per_section: int = 30) -> str:
+    parts = ["Компания: Company"]
+    for i in range(sections):
+        parts.append("Обязанности:")
+        parts.extend(
+            f"- Разрабатывать и поддерживать сервис {i}-{j} на Python, PostgreSQL и Kubernetes"
+            for j in range(lines_per_section)
+        )
+    return '\n'.join(parts)
+
+
+def run(normalizer: JobNormalizer, description: str) -> float:
+    start = time.perf_counter()
+    asyncio.run(normalizer.normalize_job('Python developer', description))
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк нормализации длинных описаний')
+    parser.add_argument('--prefill-ms', type=float, default=0.1, help='Имитируемое время prefill на токен, ms')
+    parser.add_argument('--attention-tokens', type=int, default=8000,
+                        help='Длина промпта, на которой квадратичная часть prefill равна линейной')
+    parser.add_argument('--decode-ms', type=float, default=0.5, help='Имитируемое время decode на токен, ms')
+    parser.add_argument('--output-tokens', type=int, default=200, help='Выходных токенов на ответ')
+    parser.add_argument('--server-parallel', type=int, default=4, help='Параллельных запросов на сервере')
+    parser.add_argument('--chunk-tokens', type=int, default=1500, help='Размер фрагмента в токенах')
+    parser.add_argument('--prompt-version', default='v1', help='Версия промпта')
+    args = parser.parse_args()
+
+    client = SimulatedClient(
+        args.prefill_ms, args.attention_tokens, args.decode_ms, args.output_tokens, args.server_parallel
+    )
+    prompt = PromptManager.get_prompt(args.prompt_version)
+    single = JobNormalizer(client, prompt, payload_sample_rate=0, chunk_threshold_tokens=10 ** 9)
+    chunked = JobNormalizer(
+        client, prompt, payload_sample_rate=0,
+        chunk_threshold_tokens=args.chunk_tokens, chunk_max_tokens=args.chunk_tokens,
+        chunk_concurrency=args.server_parallel
+    )
+
+    print(f"{'sections':>9}{'tokens':>9}{'single, s':>12}{'chunked, s':>12}{'chunks':>8}")
+    for sections in (1, 4, 8, 16, 32):
+        description = make_description(sections)
+        chunks = len(chunked._split_description(description))
+        print(f"{sections:>9}{TokenEstimator.estimate(description):>9}"
+              f"{run(single, description):>12.2f}{run(chunked, description):>12.2f}{chunks:>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
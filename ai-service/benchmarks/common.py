@@ -0,0 +1,50 @@
+import json
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCHMARKS_DIR, 'corpus')
+BASELINES_DIR = os.path.join(BENCHMARKS_DIR, 'baselines')
+
+
+def load_jsonl(path: str) -> List[Dict[str, Any]]:
+    """Читает JSONL файл в список словарей"""
+    with open(path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_corpus(name: str = 'model_outputs.jsonl') -> List[Dict[str, Any]]:
+    """Загружает корпус реальных ответов модели"""
+    return load_jsonl(os.path.join(CORPUS_DIR, name))
+
+
+def load_baseline(name: str) -> Dict[str, Any]:
+    """Загружает сохраненный baseline бенчмарка"""
+    path = os.path.join(BASELINES_DIR, name)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(name: str, data: Dict[str, Any]) -> str:
+    """Сохраняет baseline бенчмарка"""
+    os.makedirs(BASELINES_DIR, exist_ok=True)
+    path = os.path.join(BASELINES_DIR, name)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write('\n')
+    return path
+
+
+def time_call(func: Callable[[], Any], iterations: int, repeats: int = 5) -> float:
+    """Возвращает медианное время одного вызова в микросекундах"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(iterations):
+            func()
+        samples.append((time.perf_counter_ns() - start) / iterations / 1000)
+    return statistics.median(samples)
@@ -0,0 +1,216 @@
+"""
+Оффлайн оценка качества и стоимости нормализации для комбинаций модели и версии промпта.
+
+Размеченный набор вакансий лежит в benchmarks/eval/vacancies.jsonl (поле gold содержит
+эталонные значения по точечным путям вида "salary.min"). Для каждой пары модель/промпт
+считаются точность по полям, QualityCalculator score, токены промпта и генерации и время.
+
+Запуск из директории ai-service:
+    python -m benchmarks.evaluate --stub                                   # записанные ответы
+    python -m benchmarks.evaluate --models llama3.2:latest qwen2.5:7b --prompts v1
+    python -m benchmarks.evaluate --models qwen2.5:7b --record             # живой Ollama + запись ответов
+    python -m benchmarks.evaluate --stub --quality-bar 0.85 --json eval.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config.settings import settings
+from app.prompts import PromptManager
+from app.services import OllamaClient, JobNormalizer
+
+from .common import BENCHMARKS_DIR, load_jsonl
+from .recorded_client import RecordedOllamaClient, InstrumentedClient, append_recording
+
+EVAL_DIR = os.path.join(BENCHMARKS_DIR, 'eval')
+DEFAULT_DATASET = os.path.join(EVAL_DIR, 'vacancies.jsonl')
+DEFAULT_RECORDINGS = os.path.join(EVAL_DIR, 'recordings.jsonl')
+
+
+def get_path(data: Dict[str, Any], path: str) -> Any:
+    """Достает значение по точечному пути, например salary.min"""
+    value: Any = data
+    for part in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def field_accuracy(predicted: Any, gold: Any) -> float:
+    """Точность поля: точное совпадение для скаляров, F1 для списков"""
+    if isinstance(gold, list):
+        predicted_set = {str(item).strip().lower() for item in predicted or []}
+        gold_set = {str(item).strip().lower() for item in gold}
+        if not predicted_set and not gold_set:
+            return 1.0
+        overlap = len(predicted_set & gold_set)
+        if not overlap:
+            return 0.0
+        precision = overlap / len(predicted_set)
+        recall = overlap / len(gold_set)
+        return 2 * precision * recall / (precision + recall)
+
+    if isinstance(gold, str) and isinstance(predicted, str):
+        return float(predicted.strip().lower() == gold.strip().lower())
+    return float(predicted == gold)
+
+
+async def evaluate_config(
+    model: str,
+    prompt_version: str,
+    cases: List[Dict[str, Any]],
+    use_stub: bool,
+    recordings_path: str,
+    record: bool
+) -> Optional[Dict[str, Any]]:
+    """Прогоняет набор вакансий через одну пару модель/промпт"""
+    if use_stub:
+        base_client = RecordedOllamaClient(model, prompt_version, recordings_path)
+        if not base_client.has_recordings():
+            print(f"⚠️  Нет записей для {model} / {prompt_version}, пропускаем", file=sys.stderr)
+            return None
+    else:
+        base_client = OllamaClient(model=model)
+
+    client = InstrumentedClient(base_client)
+    normalizer = JobNormalizer(client, PromptManager.get_prompt(prompt_version), prompt_version=prompt_version)
+
+    per_case = []
+    for case in cases:
+        client.reset()
+        if use_stub:
+            base_client.current_case = case['id']
+
+        start = time.perf_counter()
+        try:
+            result = await normalizer.normalize_job(title=case['title'], description=case['description'])
+        except Exception as e:
+            per_case.append({'id': case['id'], 'error': str(e)})
+            continue
+        wall_seconds = time.perf_counter() - start
+
+        if record and not use_stub:
+            for call in client.calls:
+                append_recording(recordings_path, model, prompt_version, case['id'], call)
+
+        data = result.model_dump(mode='json')
+        per_case.append({
+            'id': case['id'],
+            'fields': {path: field_accuracy(get_path(data, path), gold) for path, gold in case['gold'].items()},
+            'quality_score': result.quality_score,
+            'prompt_tokens': sum(call['prompt_eval_count'] for call in client.calls),
+            'eval_tokens': sum(call['eval_count'] for call in client.calls),
+            'model_seconds': sum(call['total_duration'] for call in client.calls) / 1e9,
+            'wall_seconds': wall_seconds
+        })
+
+    succeeded = [c for c in per_case if 'error' not in c]
+    field_names = sorted({name for c in succeeded for name in c['fields']})
+    per_field = {
+        name: statistics.mean(c['fields'][name] for c in succeeded if name in c['fields'])
+        for name in field_names
+    }
+
+    def mean(key: str) -> float:
+        return statistics.mean(c[key] for c in succeeded) if succeeded else 0.0
+
+    return {
+        'model': model,
+        'prompt_version': prompt_version,
+        'cases': len(cases),
+        'errors': len(per_case) - len(succeeded),
+        'accuracy': statistics.mean(per_field.values()) if per_field else 0.0,
+        'per_field_accuracy': per_field,
+        'quality_score': mean('quality_score'),
+        'prompt_tokens': mean('prompt_tokens'),
+        'eval_tokens': mean('eval_tokens'),
+        'model_seconds': mean('model_seconds'),
+        'wall_seconds': mean('wall_seconds'),
+        'per_case': per_case
+    }
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    """Печатает сравнительную таблицу конфигураций"""
+    header = (f"{'model':<22}{'prompt':<8}{'ok/n':>7}{'accuracy':>10}{'quality':>9}"
+              f"{'prompt tok':>12}{'eval tok':>10}{'model s':>9}{'wall s':>9}")
+    print(header)
+    print('-' * len(header))
+    for r in results:
+        print(f"{r['model']:<22}{r['prompt_version']:<8}{r['cases'] - r['errors']:>3}/{r['cases']:<3}"
+              f"{r['accuracy']:>10.3f}{r['quality_score']:>9.1f}{r['prompt_tokens']:>12.0f}"
+              f"{r['eval_tokens']:>10.0f}{r['model_seconds']:>9.2f}{r['wall_seconds']:>9.2f}")
+
+    fields = sorted({name for r in results for name in r['per_field_accuracy']})
+    if fields:
+        print()
+        print(f"{'field':<26}" + ''.join(f"{r['model'][:14] + '/' + r['prompt_version']:>20}" for r in results))
+        for name in fields:
+            print(f"{name:<26}" + ''.join(f"{r['per_field_accuracy'].get(name, 0.0):>20.3f}" for r in results))
+
+
+def pick_cheapest(results: List[Dict[str, Any]], quality_bar: float) -> Optional[Dict[str, Any]]:
+    """Выбирает самую дешевую по времени модели конфигурацию, проходящую планку точности"""
+    passing = [r for r in results if r['errors'] == 0 and r['accuracy'] >= quality_bar]
+    if not passing:
+        return None
+    return min(passing, key=lambda r: (r['model_seconds'] or r['wall_seconds'], r['eval_tokens']))
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    cases = load_jsonl(args.dataset)
+    results = []
+    for model in args.models:
+        for prompt_version in args.prompts:
+            result = await evaluate_config(model, prompt_version, cases, args.stub, args.recordings, args.record)
+            if result:
+                results.append(result)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Оценка качества и latency по моделям и версиям промптов')
+    parser.add_argument('--models', nargs='+', default=[settings.ollama_model], help='Модели Ollama')
+    parser.add_argument('--prompts', nargs='+', default=PromptManager.get_available_versions(), help='Версии промптов')
+    parser.add_argument('--dataset', default=DEFAULT_DATASET, help='Размеченный набор вакансий (JSONL)')
+    parser.add_argument('--stub', action='store_true', help='Использовать записанные ответы вместо Ollama')
+    parser.add_argument('--recordings', default=DEFAULT_RECORDINGS, help='Файл записанных ответов')
+    parser.add_argument('--record', action='store_true', help='Дописывать ответы живой модели в файл записей')
+    parser.add_argument('--quality-bar', type=float, default=0.8, help='Минимальная средняя точность по полям')
+    parser.add_argument('--json', dest='json_path', help='Сохранить результаты в JSON файл')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    results = asyncio.run(run(args))
+    if not results:
+        print("Нет результатов для сравнения")
+        return 1
+
+    print_table(results)
+
+    cheapest = pick_cheapest(results, args.quality_bar)
+    print()
+    if cheapest:
+        print(f"✅ Самая дешевая конфигурация с точностью >= {args.quality_bar}: "
+              f"{cheapest['model']} / {cheapest['prompt_version']}")
+    else:
+        print(f"❌ Ни одна конфигурация не достигает точности {args.quality_bar}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"💾 Результаты сохранены: {args.json_path}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
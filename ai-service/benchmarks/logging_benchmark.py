@@ -0,0 +1,112 @@
+"""
+Бенчмарк накладных расходов логирования на один запрос нормализации.
+
+Сравниваются две конфигурации на одинаковой последовательности записей:
+  sync   - прежняя схема: синхронный FileHandler и json.dumps(indent=2) payload на каждый запрос
+  queued - QueueHandler с фоновой записью JSON строк и payload только для доли запросов
+
+Замеряется время в вызывающем потоке (именно оно блокирует event loop).
+
+Запуск из директории ai-service:
+    python -m benchmarks.logging_benchmark
+    python -m benchmarks.logging_benchmark --requests 2000 --sample-rate 0.05
+"""
+import argparse
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from app.logging_config import JsonFormatter
+from app.services.job_normalizer import JobNormalizer
+from app.utils import ResponseParser
+
+from .common import load_corpus
+
+
+def build_payloads() -> List[Dict[str, Any]]:
+    """Нормализованные payload из корпуса ответов модели"""
+    normalizer = JobNormalizer(ollama_client=None, prompt_template='', payload_sample_rate=0)
+    return [
+        normalizer._normalize_ai_data(ResponseParser.parse_ai_response(doc['response']))
+        for doc in load_corpus()
+    ]
+
+
+def simulate_sync(logger: logging.Logger, payloads: List[Dict[str, Any]], requests: int) -> float:
+    """Прежний путь: форматирование payload и запись на диск в вызывающем потоке"""
+    start = time.perf_counter()
+    for i in range(requests):
+        payload = payloads[i % len(payloads)]
+        logger.info(f"Starting normalization for job: job-{i}")
+        logger.info(f"Normalized AI data: {json.dumps(payload, ensure_ascii=False, indent=2)}")
+    return time.perf_counter() - start
+
+
+def simulate_queued(logger: logging.Logger, payloads: List[Dict[str, Any]], requests: int, sample_rate: float) -> float:
+    """Новый путь: запись в очередь и payload только для выборки запросов"""
+    start = time.perf_counter()
+    for i in range(requests):
+        payload = payloads[i % len(payloads)]
+        logger.info(f"Starting normalization for job: job-{i}")
+        if sample_rate > 0 and random.random() < sample_rate:
+            logger.info("Normalized AI data", extra={'job_title': f"job-{i}", 'payload': payload})
+    return time.perf_counter() - start
+
+
+def make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.addHandler(handler)
+    return logger
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк накладных расходов логирования')
+    parser.add_argument('--requests', type=int, default=1000, help='Количество имитируемых запросов')
+    parser.add_argument('--sample-rate', type=float, default=0.01, help='Доля запросов с полным payload')
+    args = parser.parse_args()
+
+    payloads = build_payloads()
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_handler = logging.FileHandler(os.path.join(tmp, 'sync.log'), encoding='utf-8')
+        sync_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        sync_seconds = simulate_sync(make_logger('bench.sync', sync_handler), payloads, args.requests)
+        sync_handler.close()
+
+        file_handler = logging.FileHandler(os.path.join(tmp, 'queued.log'), encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        listener.start()
+        queued_seconds = simulate_queued(
+            make_logger('bench.queued', logging.handlers.QueueHandler(log_queue)),
+            payloads,
+            args.requests,
+            args.sample_rate
+        )
+        drain_start = time.perf_counter()
+        listener.stop()
+        drain_seconds = time.perf_counter() - drain_start
+        file_handler.close()
+
+    sync_us = sync_seconds / args.requests * 1e6
+    queued_us = queued_seconds / args.requests * 1e6
+    print(f"{'mode':<10}{'µs / request':>15}")
+    print(f"{'sync':<10}{sync_us:>15.1f}")
+    print(f"{'queued':<10}{queued_us:>15.1f}")
+    print(f"\nСнято с вызывающего потока: {sync_us - queued_us:.1f} µs на запрос "
+          f"({(1 - queued_us / sync_us) * 100:.0f}%), фоновая дозапись заняла {drain_seconds * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
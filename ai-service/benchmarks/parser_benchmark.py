@@ -0,0 +1,194 @@
+"""
+Микро-бенчмарк горячего пути разбора ответа модели.
+
+Для каждого документа корпуса benchmarks/corpus/model_outputs.jsonl замеряются три стадии:
+  parse     - ResponseParser.parse_ai_response
+  normalize - JobNormalizer._normalize_ai_data
+  build     - JobNormalizer._create_normalized_response (конструирование Pydantic моделей)
+
+Для каждой стадии считается медианное время вызова и пиковый объем аллокаций (tracemalloc).
+Абсолютное время зависит от машины, поэтому с baseline сравнивается не оно, а отношение
+времени стадии к времени эталонной нагрузки (рекурсивный обход разобранного ответа на чистом
+Python), замеренной на том же документе вперемешку со стадиями. Отношения и аллокации
+сумм по корпусу сравниваются с сохраненным baseline; при регрессии больше порога
+скрипт завершается с кодом 1.
+Отношения переносимы между машинами лишь приблизительно (разные CPU по-разному ускоряют
+разный код), поэтому baseline лучше перезаписывать на той машине, где запускается проверка.
+
+Запуск из директории ai-service:
+    python -m benchmarks.parser_benchmark                    # сравнение с baseline
+    python -m benchmarks.parser_benchmark --update-baseline  # перезапись baseline
+    python -m benchmarks.parser_benchmark --threshold 0.5 --json results.json
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from app.services.job_normalizer import JobNormalizer
+from app.utils import ResponseParser
+from app.exceptions import InvalidResponseError
+
+from .common import load_corpus, load_baseline, save_baseline, time_call
+
+BASELINE_NAME = 'parser_benchmark.json'
+STAGES = ('parse', 'normalize', 'build')
+
+
+def measure_allocations(func: Callable[[], Any]) -> int:
+    """Возвращает пиковый объем памяти (байт), выделенной за один вызов"""
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return max(peak - start, 0)
+
+
+def _walk(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _walk(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_walk(item) for item in value]
+    return value
+
+
+def benchmark_document(normalizer: JobNormalizer, doc: Dict[str, Any], iterations: int) -> Dict[str, Dict[str, float]]:
+    """Замеряет все стадии для одного документа корпуса"""
+    response = doc['response']
+    parsed = ResponseParser.parse_ai_response(response)
+    normalized = normalizer._normalize_ai_data(parsed)
+
+    stages = {
+        # Эталонная нагрузка: масштаб скорости интерпретатора на этой машине
+        'reference': lambda: _walk(parsed),
+        'parse': lambda: ResponseParser.parse_ai_response(response),
+        'normalize': lambda: normalizer._normalize_ai_data(parsed),
+        'build': lambda: normalizer._create_normalized_response(
+            title=doc['title'],
+            description=doc['description'],
+            ai_data=normalized,
+            source_name='benchmark'
+        ),
+    }
+
+    return {
+        stage: {
+            'time_us': round(time_call(func, iterations), 2),
+            'alloc_bytes': measure_allocations(func),
+        }
+        for stage, func in stages.items()
+    }
+
+
+def run(iterations: int) -> Dict[str, Any]:
+    """Прогоняет бенчмарк по всему корпусу"""
+    normalizer = JobNormalizer(ollama_client=None, prompt_template='')
+    documents = {}
+    reference_us = 0.0
+    for doc in load_corpus():
+        try:
+            stages = benchmark_document(normalizer, doc, iterations)
+        except InvalidResponseError as e:
+            print(f"⚠️  Документ {doc['name']} не разобран: {e}", file=sys.stderr)
+            continue
+        reference_us += stages.pop('reference')['time_us']
+        documents[doc['name']] = stages
+
+    totals = {}
+    for stage in STAGES:
+        time_us = sum(d[stage]['time_us'] for d in documents.values())
+        totals[stage] = {
+            'time_us': round(time_us, 2),
+            'time_ratio': round(time_us / reference_us, 3),
+            'alloc_bytes': sum(d[stage]['alloc_bytes'] for d in documents.values()),
+        }
+    return {'iterations': iterations, 'reference_us': round(reference_us, 2), 'documents': documents, 'totals': totals}
+
+
+def find_regressions(result: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Сравнивает суммы по стадиям с baseline: относительное время и аллокации"""
+    regressions = []
+    for stage in STAGES:
+        base = baseline.get('totals', {}).get(stage)
+        if not base:
+            continue
+        current = result['totals'][stage]
+        for metric in ('time_ratio', 'alloc_bytes'):
+            # baseline старого формата хранит только абсолютное время - его не сравниваем
+            if base.get(metric) and current[metric] > base[metric] * (1 + threshold):
+                change = (current[metric] / base[metric] - 1) * 100
+                regressions.append(f"{stage}.{metric}: {base[metric]} -> {current[metric]} (+{change:.1f}%)")
+    return regressions
+
+
+def print_report(result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Печатает таблицу по документам и стадиям"""
+    header = f"{'document':<24}" + ''.join(f"{stage + ' µs':>14}{stage + ' KiB':>14}" for stage in STAGES)
+    print(header)
+    print('-' * len(header))
+    rows = list(result['documents'].items()) + [('TOTAL', result['totals'])]
+    for name, stages in rows:
+        line = f"{name:<24}"
+        for stage in STAGES:
+            line += f"{stages[stage]['time_us']:>14.2f}{stages[stage]['alloc_bytes'] / 1024:>14.2f}"
+        print(line)
+
+    print(f"\nЭталонная нагрузка: {result['reference_us']:.2f} µs")
+    base_totals = baseline.get('totals')
+    if base_totals:
+        for stage in STAGES:
+            base_ratio = base_totals[stage].get('time_ratio')
+            current_ratio = result['totals'][stage]['time_ratio']
+            if not base_ratio:
+                print(f"{stage:<10} в baseline нет относительного времени, перезапишите его с --update-baseline")
+                continue
+            change = (current_ratio / base_ratio - 1) * 100
+            print(
+                f"{stage:<10} baseline x{base_ratio:.3f} -> x{current_ratio:.3f} эталона ({change:+.1f}%), "
+                f"{result['totals'][stage]['time_us']:.2f} µs"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк ResponseParser и JobNormalizer')
+    parser.add_argument('--iterations', type=int, default=200, help='Вызовов на один замер')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Допустимая регрессия (0.25 = 25%%)')
+    parser.add_argument('--update-baseline', action='store_true', help='Сохранить результат как baseline')
+    parser.add_argument('--json', dest='json_path', help='Сохранить результат в JSON файл')
+    args = parser.parse_args()
+
+    result = run(args.iterations)
+    baseline = load_baseline(BASELINE_NAME)
+    print_report(result, baseline)
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+
+    if args.update_baseline:
+        path = save_baseline(BASELINE_NAME, result)
+        print(f"\n💾 Baseline сохранен: {path}")
+        return 0
+
+    if not baseline:
+        print("\nBaseline не найден, запустите с --update-baseline")
+        return 0
+
+    regressions = find_regressions(result, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ Регрессия больше {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+
+    print(f"\n✅ Регрессий больше {args.threshold:.0%} нет")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
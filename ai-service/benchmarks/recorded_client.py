@@ -0,0 +1,91 @@
+import asyncio
+import json
+import time
+from typing import Any, Dict, Optional
+
+from app.exceptions import OllamaConnectionError
+
+from .common import load_jsonl
+
+
+class RecordedOllamaClient:
+    """Заглушка OllamaClient, отдающая записанные ответы модели"""
+
+    def __init__(self, model: str, prompt_version: str, recordings_path: str):
+        self.model = model
+        self.prompt_version = prompt_version
+        self.current_case: Optional[str] = None
+        self.recordings = {
+            (r['model'], r['prompt_version'], r['case_id']): r
+            for r in load_jsonl(recordings_path)
+        }
+
+    def has_recordings(self) -> bool:
+        """Есть ли записи для текущей пары модель/версия промпта"""
+        return any(key[:2] == (self.model, self.prompt_version) for key in self.recordings)
+
+    def generate(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        key = (self.model, self.prompt_version, self.current_case)
+        if key not in self.recordings:
+            raise OllamaConnectionError(f"Нет записанного ответа для {key}")
+        record = self.recordings[key]
+        return {
+            'response': record['response'],
+            'prompt_eval_count': record.get('prompt_eval_count', 0),
+            'eval_count': record.get('eval_count', 0),
+            'total_duration': record.get('total_duration', 0),
+            'load_duration': record.get('load_duration', 0),
+            'done_reason': record.get('done_reason', 'stop')
+        }
+
+    def generate_response(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+        return self.generate(prompt, options)['response']
+
+
+class InstrumentedClient:
+    """Обертка над клиентом, запоминающая статистику последних генераций"""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
+
+    def reset(self) -> None:
+        self.calls = []
+
+    def generate(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        result = self.client.generate(prompt, options)
+        self.calls.append({**result, 'wall_seconds': time.perf_counter() - start})
+        return result
+
+    async def agenerate(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        if hasattr(self.client, 'agenerate'):
+            result = await self.client.agenerate(prompt, options)
+        else:
+            result = await asyncio.to_thread(self.client.generate, prompt, options)
+        self.calls.append({**result, 'wall_seconds': time.perf_counter() - start})
+        return result
+
+    def generate_response(self, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+        return self.generate(prompt, options)['response']
+
+
+def append_recording(path: str, model: str, prompt_version: str, case_id: str, stats: Dict[str, Any]) -> None:
+    """Дописывает ответ живой модели в файл записей"""
+    record = {
+        'model': model,
+        'prompt_version': prompt_version,
+        'case_id': case_id,
+        'response': stats['response'],
+        'prompt_eval_count': stats.get('prompt_eval_count', 0),
+        'eval_count': stats.get('eval_count', 0),
+        'total_duration': stats.get('total_duration', 0),
+        'load_duration': stats.get('load_duration', 0),
+        'done_reason': stats.get('done_reason')
+    }
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(record, ensure_ascii=False) + '\n')
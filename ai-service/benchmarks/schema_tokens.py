@@ -0,0 +1,59 @@
+"""
+Оценка сокращения токенов при переходе на компактную схему ответа (промпт v2).
+
+Каждый документ корпуса приводится к полной структуре ответа v1 (как ее печатает модель,
+с отступами и null полями) и к компактной схеме v2 (минифицированный JSON без null).
+Для обоих вариантов оценивается число токенов; заодно проверяется, что компактный
+ответ разворачивается decoder'ом в те же нормализованные данные.
+
+Точные числа токенов конкретной модели дает benchmarks.evaluate (eval_count из Ollama).
+
+Запуск из директории ai-service:
+    python -m benchmarks.schema_tokens
+"""
+import json
+import sys
+
+from app.prompts import PromptManager
+from app.services.job_normalizer import JobNormalizer
+from app.utils import ResponseParser, CompactSchema, TokenEstimator
+
+from .common import load_corpus
+
+
+def main() -> int:
+    normalizer = JobNormalizer(ollama_client=None, prompt_template='', payload_sample_rate=0)
+
+    print(f"{'document':<24}{'v1 tokens':>12}{'v2 tokens':>12}{'saved':>10}{'roundtrip':>11}")
+    total_verbose = total_compact = 0
+    mismatches = 0
+    for doc in load_corpus():
+        verbose = normalizer._normalize_ai_data(ResponseParser.parse_ai_response(doc['response']))
+        compact = CompactSchema.compress(verbose)
+
+        verbose_tokens = TokenEstimator.estimate(json.dumps(verbose, ensure_ascii=False, indent=2))
+        compact_tokens = TokenEstimator.estimate(json.dumps(compact, ensure_ascii=False, separators=(',', ':')))
+        roundtrip_ok = normalizer._normalize_ai_data(compact) == verbose
+        mismatches += not roundtrip_ok
+
+        total_verbose += verbose_tokens
+        total_compact += compact_tokens
+        saved = 1 - compact_tokens / verbose_tokens
+        print(f"{doc['name']:<24}{verbose_tokens:>12}{compact_tokens:>12}{saved:>10.0%}{'ok' if roundtrip_ok else 'DIFF':>11}")
+
+    print('-' * 69)
+    print(f"{'TOTAL':<24}{total_verbose:>12}{total_compact:>12}{1 - total_compact / total_verbose:>10.0%}")
+
+    print()
+    for version in PromptManager.get_available_versions():
+        prompt = PromptManager.get_prompt(version).format(title='', description='')
+        print(f"Промпт {version}: ~{TokenEstimator.estimate(prompt)} токенов без текста вакансии")
+
+    if mismatches:
+        print(f"\n❌ {mismatches} документов разворачиваются с расхождениями")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
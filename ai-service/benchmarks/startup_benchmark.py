@@ -0,0 +1,119 @@
+"""
+Бенчмарк холодного старта сервиса.
+
+В отдельном процессе замеряются:
+  import   - время import app.main
+  startup  - create_app() и вход в lifespan (сервис принимает соединения)
+  ready    - время до готовности (/ready): Ollama доступна, модель загружена и прогрета
+
+Запуск из директории ai-service:
+    python -m benchmarks.startup_benchmark                      # только import и startup
+    python -m benchmarks.startup_benchmark --ready-timeout 120  # ждать готовности модели
+    python -m benchmarks.startup_benchmark --top-imports 15     # самые тяжелые импорты
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+AI_SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD_SCRIPT = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import app.main as main_module
+imported = time.perf_counter()
+application = main_module.create_app()
+ready_timeout = float(sys.argv[1])
+
+async def run():
+    async with application.router.lifespan_context(application):
+        started = time.perf_counter()
+        container = application.state.container
+        deadline = started + ready_timeout
+        while time.perf_counter() < deadline:
+            snapshot = container.health_checker.get_snapshot()
+            if snapshot['ollama_available'] and snapshot['model_loaded'] and container.residency_manager.warmed_up:
+                return started, time.perf_counter()
+            await asyncio.sleep(0.05)
+        return started, None
+
+started, ready = asyncio.run(run())
+print(json.dumps({
+    'import': imported - start,
+    'startup': started - start,
+    'ready': ready - start if ready else None
+}))
+"""
+
+
+def run_once(ready_timeout: float) -> Dict[str, Optional[float]]:
+    """Запускает один холодный старт в отдельном процессе"""
+    completed = subprocess.run(
+        [sys.executable, '-c', CHILD_SCRIPT, str(ready_timeout)],
+        cwd=AI_SERVICE_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def top_imports(limit: int) -> List[Dict[str, Any]]:
+    """Самые тяжелые модули по python -X importtime (кумулятивно)"""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app.main'],
+        cwd=AI_SERVICE_DIR,
+        capture_output=True,
+        text=True,
+        check=True
+    )
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append({'module': module.strip(), 'self_us': int(self_us), 'cumulative_us': int(cumulative_us)})
+    return sorted(rows, key=lambda row: row['cumulative_us'], reverse=True)[:limit]
+
+
+def median(values: List[Optional[float]]) -> Optional[float]:
+    present = [value for value in values if value is not None]
+    return statistics.median(present) if present else None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк времени импорта и готовности сервиса')
+    parser.add_argument('--runs', type=int, default=5, help='Количество холодных стартов')
+    parser.add_argument('--ready-timeout', type=float, default=0.0, help='Сколько секунд ждать готовности модели')
+    parser.add_argument('--top-imports', type=int, default=0, help='Показать N самых тяжелых импортов')
+    parser.add_argument('--json', dest='json_path', help='Сохранить результат в JSON файл')
+    args = parser.parse_args()
+
+    runs = [run_once(args.ready_timeout) for _ in range(args.runs)]
+    result = {
+        'runs': runs,
+        'median': {stage: median([run[stage] for run in runs]) for stage in ('import', 'startup', 'ready')}
+    }
+
+    print(f"{'stage':<10}{'median ms':>12}")
+    for stage, value in result['median'].items():
+        print(f"{stage:<10}{value * 1000 if value is not None else float('nan'):>12.1f}")
+
+    if args.top_imports:
+        result['top_imports'] = top_imports(args.top_imports)
+        print(f"\n{'module':<50}{'cumulative ms':>15}")
+        for row in result['top_imports']:
+            print(f"{row['module']:<50}{row['cumulative_us'] / 1000:>15.1f}")
+
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Бенчмарк транспорта parser -> ai-service: размер тел и CPU сервера на запрос.
+
+Для каждого сочетания формата (json, msgpack) и сжатия (identity, gzip, zstd) замеряются:
+  request   - байты тела запроса NormalizeRequest с длинным описанием
+  response  - байты тела ответа NormalizeResponse
+  decode    - CPU сервера на разбор запроса: распаковка, разбор тела, валидация Pydantic
+  encode    - CPU сервера на ответ из кэша: перевод JSON тела в формат и сжатие
+
+Строка json (stdlib) - прежний путь Starlette: json.loads без сжатия.
+
+Запуск из директории ai-service:
+    python -m benchmarks.transport_benchmark
+    python -m benchmarks.transport_benchmark --iterations 500
+"""
+import argparse
+import json
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.models import NormalizeRequest
+from app.services.job_normalizer import JobNormalizer
+from app.transport import JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, Transport, msgpack, zstandard
+from app.utils import ResponseParser, JSONEncoder
+
+from .common import load_corpus, time_call
+
+
+def build_payloads() -> Tuple[Dict[str, Any], bytes]:
+    """Запрос с длинным описанием (тексты корпуса) и JSON тело нормализованного ответа"""
+    corpus = load_corpus()
+    normalizer = JobNormalizer(ollama_client=None, prompt_template='', payload_sample_rate=0)
+    texts = []
+    for doc in corpus:
+        texts.append(doc['description'])
+        ai_data = normalizer._normalize_ai_data(ResponseParser.parse_ai_response(doc['response']))
+        texts.extend(text for text in (ai_data['fullDescription'], ai_data['shortDescription']) if text)
+    request = {
+        'title': corpus[0]['title'],
+        'description': '\n\n'.join(dict.fromkeys(texts)),
+        'source_name': 'HH.ru',
+        'original_url': 'https://hh.ru/vacancy/123456',
+    }
+    doc = corpus[0]
+    response = normalizer._create_normalized_response(
+        title=doc['title'],
+        description=request['description'],
+        ai_data=normalizer._normalize_ai_data(ResponseParser.parse_ai_response(doc['response'])),
+        source_name=request['source_name'],
+        original_url=request['original_url']
+    )
+    return request, JSONEncoder.encode(response)
+
+
+def variants() -> List[Tuple[str, str, Optional[str]]]:
+    media_types = [('json', JSON_MEDIA_TYPE)] + ([('msgpack', MSGPACK_MEDIA_TYPE)] if msgpack is not None else [])
+    encodings = [None, 'gzip'] + (['zstd'] if zstandard is not None else [])
+    return [(f"{name}+{encoding or 'identity'}", media_type, encoding) for name, media_type in media_types for encoding in encodings]
+
+
+def request_decoder(body: bytes, media_type: str, encoding: Optional[str]) -> Callable[[], NormalizeRequest]:
+    """Серверный разбор тела, как в TransportRequest"""
+    def decode() -> NormalizeRequest:
+        raw = Transport.decompress(body, encoding)
+        data = msgpack.unpackb(raw) if media_type == MSGPACK_MEDIA_TYPE else JSONEncoder.decode(raw)
+        return NormalizeRequest(**data)
+    return decode
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Бенчмарк форматов и сжатия тел запросов')
+    parser.add_argument('--iterations', type=int, default=300, help='Вызовов на один замер')
+    args = parser.parse_args()
+
+    request, response_json = build_payloads()
+    json_request = json.dumps(request, ensure_ascii=False).encode('utf-8')
+    print(f"Описание {len(request['description'])} символов, ответ {len(response_json)} байт JSON\n")
+
+    rows = {
+        'json (stdlib)': {
+            'request': len(json_request),
+            'response': len(response_json),
+            'decode': time_call(lambda: NormalizeRequest(**json.loads(json_request)), args.iterations),
+            'encode': 0.0,
+        }
+    }
+    for name, media_type, encoding in variants():
+        raw = msgpack.packb(request) if media_type == MSGPACK_MEDIA_TYPE else json_request
+        body = Transport.compress(raw, encoding) if encoding else raw
+        response_body, _ = Transport.encode(response_json, media_type, encoding, compress_min_bytes=0)
+        rows[name] = {
+            'request': len(body),
+            'response': len(response_body),
+            'decode': time_call(request_decoder(body, media_type, encoding), args.iterations),
+            'encode': time_call(lambda: Transport.encode(response_json, media_type, encoding, 0), args.iterations),
+        }
+
+    print(f"{'variant':<20}{'request B':>12}{'response B':>12}{'decode µs':>12}{'encode µs':>12}{'CPU µs':>10}")
+    for name, row in rows.items():
+        print(f"{name:<20}{row['request']:>12}{row['response']:>12}{row['decode']:>12.1f}"
+              f"{row['encode']:>12.1f}{row['decode'] + row['encode']:>10.1f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Пакетная нормализация вакансий из JSONL без HTTP.
+
+Каждая строка входного файла - объект NormalizeRequest (title, description, source_name,
+original_url, fields). Результаты дописываются в выходной JSONL по мере готовности:
+{"input_hash": ..., "result": {...}} или {"input_hash": ..., "error": ...}.
+
+Обработанные входы отмечаются в checkpoint файле по хэшу содержимого, поэтому
+прерванный запуск продолжается с места остановки, а повторяющиеся вакансии
+не нормализуются дважды. Ошибочные входы в checkpoint не попадают и
+повторяются при следующем запуске.
+
+Запуск из директории ai-service:
+    python bulk_normalize.py vacancies.jsonl normalized.jsonl --concurrency 4
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, Iterator, Optional, Set, Tuple
+
+from app.config.settings import settings
+from app.container import ServiceContainer
+from app.models import NormalizeRequest
+
+logger = logging.getLogger('bulk_normalize')
+
+
+def input_hash(record: Dict[str, Any], prompt_version: str) -> str:
+    """Хэш содержимого входа: одинаковые вакансии дают одинаковый хэш"""
+    key = {
+        'title': record.get('title'),
+        'description': record.get('description'),
+        'fields': record.get('fields'),
+        'prompt_version': prompt_version
+    }
+    return hashlib.sha256(json.dumps(key, ensure_ascii=False, sort_keys=True).encode()).hexdigest()
+
+
+def load_checkpoint(path: str) -> Set[str]:
+    """Хэши уже обработанных входов"""
+    if not os.path.exists(path):
+        return set()
+    with open(path, encoding='utf-8') as f:
+        return {line.strip() for line in f if line.strip()}
+
+
+def iter_input(path: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """Потоково читает входной JSONL: (номер строки, запись, ошибка разбора)"""
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line), None
+            except json.JSONDecodeError as e:
+                yield line_number, None, str(e)
+
+
+def count_lines(path: str) -> int:
+    with open(path, 'rb') as f:
+        return sum(1 for line in f if line.strip())
+
+
+class Progress:
+    """Пропускная способность и ETA по обработанным в этом запуске входам"""
+
+    def __init__(self, total: int, interval: float):
+        self.total = total
+        self.interval = interval
+        self.started = time.monotonic()
+        self.last_report = self.started
+        self.done = self.skipped = self.failed = 0
+
+    def report(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self.last_report < self.interval:
+            return
+        self.last_report = now
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = self.total - self.done - self.skipped - self.failed
+        eta = f"{remaining / rate:.0f}s" if rate > 0 else "n/a"
+        print(
+            f"[{elapsed:7.1f}s] done {self.done}, skipped {self.skipped}, failed {self.failed} "
+            f"of {self.total} | {rate:.2f} vacancies/s | ETA {eta}",
+            file=sys.stderr
+        )
+
+
+async def run(args: argparse.Namespace) -> int:
+    container = ServiceContainer()
+    pipeline = container.normalization_pipeline
+    prompt_version = args.prompt_version or container.settings.prompt_version
+    if args.prompt_version:
+        # Пакетный прогон идет одной версией промпта, без canary/bandit
+        container.prompt_selector.mode = 'fixed'
+        container.prompt_selector.default_version = prompt_version
+
+    checkpoint_path = args.checkpoint or f"{args.output}.checkpoint"
+    done_hashes = load_checkpoint(checkpoint_path)
+    progress = Progress(count_lines(args.input), args.progress_interval)
+    print(f"Resuming with {len(done_hashes)} completed inputs from {checkpoint_path}", file=sys.stderr)
+
+    queue: asyncio.Queue = asyncio.Queue(maxsize=args.concurrency * 2)
+
+    with open(args.output, 'ab') as output, open(checkpoint_path, 'a', encoding='utf-8') as checkpoint:
+
+        def write(record: Dict[str, Any], body: Optional[bytes] = None) -> None:
+            line = json.dumps(record, ensure_ascii=False).encode()
+            if body is not None:
+                # Тело ответа уже сериализовано сервисом, вставляем без повторного кодирования
+                line = line[:-1] + b', "result": ' + body + b'}'
+            output.write(line + b'\n')
+
+        async def worker() -> None:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    queue.task_done()
+                    return
+                line_number, record, digest = item
+                try:
+                    request = NormalizeRequest(**record)
+                    fields = pipeline.resolve_fields(request.fields)
+                    encoded = await pipeline.normalize(request, fields)
+                    write({'input_hash': digest, 'line': line_number}, encoded['body'])
+                    # Сначала результат, потом checkpoint: при падении между ними вход повторится, но не потеряется
+                    output.flush()
+                    checkpoint.write(digest + '\n')
+                    checkpoint.flush()
+                    progress.done += 1
+                except Exception as e:
+                    logger.error(f"Line {line_number} failed: {e}")
+                    write({'input_hash': digest, 'line': line_number, 'error': str(e)})
+                    progress.failed += 1
+                finally:
+                    queue.task_done()
+                    progress.report()
+
+        workers = [asyncio.create_task(worker()) for _ in range(args.concurrency)]
+        for line_number, record, error in iter_input(args.input):
+            if record is None:
+                write({'line': line_number, 'error': f"Invalid JSON: {error}"})
+                progress.failed += 1
+                continue
+            digest = input_hash(record, prompt_version)
+            if digest in done_hashes:
+                progress.skipped += 1
+                continue
+            done_hashes.add(digest)
+            await queue.put((line_number, record, digest))
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    progress.report(force=True)
+    return 1 if progress.failed else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Пакетная нормализация вакансий из JSONL')
+    parser.add_argument('input', help='Входной JSONL с вакансиями')
+    parser.add_argument('output', help='Выходной JSONL (дописывается)')
+    parser.add_argument('--concurrency', type=int, default=settings.chunk_concurrency,
+                        help='Одновременных нормализаций (имеет смысл при OLLAMA_NUM_PARALLEL > 1)')
+    parser.add_argument('--checkpoint', help='Файл checkpoint (по умолчанию <output>.checkpoint)')
+    parser.add_argument('--prompt-version', help='Версия промпта для всего прогона')
+    parser.add_argument('--progress-interval', type=float, default=5.0, help='Период вывода прогресса, с')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=settings.log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    print("🚀 Пакетная нормализация вакансий", file=sys.stderr)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
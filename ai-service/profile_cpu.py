@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Снятие CPU профиля с работающего экземпляра ai-service.
+
+Вызывает POST /api/v1/admin/profile с токеном администратора и сохраняет профиль
+в файл: collapsed stacks для flamegraph.pl/inferno или JSON для https://www.speedscope.app.
+
+Запуск из директории ai-service:
+    ADMIN_TOKEN=... python profile_cpu.py --seconds 30 --format speedscope
+    python profile_cpu.py --url http://10.0.0.5:8000 --token ... --output hot.collapsed
+"""
+import argparse
+import os
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+
+from app.config.settings import settings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='CPU профиль работающего экземпляра ai-service')
+    parser.add_argument('--url', default=f"http://{settings.app_host}:{settings.app_port}",
+                        help='Адрес экземпляра')
+    parser.add_argument('--token', default=os.environ.get('ADMIN_TOKEN'),
+                        help='Токен администратора (по умолчанию ADMIN_TOKEN)')
+    parser.add_argument('--seconds', type=float, default=10.0, help='Длительность профилирования')
+    parser.add_argument('--interval-ms', type=float, default=10.0, help='Период сэмплирования')
+    parser.add_argument('--include-idle', action='store_true',
+                        help='Учитывать простаивающие потоки (профиль по времени выполнения)')
+    parser.add_argument('--format', choices=['collapsed', 'speedscope'], default='collapsed',
+                        help='Формат профиля')
+    parser.add_argument('--output', help='Файл профиля (по умолчанию profile.collapsed / profile.speedscope.json)')
+    args = parser.parse_args()
+
+    if not args.token:
+        print('Не задан токен администратора: --token или ADMIN_TOKEN', file=sys.stderr)
+        return 2
+    output = args.output or ('profile.speedscope.json' if args.format == 'speedscope' else 'profile.collapsed')
+    query = urllib.parse.urlencode({
+        'seconds': args.seconds, 'interval_ms': args.interval_ms, 'format': args.format,
+        'include_idle': str(args.include_idle).lower()
+    })
+    request = urllib.request.Request(
+        f"{args.url.rstrip('/')}/api/v1/admin/profile?{query}",
+        method='POST',
+        headers={'X-Admin-Token': args.token}
+    )
+    print(f"Профилирование {args.url} {args.seconds}s...")
+    try:
+        with urllib.request.urlopen(request, timeout=args.seconds + 30) as response:
+            body = response.read()
+    except urllib.error.HTTPError as e:
+        print(f"Ошибка {e.code}: {e.read().decode('utf-8', 'replace')}", file=sys.stderr)
+        return 1
+    except urllib.error.URLError as e:
+        print(f"Экземпляр недоступен: {e.reason}", file=sys.stderr)
+        return 1
+
+    with open(output, 'wb') as f:
+        f.write(body)
+    print(f"Профиль сохранен в {output} ({len(body)} байт)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 import uvicorn
-from app.main import app
 from app.config.settings import settings
 
 if __name__ == "__main__":
@@ -11,7 +10,8 @@ if __name__ == "__main__":
     print(f"🔗 OpenAPI JSON: http://{settings.app_host}:{settings.app_port}/openapi.json")
     
     uvicorn.run(
-        app,
+        "app.main:create_app",
+        factory=True,
         host=settings.app_host,
         port=settings.app_port,
         log_level=settings.log_level.lower(),
@@ -0,0 +1,47 @@
+import asyncio
+import json
+import os
+
+from app.prompts import PromptManager
+from app.services import JobNormalizer, ModelResidencyManager, OllamaClient
+
+VACANCIES = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'eval', 'vacancies.jsonl')
+RESPONSE = json.dumps({'company': {'name': 'Ромашка'}, 'workType': 'remote', 'experienceLevel': 'senior'})
+
+
+class FakeOllama:
+    """ollama.Client/AsyncClient: запоминает options каждого запроса"""
+
+    def __init__(self):
+        self.options = []
+
+    def _generate(self, prompt='', options=None, **kwargs):
+        self.options.append(options)
+        return {'response': RESPONSE}
+
+    def generate(self, **kwargs):
+        return self._generate(**kwargs)
+
+
+class FakeAsyncOllama(FakeOllama):
+    async def generate(self, **kwargs):
+        return self._generate(**kwargs)
+
+
+def test_warm_up_uses_num_ctx_of_typical_request():
+    template = PromptManager.get_prompt('v1')
+    client = OllamaClient(model='test')
+    client.client = FakeOllama()
+    fake_async = FakeAsyncOllama()
+    client._get_async_client = lambda: fake_async
+
+    residency = ModelResidencyManager(client, template, warmup_description_tokens=1000)
+    assert asyncio.run(residency.warm_up())
+    warmed = client.client.options[-1]['num_ctx']
+
+    # Обычная вакансия: описание в несколько абзацев
+    with open(VACANCIES, encoding='utf-8') as f:
+        vacancy = json.loads(f.readline())
+    normalizer = JobNormalizer(client, template, payload_sample_rate=0)
+    asyncio.run(normalizer.normalize_job(vacancy['title'], vacancy['description'] * 10))
+    assert fake_async.options[-1]['num_ctx'] == warmed == 8192
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from app.exceptions import InvalidResponseError
+from app.utils import ResponseParser
+
+FULL = '{"company": {"name": "A, \\"B\\" {x}"}, "skills": ["py", "go"], "remote": true}'
+
+
+def test_parse_strict_fenced_python_literals_and_trailing_commas():
+    response = "Вот ответ:\n```json\n{'a': True, 'b': [1, 2,], 'c': None,}\n```"
+    assert ResponseParser.parse_strict(response) == {'a': True, 'b': [1, 2], 'c': None}
+
+
+def test_parse_strict_without_json():
+    with pytest.raises(InvalidResponseError):
+        ResponseParser.parse_strict('модель ничего не вернула')
+
+
+def test_clean_response_strips_fence():
+    assert ResponseParser.clean_response('```json\n{"a": 1}\n```  ') == '{"a": 1}'
+
+
+def test_fix_json_leaves_strings_untouched():
+    broken = (
+        '{"url": "http://x.ru/*a*/", /* комментарий */ "s": \'it\\\'s "q"\', "l": [1, 2,], // c\n'
+        ' "v": None, "w": "None, True,]", "m": "a\nb",}'
+    )
+    assert json.loads(ResponseParser._fix_json(broken)) == {
+        'url': 'http://x.ru/*a*/',
+        's': 'it\'s "q"',
+        'l': [1, 2],
+        'v': None,
+        'w': 'None, True,]',
+        'm': 'a\nb',
+    }
+
+
+def test_fix_json_keeps_valid_json():
+    assert ResponseParser._fix_json(FULL) == FULL
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('{"a": "}', True),
+    ('{"a": "\\"", "b": [1', True),
+    ('{"a": "]}"}', False),
+    ('{"a": 1} хвост', False),
+    ('нет json', False),
+])
+def test_is_truncated(text, expected):
+    assert ResponseParser.is_truncated(text) is expected
+
+
+@pytest.mark.parametrize('cut, expected', [
+    # Оборвано в ключе, внутри строки со скобками, запятой и экранированными кавычками
+    ('{"comp', {}),
+    ('{"company": {"name": "A, \\"B\\" {', {}),
+    ('{"company": {"name": "A, \\"B\\" {x}"}', {'company': {'name': 'A, "B" {x}'}}),
+    ('{"company": {"name": "A, \\"B\\" {x}"}, "skills": ["py", "g', {
+        'company': {'name': 'A, "B" {x}'}, 'skills': ['py']
+    }),
+    ('{"company": {"name": "A, \\"B\\" {x}"}, "skills": ["py", "go"], "remote": tr', {
+        'company': {'name': 'A, "B" {x}'}, 'skills': ['py', 'go']
+    }),
+])
+def test_parse_truncated_drops_unfinished_value(cut, expected):
+    assert FULL.startswith(cut)
+    assert ResponseParser.parse_truncated(cut) == expected
+
+
+def test_parse_truncated_every_prefix_is_valid():
+    full = json.loads(FULL)
+    for size in range(1, len(FULL)):
+        parsed = ResponseParser.parse_truncated('```json\n' + FULL[:size])
+        # Завершенные значения совпадают с полным ответом, у списка - начало списка
+        for key, value in parsed.items():
+            assert value == (full[key][:len(value)] if isinstance(value, list) else full[key])
+
+
+def test_parse_truncated_fixes_comments_and_single_quotes():
+    assert ResponseParser.parse_truncated("{'a': 'x // y', // c\n 'b': [1, 2,], 'c': 'ob") == {
+        'a': 'x // y', 'b': [1, 2]
+    }
+
+
+def test_parse_truncated_without_json():
+    with pytest.raises(InvalidResponseError):
+        ResponseParser.parse_truncated('нет json')
+
+
+@pytest.mark.parametrize('head, tail, expected', [
+    # Продолжение повторяет конец ответа
+    ('{"a": "hello wor', 'hello world", "b": 1}', '{"a": "hello world", "b": 1}'),
+    # Продолжение в обрамлении ```json
+    ('{"a": "hello wor', '```json\n"hello world", "b": 1}\n```', '{"a": "hello world", "b": 1}'),
+    # Без повтора
+    ('{"a": "hello wor', 'ld", "b": 1}', '{"a": "hello world", "b": 1}'),
+    # Совпадение короче min_overlap - настоящее продолжение, а не повтор
+    ('{"a": "ab', 'ab"}', '{"a": "abab"}'),
+])
+def test_stitch(head, tail, expected):
+    assert ResponseParser.stitch(head, tail) == expected
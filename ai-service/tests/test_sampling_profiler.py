@@ -0,0 +1,38 @@
+import queue
+import threading
+import time
+
+from app.diagnostics import SamplingProfiler
+
+
+def _threads(profiler):
+    return {stack[0][0] for stack in profiler.samples}
+
+
+def test_idle_threads_are_skipped():
+    stop = threading.Event()
+    jobs = queue.Queue()
+
+    def busy():
+        while not stop.is_set():
+            sum(range(1000))
+
+    threads = [
+        threading.Thread(target=busy, name='busy', daemon=True),
+        threading.Thread(target=stop.wait, name='idle-event', daemon=True),
+        threading.Thread(target=jobs.get, name='idle-queue', daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    try:
+        cpu = SamplingProfiler(0.005).run(0.2)
+        wall = SamplingProfiler(0.005, include_idle=True).run(0.2)
+    finally:
+        stop.set()
+        jobs.put(None)
+
+    assert 'busy' in _threads(cpu)
+    assert not {'idle-event', 'idle-queue'} & _threads(cpu)
+    assert cpu.idle_samples > 0
+    assert {'busy', 'idle-event', 'idle-queue'} <= _threads(wall)
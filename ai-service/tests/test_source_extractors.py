@@ -0,0 +1,40 @@
+from app.extractors import default_registry
+
+# Описание в том виде, в каком его присылает парсер: .text() блока описания,
+# пробелы и переводы строк схлопнуты cleanDescription в одну строку
+HABR_TEXT = (
+    'Мы - продуктовая команда платежного сервиса, ищем бэкенд-разработчика. '
+    'Обязанности: разработка и поддержка микросервисов на Python; основные задачи: '
+    'проектирование API и ревью кода. Требования к кандидату: опыт коммерческой разработки от 5 лет, '
+    'Python 3.11, FastAPI, PostgreSQL. Условия работы: можно удаленно, полный рабочий день, ДМС. '
+    'Зарплата: от 250 000 до 350 000 ₽ на руки. Город: Москва, ул. Льва Толстого, 16'
+)
+HH_TEXT = (
+    'Чем предстоит заниматься: поддержка внутренних сервисов. Мы ожидаем: опыт работы с Go от года. '
+    'Мы предлагаем: гибридный формат, офис у метро Динамо. Доход: до 180 000 руб. до вычета налогов'
+)
+
+
+def test_habr_plain_text_payload():
+    plugin, data = default_registry().extract('Habr Career', 'Senior Python Developer', HABR_TEXT)
+    assert plugin == 'habr_career'
+    assert data == {
+        'salary': {'min': 250000, 'max': 350000, 'currency': 'RUB', 'period': 'month', 'type': 'после вычета налогов'},
+        'workType': 'remote',
+        'location': {'city': 'Москва', 'country': 'Россия', 'address': None, 'remote': True},
+        'experienceLevel': 'senior',
+    }
+
+
+def test_job_posting_plain_text_payload():
+    plugin, data = default_registry().extract('hh.ru', 'Go разработчик', HH_TEXT, fields=['salary', 'work_type'])
+    assert plugin == 'job_posting_ld'
+    assert data == {
+        'salary': {'min': None, 'max': 180000, 'currency': 'RUB', 'period': 'month', 'type': 'до вычета налогов'},
+        'workType': 'hybrid',
+    }
+
+
+def test_plain_text_without_headings_returns_nothing():
+    _, data = default_registry().extract('Habr Career', 'Python разработчик', 'Ищем разработчика в команду платежей')
+    assert data == {}
@@ -0,0 +1,48 @@
+import json
+
+import pytest
+
+from app.utils import StreamingJSONParser
+
+RESPONSE = (
+    '```json\n{"a": "x, \\"}{\\" y", "b": {"c": [1, {"d": "]"}]}, '
+    '"n": 12, "t": true, "bad": tru e, "z": null}\n```'
+)
+EXPECTED = [
+    ('a', 'x, "}{" y'),
+    ('b', {'c': [1, {'d': ']'}]}),
+    ('n', 12),
+    ('t', True),
+    ('z', None),
+]
+
+
+@pytest.mark.parametrize('size', [1, 2, 7, len(RESPONSE)])
+def test_feed_returns_completed_top_level_keys(size):
+    parser = StreamingJSONParser()
+    completed = []
+    for start in range(0, len(RESPONSE), size):
+        completed.extend(parser.feed(RESPONSE[start:start + size]))
+    # Несразбираемое значение "bad" пропускается, вложенные ключи не возвращаются
+    assert completed == EXPECTED
+    assert parser.done
+
+
+def test_key_is_returned_once_value_is_complete():
+    parser = StreamingJSONParser()
+    assert parser.feed('{"skills": ["py", "g') == []
+    assert parser.feed('o"') == []
+    assert parser.feed('], "n": 1') == [('skills', ['py', 'go'])]
+    # Число может продолжиться, пока не встретился разделитель
+    assert parser.feed('0') == []
+    assert parser.feed('}') == [('n', 10)]
+    assert parser.feed(' {"x": 1}') == []
+
+
+def test_matches_full_parse():
+    data = {'company': {'name': 'ООО "Ромашка"', 'website': None}, 'tags': ['a\\b', '{'], 'level': 'senior'}
+    parser = StreamingJSONParser()
+    completed = []
+    for char in json.dumps(data, ensure_ascii=False, indent=2):
+        completed.extend(parser.feed(char))
+    assert dict(completed) == data
@@ -0,0 +1,33 @@
+from app.config.settings import settings
+from app.services.job_normalizer import JobNormalizer
+from app.utils import TextChunker, TokenEstimator
+
+# Описание одним абзацем, как его присылает парсер (.text() без переносов строк)
+PARAGRAPH = ' '.join(
+    f'Ищем разработчика в команду {i}: Python, FastAPI и PostgreSQL, опыт от {i % 5} лет. '
+    f'Предлагаем ДМС, гибрид и обучение!'
+    for i in range(600)
+)
+
+
+def test_single_paragraph_is_chunked_by_sentences():
+    assert TokenEstimator.estimate(PARAGRAPH) > settings.chunk_threshold_tokens
+    chunks = JobNormalizer(ollama_client=None, prompt_template='')._split_description(PARAGRAPH)
+    assert len(chunks) > 1
+    assert all(TokenEstimator.estimate(chunk) <= settings.chunk_max_tokens for chunk in chunks)
+    assert ' '.join(chunks) == PARAGRAPH
+    # Фрагменты режутся по концу предложения
+    assert all(chunk.endswith(('.', '!')) for chunk in chunks)
+
+
+def test_long_sentence_and_word_fall_back_to_token_window():
+    description = 'Требования:\n' + ' '.join(['Python'] * 3000) + '\nhttps://example.com/' + 'x' * 5000
+    chunks = TextChunker.split(description, 200)
+    assert all(TokenEstimator.estimate(chunk) <= 200 for chunk in chunks)
+    # Заголовок раздела повторяется в каждом фрагменте
+    assert all(chunk.startswith('Требования:\n') for chunk in chunks)
+
+
+def test_short_sections_are_grouped():
+    description = 'Компания: Ромашка\nОбязанности:\nПисать код\nТребования:\nPython'
+    assert TextChunker.split(description, 1000) == [description]
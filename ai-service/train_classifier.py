@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Обучение и оценка классификатора workType/experienceLevel на прошлых ответах модели.
+
+Каждая строка входного JSONL содержит title и description и метки в одном из форматов:
+  - workType / experienceLevel - выборка сервиса (CLASSIFIER_SAMPLES_PATH);
+  - response - сырой ответ модели (как в benchmarks/corpus), разбирается парсером сервиса;
+  - gold.work_type / gold.experience_level - размеченные вакансии (benchmarks/eval).
+
+Порог уверенности подбирается по отложенной выборке так, чтобы точность уверенных
+предсказаний была не ниже --target-accuracy, и сохраняется в артефакт.
+
+Запуск из директории ai-service:
+    python train_classifier.py train samples.jsonl --output models/field_classifier_v1.npz --model-version v1
+    python train_classifier.py evaluate models/field_classifier_v1.npz holdout.jsonl
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.classifiers import FieldClassifier
+from app.services.job_normalizer import JobNormalizer
+from app.utils import ResponseParser
+
+Sample = Tuple[str, str, Dict[str, str]]
+
+
+def sample_labels(record: Dict[str, Any], normalizer: JobNormalizer) -> Dict[str, str]:
+    """Метки полей записи в значениях WorkType/ExperienceLevel"""
+    if 'response' in record:
+        try:
+            ai_data = normalizer._normalize_ai_data(ResponseParser.parse_ai_response(record['response']))
+        except Exception:
+            return {}
+        return {
+            'work_type': normalizer._map_work_type(ai_data['workType']).value,
+            'experience_level': normalizer._map_experience_level(ai_data['experienceLevel']).value
+        }
+    source = record.get('gold') or {}
+    labels = {
+        'work_type': record.get('workType', source.get('work_type')),
+        'experience_level': record.get('experienceLevel', source.get('experience_level'))
+    }
+    return {
+        field: label for field, label in labels.items()
+        if label in FieldClassifier.LABELS[field]
+    }
+
+
+def load_samples(paths: List[str]) -> List[Sample]:
+    normalizer = JobNormalizer(None, '', payload_sample_rate=0)
+    samples = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                labels = sample_labels(record, normalizer)
+                if labels and record.get('description'):
+                    samples.append((record.get('title', ''), record['description'], labels))
+    return samples
+
+
+def calibrate(confidences: List[Tuple[float, bool]], target_accuracy: float, default: float) -> float:
+    """Минимальный порог, при котором точность уверенных предсказаний не ниже целевой"""
+    if not confidences:
+        return default
+    threshold = 1.0
+    correct = 0
+    for count, (probability, is_correct) in enumerate(sorted(confidences, reverse=True), start=1):
+        correct += is_correct
+        if correct / count >= target_accuracy:
+            threshold = probability
+    return max(threshold, 0.5)
+
+
+def evaluate(classifier: FieldClassifier, samples: List[Sample]) -> Dict[str, Dict[str, Any]]:
+    """Точность, покрытие при пороге и точность уверенных предсказаний по полям"""
+    report: Dict[str, Dict[str, Any]] = {
+        field: {'samples': 0, 'correct': 0, 'confident': 0, 'confident_correct': 0, 'confidences': []}
+        for field in FieldClassifier.LABELS
+    }
+    started = time.perf_counter()
+    for title, description, labels in samples:
+        for field, (label, probability, is_confident) in classifier.predict(title, description).items():
+            if field not in labels:
+                continue
+            stats = report[field]
+            is_correct = label == labels[field]
+            stats['samples'] += 1
+            stats['correct'] += is_correct
+            stats['confident'] += is_confident
+            stats['confident_correct'] += is_confident and is_correct
+            stats['confidences'].append((probability, is_correct))
+    elapsed = time.perf_counter() - started
+    for stats in report.values():
+        count = stats['samples']
+        stats['accuracy'] = stats['correct'] / count if count else None
+        stats['coverage'] = stats['confident'] / count if count else None
+        stats['confident_accuracy'] = stats['confident_correct'] / stats['confident'] if stats['confident'] else None
+        stats['predict_us'] = elapsed / len(samples) * 1e6 if samples else None
+    return report
+
+
+def print_report(report: Dict[str, Dict[str, Any]], thresholds: Dict[str, float]) -> None:
+    def fmt(value: Optional[float]) -> str:
+        return f"{value:.3f}" if value is not None else "n/a"
+
+    print(f"{'field':<18}{'samples':>8}{'accuracy':>10}{'threshold':>11}{'coverage':>10}{'conf. acc':>11}{'predict, us':>13}")
+    for field, stats in report.items():
+        print(f"{field:<18}{stats['samples']:>8}{fmt(stats['accuracy']):>10}{thresholds[field]:>11.3f}"
+              f"{fmt(stats['coverage']):>10}{fmt(stats['confident_accuracy']):>11}{fmt(stats['predict_us']):>13}")
+
+
+def train(args: argparse.Namespace) -> int:
+    samples = load_samples(args.samples)
+    if not samples:
+        print("No labelled samples found", file=sys.stderr)
+        return 1
+    random.Random(args.seed).shuffle(samples)
+    holdout_size = int(len(samples) * args.holdout)
+    holdout, training = samples[:holdout_size], samples[holdout_size:]
+    print(f"Training on {len(training)} samples, holdout {len(holdout)}")
+
+    classifier = FieldClassifier(n_features=args.features)
+    classifier.fit(training, epochs=args.epochs, learning_rate=args.learning_rate, l2=args.l2)
+
+    report = evaluate(classifier, holdout)
+    classifier.thresholds = {
+        field: calibrate(stats['confidences'], args.target_accuracy, args.default_threshold)
+        for field, stats in report.items()
+    }
+    report = evaluate(classifier, holdout)
+    print_report(report, classifier.thresholds)
+
+    classifier.metadata = {
+        'model_version': args.model_version or datetime.now().strftime('%Y%m%d%H%M%S'),
+        'trained_samples': len(training),
+        'holdout_samples': len(holdout),
+        'target_accuracy': args.target_accuracy,
+        'holdout': {
+            field: {key: stats[key] for key in ('samples', 'accuracy', 'coverage', 'confident_accuracy')}
+            for field, stats in report.items()
+        }
+    }
+    if os.path.dirname(args.output):
+        os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    classifier.save(args.output)
+    print(f"Saved classifier {classifier.version} to {args.output}")
+    return 0
+
+
+def evaluate_command(args: argparse.Namespace) -> int:
+    classifier = FieldClassifier.load(args.artifact)
+    samples = load_samples(args.samples)
+    print(f"Classifier {classifier.version}, {len(samples)} samples")
+    print_report(evaluate(classifier, samples), classifier.thresholds)
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Классификатор workType/experienceLevel')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    train_parser = subparsers.add_parser('train', help='Обучить и сохранить артефакт')
+    train_parser.add_argument('samples', nargs='+', help='JSONL файлы с размеченными вакансиями')
+    train_parser.add_argument('--output', required=True, help='Путь артефакта (.npz)')
+    train_parser.add_argument('--model-version', help='Версия модели (по умолчанию - время обучения)')
+    train_parser.add_argument('--holdout', type=float, default=0.2, help='Доля отложенной выборки')
+    train_parser.add_argument('--target-accuracy', type=float, default=0.97,
+                              help='Целевая точность уверенных предсказаний')
+    train_parser.add_argument('--default-threshold', type=float, default=0.9,
+                              help='Порог, если отложенная выборка пуста')
+    train_parser.add_argument('--features', type=int, default=2 ** 16, help='Размер пространства хэшей')
+    train_parser.add_argument('--epochs', type=int, default=300)
+    train_parser.add_argument('--learning-rate', type=float, default=0.05)
+    train_parser.add_argument('--l2', type=float, default=1e-4)
+    train_parser.add_argument('--seed', type=int, default=42)
+    train_parser.set_defaults(handler=train)
+
+    evaluate_parser = subparsers.add_parser('evaluate', help='Оценить артефакт на размеченных вакансиях')
+    evaluate_parser.add_argument('artifact', help='Путь артефакта (.npz)')
+    evaluate_parser.add_argument('samples', nargs='+', help='JSONL файлы с размеченными вакансиями')
+    evaluate_parser.set_defaults(handler=evaluate_command)
+
+    args = parser.parse_args()
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -62,12 +62,12 @@ export class AIService {
 		}
 	}
 
-	async normalizeJobWithAI(title: string, description: string): Promise<AIResponse | null> {
+	async normalizeJobWithAI(title: string, description: string, sourceName?: string): Promise<AIResponse | null> {
 		for (let attempt = 1; attempt <= this.maxRetries; attempt++) {
 			try {
 				this.logger.debug(`Попытка ${attempt}/${this.maxRetries} для вакансии: ${title}`)
 
-				const response = await this.makeAIRequest(title, description)
+				const response = await this.makeAIRequest(title, description, sourceName)
 
 				if (response) {
 					this.logger.debug(`Успешно обработана вакансия: ${title}`)
@@ -87,13 +87,15 @@ export class AIService {
 		throw new Error(`AI сервис недоступен после ${this.maxRetries} попыток`)
 	}
 
-	private async makeAIRequest(title: string, description: string): Promise<AIResponse | null> {
+	private async makeAIRequest(title: string, description: string, sourceName?: string): Promise<AIResponse | null> {
 		try {
 			const response = await axios.post(
 				`${this.aiServiceUrl}/api/v1/normalize`,
 				{
 					title,
-					description
+					description,
+					// По источнику AI сервис выбирает плагин извлечения полей без модели
+					source_name: sourceName
 				},
 				{
 					headers: {
@@ -21,7 +21,7 @@ export class JobNormalizationService {
 	async normalizeJob(job: CreateJobDto, jobId?: string): Promise<NormalizedJobDto | null> {
 		try {
 			const hasSalaryInText = this.hasSalaryInOriginalText(job.title, job.description)
-			const aiResponse = await this.aiService.normalizeJobWithAI(job.title, job.description)
+			const aiResponse = await this.aiService.normalizeJobWithAI(job.title, job.description, job.sourceName)
 
 			if (!aiResponse) {
 				return null
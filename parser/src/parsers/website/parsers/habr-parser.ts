@@ -318,7 +318,7 @@ export class HabrParser extends BaseParser {
 				}
 
 				// Применяем ИИ нормализацию (теперь критично)
-				const aiNormalizedData = await this.normalizeWithAI(combinedJobData)
+				const aiNormalizedData = await this.normalizeWithAI(combinedJobData, config.name)
 				metrics.aiNormalizedJobs++
 				const finalJobData = aiNormalizedData
 
@@ -359,11 +359,11 @@ export class HabrParser extends BaseParser {
 		}
 	}
 
-	private async normalizeWithAI(jobData: any): Promise<any> {
+	private async normalizeWithAI(jobData: any, sourceName: string): Promise<any> {
 		try {
 			this.logger.log(`📋 Отправляем вакансию в AI-сервис: ${jobData.title}\n${JSON.stringify(jobData, null, 2)}`)
 
-			const aiResponse = await this.aiService.normalizeJobWithAI(jobData.title, jobData.description)
+			const aiResponse = await this.aiService.normalizeJobWithAI(jobData.title, jobData.description, sourceName)
 
 			if (!aiResponse) {
 				throw new Error('AI сервис вернул пустой ответ')